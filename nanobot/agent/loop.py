@@ -12,11 +12,13 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, llm_call_tags
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
-from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.search import SearchFilesTool
+from nanobot.agent.tools.shell import ExecTool, ShellPool
+from nanobot.agent.tools.python import KernelPool, PythonTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
@@ -24,6 +26,21 @@ from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.subagent import SubagentManager
 from nanobot.session.manager import Session, SessionManager
+from nanobot.utils.metrics import TURN_DURATION, TURNS_IN_FLIGHT
+from nanobot.utils.tracing import new_trace_id, tracer
+
+
+# Replies shown to the user when the LLM call fails after retries
+_ERROR_REPLIES = {
+    "rate_limit": "The model provider is rate-limiting requests right now. Please try again in a minute.",
+    "auth": "The model provider rejected the configured credentials. Please check the API key.",
+    "timeout": "The model provider did not respond in time. Please try again.",
+    "connection": "I couldn't reach the model provider. Please try again shortly.",
+    "server": "The model provider is having trouble right now. Please try again shortly.",
+    "bad_request": "The model provider rejected the request (it may be too long). Try /new to start a fresh session.",
+    "budget": "The usage budget has been reached. Please try again later.",
+    "unknown": "Sorry, I couldn't get a response from the model. Please try again.",
+}
 
 
 class AgentLoop:
@@ -50,12 +67,13 @@ class AgentLoop:
         memory_window: int = 50,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        python_config: "PythonToolConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, PythonToolConfig
         from nanobot.cron.service import CronService
         self.bus = bus
         self.provider = provider
@@ -67,6 +85,7 @@ class AgentLoop:
         self.memory_window = memory_window
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.python_config = python_config or PythonToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
 
@@ -99,13 +118,35 @@ class AgentLoop:
         self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
         self.tools.register(ListDirTool(allowed_dir=allowed_dir))
+        self.tools.register(SearchFilesTool(workspace=self.workspace, allowed_dir=allowed_dir))
         
         # Shell tool
+        self.shells = ShellPool(
+            str(self.workspace), self.exec_config.shell_idle_timeout, self.exec_config.max_shells,
+        ) if self.exec_config.persistent_shell else None
         self.tools.register(ExecTool(
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
+            max_output_bytes=self.exec_config.max_output_bytes,
             restrict_to_workspace=self.restrict_to_workspace,
+            shells=self.shells,
         ))
+
+        # Python tool (opt-in; user code can reach any path, so never with restrictToWorkspace)
+        enable_python = self.python_config.enabled and not self.restrict_to_workspace
+        if self.python_config.enabled and self.restrict_to_workspace:
+            logger.warning("Python tool disabled: it cannot be confined to the workspace (restrictToWorkspace is on)")
+        self.kernels = KernelPool(
+            str(self.workspace),
+            python=self.python_config.python,
+            memory_mb=self.python_config.memory_mb,
+            idle_timeout=self.python_config.idle_timeout,
+            max_kernels=self.python_config.max_kernels,
+        ) if enable_python else None
+        if self.kernels is not None:
+            self.tools.register(PythonTool(
+                self.kernels, timeout=self.python_config.timeout, cpu_seconds=self.python_config.cpu_seconds,
+            ))
         
         # Web tools
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
@@ -187,13 +228,22 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            with tracer.span("llm.chat", model=self.model) as span:
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                )
+                span.set(**{f"tokens.{k}": v for k, v in response.usage.items()})
+                if response.error:
+                    span.set_error(response.error.kind)
+
+            if response.error:
+                logger.error(f"LLM call failed ({response.error.kind}): {response.error.message}")
+                final_content = _ERROR_REPLIES.get(response.error.kind, _ERROR_REPLIES["unknown"])
+                break
 
             if response.has_tool_calls:
                 if on_progress:
@@ -220,7 +270,10 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    with tracer.span("tool.execute", tool=tool_call.name) as span:
+                        result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                        if result.startswith("Error"):
+                            span.set_error(result[:200])
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -234,6 +287,7 @@ class AgentLoop:
         """Run the agent loop, processing messages from the bus."""
         self._running = True
         await self._connect_mcp()
+        await self.provider.warmup()
         logger.info("Agent loop started")
 
         while self._running:
@@ -251,13 +305,26 @@ class AgentLoop:
                     await self.bus.publish_outbound(OutboundMessage(
                         channel=msg.channel,
                         chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
+                        content=f"Sorry, I encountered an error: {str(e)}",
+                        metadata=msg.metadata or {},
+                        trace_id=msg.trace_id,
                     ))
+                finally:
+                    self.bus.inbound_done()
             except asyncio.TimeoutError:
                 continue
     
+    async def drain(self) -> None:
+        """Wait until every message already on the bus has been answered."""
+        if self._running:
+            await self.bus.join_inbound()
+
     async def close_mcp(self) -> None:
-        """Close MCP connections."""
+        """Close MCP connections, persistent shells and Python kernels."""
+        if self.shells is not None:
+            await self.shells.close_all()
+        if self.kernels is not None:
+            await self.kernels.close_all()
         if self._mcp_stack:
             try:
                 await self._mcp_stack.aclose()
@@ -265,6 +332,11 @@ class AgentLoop:
                 pass  # MCP SDK cancel scope cleanup is noisy but harmless
             self._mcp_stack = None
 
+    @property
+    def is_running(self) -> bool:
+        """Whether ``run()`` is processing the bus."""
+        return self._running
+
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
@@ -275,6 +347,29 @@ class AgentLoop:
         msg: InboundMessage,
         session_key: str | None = None,
         on_progress: Callable[[str], Awaitable[None]] | None = None,
+    ) -> OutboundMessage | None:
+        """Process a single inbound message as one traced turn (see ``_handle_message``)."""
+        if msg.trace_id is None:
+            msg.trace_id = new_trace_id()
+        TURNS_IN_FLIGHT.inc()
+        try:
+            with (
+                TURN_DURATION.time(channel=msg.channel),
+                tracer.trace("agent.turn", msg.trace_id, session=session_key or msg.session_key, channel=msg.channel),
+            ):
+                tracer.record("bus.queue", int(msg.timestamp.timestamp() * 1e9))
+                response = await self._handle_message(msg, session_key, on_progress)
+        finally:
+            TURNS_IN_FLIGHT.dec()
+        if response:
+            response.trace_id = msg.trace_id
+        return response
+
+    async def _handle_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        on_progress: Callable[[str], Awaitable[None]] | None = None,
     ) -> OutboundMessage | None:
         """
         Process a single inbound message.
@@ -305,6 +400,10 @@ class AgentLoop:
             session.clear()
             self.sessions.save(session)
             self.sessions.invalidate(session.key)
+            if self.shells is not None:
+                await self.shells.reset(session.key)
+            if self.kernels is not None:
+                await self.kernels.reset(session.key)
 
             async def _consolidate_and_cleanup():
                 temp_session = Session(key=session.key)
@@ -313,32 +412,37 @@ class AgentLoop:
 
             asyncio.create_task(_consolidate_and_cleanup())
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
-                                  content="New session started. Memory consolidation in progress.")
+                                  content="New session started. Memory consolidation in progress.",
+                                  metadata=msg.metadata or {})
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
-                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
+                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands",
+                                  metadata=msg.metadata or {})
         
         if len(session.messages) > self.memory_window:
             asyncio.create_task(self._consolidate_memory(session))
 
         self._set_tool_context(msg.channel, msg.chat_id)
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
-            current_message=msg.content,
-            media=msg.media if msg.media else None,
-            channel=msg.channel,
-            chat_id=msg.chat_id,
-        )
+        with tracer.span("context.build"):
+            initial_messages = self.context.build_messages(
+                history=session.get_history(max_messages=self.memory_window),
+                current_message=msg.content,
+                media=msg.media if msg.media else None,
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+            )
 
         async def _bus_progress(content: str) -> None:
             await self.bus.publish_outbound(OutboundMessage(
                 channel=msg.channel, chat_id=msg.chat_id, content=content,
-                metadata=msg.metadata or {},
+                metadata={**(msg.metadata or {}), "_progress": True},
+                trace_id=msg.trace_id,
             ))
 
-        final_content, tools_used = await self._run_agent_loop(
-            initial_messages, on_progress=on_progress or _bus_progress,
-        )
+        with llm_call_tags(purpose=self._purpose_for(key), session=key, channel=msg.channel):
+            final_content, tools_used = await self._run_agent_loop(
+                initial_messages, on_progress=on_progress or _bus_progress,
+            )
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -358,6 +462,15 @@ class AgentLoop:
             metadata=msg.metadata or {},  # Pass through for channel-specific needs (e.g. Slack thread_ts)
         )
     
+    @staticmethod
+    def _purpose_for(session_key: str) -> str:
+        """Classify a turn for LLM call tagging (cache, routing, usage)."""
+        if session_key.startswith("cron:"):
+            return "cron"
+        if session_key == "heartbeat":
+            return "heartbeat"
+        return "interactive"
+
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a system message (e.g., subagent announce).
@@ -380,13 +493,15 @@ class AgentLoop:
         session_key = f"{origin_channel}:{origin_chat_id}"
         session = self.sessions.get_or_create(session_key)
         self._set_tool_context(origin_channel, origin_chat_id)
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
-            current_message=msg.content,
-            channel=origin_channel,
-            chat_id=origin_chat_id,
-        )
-        final_content, _ = await self._run_agent_loop(initial_messages)
+        with tracer.span("context.build"):
+            initial_messages = self.context.build_messages(
+                history=session.get_history(max_messages=self.memory_window),
+                current_message=msg.content,
+                channel=origin_channel,
+                chat_id=origin_chat_id,
+            )
+        with llm_call_tags(purpose="system", session=session_key, channel=origin_channel):
+            final_content, _ = await self._run_agent_loop(initial_messages)
 
         if final_content is None:
             final_content = "Background task completed."
@@ -454,13 +569,17 @@ class AgentLoop:
 Respond with ONLY valid JSON, no markdown fences."""
 
         try:
-            response = await self.provider.chat(
-                messages=[
-                    {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                model=self.model,
-            )
+            with llm_call_tags(purpose="consolidation", session=session.key):
+                response = await self.provider.chat(
+                    messages=[
+                        {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    model=self.model,
+                )
+            if response.error:
+                logger.warning(f"Memory consolidation: LLM call failed ({response.error.kind}), skipping")
+                return
             text = (response.content or "").strip()
             if not text:
                 logger.warning("Memory consolidation: LLM returned empty response, skipping")
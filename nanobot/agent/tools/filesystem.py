@@ -1,9 +1,27 @@
-"""File system tools: read, write, edit."""
+"""File system tools: read, write, edit.
 
+Blocking file access runs on the ``fsio`` thread pool so a slow disk never
+stalls the event loop, and writes replace files atomically.
+"""
+
+import mmap
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from os import stat_result
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.fsio import atomic_write, run_fs
+
+MAX_READ_BYTES = 100_000  # Largest chunk read_file returns in one call
+DEFAULT_LINE_LIMIT = 2000  # Lines per page when paging a large file
+BINARY_SNIFF_BYTES = 8192
+_INDEX_CHUNK = 16 * 1024 * 1024
+_INDEX_CACHE_SIZE = 32
+_NEWLINE = re.compile(b"\n")
 
 
 def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
@@ -14,11 +32,78 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
     return resolved
 
 
+def _is_binary(head: bytes) -> bool:
+    """Treat data with NUL bytes, or that is mostly not UTF-8 text, as binary."""
+    if b"\0" in head:
+        return True
+    text = head.decode("utf-8", errors="replace")
+    return text.count("\ufffd") > max(8, len(text) // 100)
+
+
+def _binary_notice(path: str, size: int) -> str:
+    import mimetypes
+    kind = mimetypes.guess_type(path)[0] or "unknown type"
+    return f"[{path}: binary file ({kind}, {size} bytes); contents not shown]"
+
+
+class _LineIndex:
+    """Byte offsets of line starts, extended lazily as far as reads need (thread-safe)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.starts = array("q", [0])
+        self.scanned = 0
+        self._total: int | None = None
+        self._lock = threading.Lock()
+
+    def _extend(self, mm: mmap.mmap, line: int) -> None:
+        while len(self.starts) <= line and self.scanned < self.size:
+            end = min(self.size, self.scanned + _INDEX_CHUNK)
+            self.starts.extend(m.end() for m in _NEWLINE.finditer(mm, self.scanned, end))
+            self.scanned = end
+
+    def start_of(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where 0-based ``line`` starts."""
+        with self._lock:
+            self._extend(mm, line)
+            return self.starts[line]
+
+    def total_lines(self, mm: mmap.mmap) -> int:
+        with self._lock:
+            if self._total is None:
+                newlines = sum(
+                    mm[pos:min(self.size, pos + _INDEX_CHUNK)].count(b"\n")
+                    for pos in range(0, self.size, _INDEX_CHUNK)
+                )
+                self._total = newlines + (0 if mm[self.size - 1:] == b"\n" else 1)
+            return self._total
+
+
+_line_indexes: "OrderedDict[str, tuple[int, int, _LineIndex]]" = OrderedDict()
+_line_indexes_lock = threading.Lock()
+
+
+def _line_index(path: Path, st: stat_result) -> _LineIndex:
+    """Line index for ``path``, reused while its mtime and size are unchanged."""
+    key = str(path)
+    with _line_indexes_lock:
+        cached = _line_indexes.get(key)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _line_indexes.move_to_end(key)
+            return cached[2]
+        index = _LineIndex(st.st_size)
+        _line_indexes[key] = (st.st_mtime_ns, st.st_size, index)
+        if len(_line_indexes) > _INDEX_CACHE_SIZE:
+            _line_indexes.popitem(last=False)
+        return index
+
+
 class ReadFileTool(Tool):
-    """Tool to read file contents."""
+    """Tool to read file contents, whole or by line/byte range."""
     
-    def __init__(self, allowed_dir: Path | None = None):
+    def __init__(self, allowed_dir: Path | None = None, max_bytes: int = MAX_READ_BYTES):
         self._allowed_dir = allowed_dir
+        self._max_bytes = max_bytes
 
     @property
     def name(self) -> str:
@@ -26,7 +111,11 @@ class ReadFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. Large files are returned in pages "
+            "with a header giving the total size; use offset/limit (lines) or "
+            "byte_offset/byte_limit to read further."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -36,26 +125,109 @@ class ReadFileTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The file path to read"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start from (1-based)",
+                    "minimum": 1
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Number of lines to read (default {DEFAULT_LINE_LIMIT} for large files)",
+                    "minimum": 1
+                },
+                "byte_offset": {
+                    "type": "integer",
+                    "description": "Byte position to start from (instead of offset)",
+                    "minimum": 0
+                },
+                "byte_limit": {
+                    "type": "integer",
+                    "description": "Number of bytes to read from byte_offset",
+                    "minimum": 1
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        byte_offset: int | None = None,
+        byte_limit: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return await run_fs(self._read, path, offset, limit, byte_offset, byte_limit)
+
+    def _read(
+        self, path: str, offset: int | None, limit: int | None, byte_offset: int | None, byte_limit: int | None,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
-            
-            content = file_path.read_text(encoding="utf-8")
-            return content
+
+            st = file_path.stat()
+            ranged = any(v is not None for v in (offset, limit, byte_offset, byte_limit))
+            if not ranged and st.st_size <= self._max_bytes:
+                data = file_path.read_bytes()
+                if _is_binary(data[:BINARY_SNIFF_BYTES]):
+                    return _binary_notice(path, st.st_size)
+                return data.decode("utf-8", errors="replace")
+            if st.st_size == 0:
+                return ""
+
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _is_binary(mm[:BINARY_SNIFF_BYTES]):
+                    return _binary_notice(path, st.st_size)
+                if byte_offset is not None or byte_limit is not None:
+                    return self._read_bytes(mm, path, st.st_size, byte_offset or 0, byte_limit)
+                index = _line_index(file_path, st)
+                return self._read_lines(mm, index, path, st.st_size, offset or 1, limit or DEFAULT_LINE_LIMIT)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def _read_bytes(self, mm: mmap.mmap, path: str, size: int, start: int, limit: int | None) -> str:
+        if start >= size:
+            return f"Error: byte_offset {start} is past the end of the file ({size} bytes)"
+        end = min(size, start + min(limit or self._max_bytes, self._max_bytes))
+        header = f"[{path}: bytes {start}-{end - 1} of {size}"
+        header += f"; use byte_offset={end} to continue]" if end < size else "]"
+        return header + "\n" + mm[start:end].decode("utf-8", errors="replace")
+
+    def _read_lines(self, mm: mmap.mmap, index: _LineIndex, path: str, size: int, offset: int, limit: int) -> str:
+        total = index.total_lines(mm)
+        if offset > total:
+            return f"Error: offset {offset} is past the end of the file ({total} lines)"
+        first = offset - 1
+        last = min(total, first + limit)  # Exclusive, 0-based
+        start = index.start_of(mm, first)
+        end = index.start_of(mm, last) if last < total else size
+        resume = f"offset={last + 1}"
+        if end - start > self._max_bytes:
+            cut = mm.rfind(b"\n", start, start + self._max_bytes)
+            if cut >= start:
+                # Stop after the last full line that fits
+                end = cut + 1
+                last = first + mm[start:end].count(b"\n")
+                resume = f"offset={last + 1}"
+            else:
+                # A single line longer than the cap
+                end = start + self._max_bytes
+                last = first + 1
+                resume = f"byte_offset={end}"
+
+        header = f"[{path}: lines {offset}-{last} of {total} ({size} bytes)"
+        if end < size:
+            header += f"; use {resume} to continue"
+        return header + "]\n" + mm[start:end].decode("utf-8", errors="replace")
+
 
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
@@ -89,10 +261,13 @@ class WriteFileTool(Tool):
         }
     
     async def execute(self, path: str, content: str, **kwargs: Any) -> str:
+        return await run_fs(self._write, path, content)
+
+    def _write(self, path: str, content: str) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content, encoding="utf-8")
+            atomic_write(file_path, content.encode("utf-8"))
             return f"Successfully wrote {len(content)} bytes to {path}"
         except PermissionError as e:
             return f"Error: {e}"
@@ -136,6 +311,9 @@ class EditFileTool(Tool):
         }
     
     async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+        return await run_fs(self._edit, path, old_text, new_text)
+
+    def _edit(self, path: str, old_text: str, new_text: str) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
@@ -152,7 +330,7 @@ class EditFileTool(Tool):
                 return f"Warning: old_text appears {count} times. Please provide more context to make it unique."
             
             new_content = content.replace(old_text, new_text, 1)
-            file_path.write_text(new_content, encoding="utf-8")
+            atomic_write(file_path, new_content.encode("utf-8"))
             
             return f"Successfully edited {path}"
         except PermissionError as e:
@@ -189,6 +367,9 @@ class ListDirTool(Tool):
         }
     
     async def execute(self, path: str, **kwargs: Any) -> str:
+        return await run_fs(self._list, path)
+
+    def _list(self, path: str) -> str:
         try:
             dir_path = _resolve_path(path, self._allowed_dir)
             if not dir_path.exists():
@@ -0,0 +1,148 @@
+"""Driver for the persistent Python kernel behind the ``python`` tool.
+
+Runs as a standalone script in the kernel interpreter (which need not have
+nanobot installed), so it only uses the standard library. Requests and
+replies are JSON lines on the original stdout; user code sees a captured
+``sys.stdout``/``sys.stderr`` and file descriptor 1 is pointed at stderr so
+C-level writes cannot corrupt the protocol. User code reads stdin from
+``os.devnull``, so ``input()`` fails fast instead of blocking on the pipe.
+
+Usage: python kernel_driver.py <memory_mb>
+"""
+
+import ast
+import io
+import json
+import os
+import signal
+import sys
+import traceback
+
+
+class _Bounded(io.TextIOBase):
+    """Text sink keeping the first and last ``limit // 2`` characters."""
+
+    def __init__(self, limit: int):
+        self.half = max(1, limit // 2)
+        self.head: list[str] = []
+        self.head_len = 0
+        self.tail = ""
+        self.total = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        n = len(s)
+        self.total += n
+        if self.head_len < self.half:
+            part = s[:self.half - self.head_len]
+            self.head.append(part)
+            self.head_len += len(part)
+            s = s[len(part):]
+        if s:
+            self.tail = (self.tail + s)[-self.half:]
+        return n
+
+    def value(self) -> tuple[str, int]:
+        head = "".join(self.head)
+        return head + self.tail, self.total - len(head) - len(self.tail)
+
+
+class _CpuLimitError(Exception):
+    pass
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CpuLimitError("CPU time limit exceeded")
+
+
+def _set_limits(memory_mb: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+
+def _allow_cpu(seconds: int) -> None:
+    """Let the next request use ``seconds`` more CPU time (the limit counts process lifetime)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    if seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = used + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _run(code: str, namespace: dict, out: _Bounded) -> tuple[str | None, str | None]:
+    """Execute ``code``; returns (repr of a trailing expression, formatted error)."""
+    try:
+        tree = ast.parse(code, "<input>", "exec")
+        last = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+        exec(compile(tree, "<input>", "exec"), namespace)
+        if last is not None:
+            value = eval(compile(ast.Expression(last.value), "<input>", "eval"), namespace)
+            if value is not None:
+                namespace["_"] = value
+                return repr(value), None
+        return None, None
+    except BaseException as e:  # noqa: BLE001 - report everything, including SystemExit
+        if isinstance(e, _CpuLimitError):
+            return None, "CpuTimeLimit: CPU time limit exceeded"
+        lines = traceback.format_exception(type(e), e, e.__traceback__)
+        # Drop the driver's own frames
+        lines = [line for line in lines if __file__ not in line]
+        return None, "".join(lines).rstrip()
+
+
+def main() -> None:
+    memory_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdin = open(os.devnull, encoding="utf-8")
+    _set_limits(memory_mb)
+    namespace: dict = {"__name__": "__main__", "__builtins__": __builtins__}
+
+    for line in requests:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        limit = int(request.get("max_chars", 10_000))
+        out = _Bounded(limit)
+        sys.stdout = sys.stderr = out
+        _allow_cpu(int(request.get("cpu_seconds", 0)))
+        try:
+            result, error = _run(request.get("code", ""), namespace, out)
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        text, omitted = out.value()
+        if result is not None and len(result) > limit:
+            result = result[:limit // 2] + f"... ({len(result) - limit} chars omitted) ..." + result[-(limit // 2):]
+        protocol.write(json.dumps({"output": text, "omitted": omitted, "result": result, "error": error}) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
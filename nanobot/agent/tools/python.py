@@ -0,0 +1,186 @@
+"""Python tool: run code in a persistent per-session interpreter."""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.shell import _kill_group
+from nanobot.providers.base import get_llm_call_tags
+
+_DRIVER = Path(__file__).with_name("kernel_driver.py")
+
+
+class _Kernel:
+    """A long-lived interpreter running ``kernel_driver.py``."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def spawn(cls, python: str, cwd: str, memory_mb: int) -> "_Kernel":
+        process = await asyncio.create_subprocess_exec(
+            python, "-u", str(_DRIVER), str(memory_mb),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=cwd,
+            start_new_session=sys.platform != "win32",
+            limit=16 * 1024 * 1024,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def run(self, request: dict[str, Any], timeout: float) -> dict[str, Any]:
+        self.process.stdin.write((json.dumps(request) + "\n").encode())
+        await self.process.stdin.drain()
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        self.last_used = time.monotonic()
+        if not line:
+            raise EOFError
+        return json.loads(line)
+
+    async def close(self) -> None:
+        _kill_group(self.process)
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+
+
+class KernelPool:
+    """Python kernels keyed by session, reaped after ``idle_timeout`` seconds and capped at ``max_kernels``."""
+
+    def __init__(
+        self,
+        cwd: str,
+        python: str = "",
+        memory_mb: int = 2048,
+        idle_timeout: float = 900,
+        max_kernels: int = 4,
+    ):
+        self.cwd = cwd
+        self.python = python or sys.executable
+        self.memory_mb = memory_mb
+        self.idle_timeout = idle_timeout
+        self.max_kernels = max_kernels
+        self._kernels: dict[str, _Kernel] = {}
+
+    def __len__(self) -> int:
+        return len(self._kernels)
+
+    async def acquire(self, key: str) -> _Kernel:
+        await self._reap()
+        kernel = self._kernels.get(key)
+        if kernel is None or not kernel.alive:
+            idle = sorted((k.last_used, key) for key, k in self._kernels.items() if not k.lock.locked())
+            while len(self._kernels) >= self.max_kernels and idle:
+                await self._kernels.pop(idle.pop(0)[1]).close()
+            kernel = self._kernels[key] = await _Kernel.spawn(self.python, self.cwd, self.memory_mb)
+            logger.debug(f"Started Python kernel for {key} (pid {kernel.process.pid})")
+        return kernel
+
+    async def _reap(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, kernel in list(self._kernels.items()):
+            if not kernel.alive or (kernel.last_used < cutoff and not kernel.lock.locked()):
+                del self._kernels[key]
+                await kernel.close()
+
+    async def reset(self, key: str) -> None:
+        """Close the kernel of ``key``, discarding its variables."""
+        if kernel := self._kernels.pop(key, None):
+            await kernel.close()
+
+    async def close_all(self) -> None:
+        for key in list(self._kernels):
+            await self.reset(key)
+
+
+class PythonTool(Tool):
+    """Tool to run Python code in a persistent interpreter, one per session."""
+
+    def __init__(
+        self,
+        kernels: KernelPool,
+        timeout: int = 60,
+        cpu_seconds: int = 60,
+        max_output_chars: int = 10_000,
+    ):
+        self.kernels = kernels
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.max_output_chars = max_output_chars
+
+    @property
+    def name(self) -> str:
+        return "python"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Run Python code in a persistent interpreter. Variables, imports and loaded data "
+            "survive between calls in this conversation, so load data once and explore it step "
+            "by step. Returns printed output and the repr of a trailing expression."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Python code to run"
+                },
+                "reset": {
+                    "type": "boolean",
+                    "description": "Start a fresh interpreter first, discarding all variables"
+                }
+            },
+            "required": ["code"]
+        }
+
+    async def execute(self, code: str, reset: bool = False, **kwargs: Any) -> str:
+        session = get_llm_call_tags().get("session") or "default"
+        if reset:
+            await self.kernels.reset(session)
+        try:
+            kernel = await self.kernels.acquire(session)
+        except Exception as e:
+            return f"Error starting Python: {str(e)}"
+
+        async with kernel.lock:
+            request = {"code": code, "max_chars": self.max_output_chars, "cpu_seconds": self.cpu_seconds}
+            try:
+                reply = await kernel.run(request, self.timeout)
+            except asyncio.TimeoutError:
+                await self.kernels.reset(session)
+                return f"Error: Code timed out after {self.timeout} seconds; the interpreter was reset and its variables lost"
+            except (EOFError, ConnectionError, ValueError):
+                await self.kernels.reset(session)
+                return "Error: The interpreter exited; it was reset and its variables lost"
+
+        parts = []
+        if reply["output"]:
+            output = reply["output"]
+            if reply["omitted"]:
+                half = len(output) // 2
+                output = f"{output[:half]}\n... ({reply['omitted']} chars omitted) ...\n{output[half:]}"
+            parts.append(output.rstrip("\n"))
+        if reply["error"]:
+            parts.append(reply["error"])
+        elif reply["result"] is not None:
+            parts.append(reply["result"])
+        return "\n".join(parts) if parts else "(no output)"
@@ -3,6 +3,7 @@
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.metrics import TOOL_DURATION, TOOL_ERRORS
 
 
 class ToolRegistry:
@@ -14,14 +15,17 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._definitions: list[dict[str, Any]] | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._definitions = None
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._definitions = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,8 +36,14 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """Get all tool definitions in OpenAI format.
+
+        The list is built once and reused until a tool is (un)registered, so
+        providers can cache derived forms by identity. Treat it as read-only.
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
@@ -51,15 +61,21 @@ class ToolRegistry:
         """
         tool = self._tools.get(name)
         if not tool:
+            TOOL_ERRORS.inc(tool=name)
             return f"Error: Tool '{name}' not found"
 
-        try:
-            errors = tool.validate_params(params)
-            if errors:
-                return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
-        except Exception as e:
-            return f"Error executing {name}: {str(e)}"
+        with TOOL_DURATION.time(tool=name):
+            try:
+                errors = tool.validate_params(params)
+                if errors:
+                    result = f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
+                else:
+                    result = await tool.execute(**params)
+            except Exception as e:
+                result = f"Error executing {name}: {str(e)}"
+        if isinstance(result, str) and result.startswith("Error"):
+            TOOL_ERRORS.inc(tool=name)
+        return result
     
     @property
     def tool_names(self) -> list[str]:
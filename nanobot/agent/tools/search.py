@@ -0,0 +1,229 @@
+"""Search tool: regex search over files, backed by a trigram index."""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _resolve_path
+from nanobot.utils.fsio import run_fs
+from nanobot.utils.helpers import get_data_path
+from nanobot.utils.textindex import MAX_INDEXED_BYTES, TrigramIndex, glob_to_regex
+
+MAX_OUTPUT_CHARS = 20_000
+MAX_LINE_CHARS = 300
+MAX_SCAN_BYTES = 64 * 1024 * 1024  # Unindexed files larger than this are skipped (and reported)
+MAX_TRANSIENT_INDEXES = 2  # In-memory indexes kept for trees outside the workspace
+
+_indexes: "OrderedDict[Path, TrigramIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _index_for(root: Path, index_dir: Path | None) -> TrigramIndex:
+    """Shared index per root, persisted under ``index_dir`` when given.
+
+    Persisted (workspace) indexes are kept; only the most recently used
+    ``MAX_TRANSIENT_INDEXES`` in-memory ones for other trees are.
+    """
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            db_path = None
+            if index_dir is not None:
+                db_path = index_dir / f"{hashlib.sha1(str(root).encode()).hexdigest()[:16]}.sqlite"
+            index = _indexes[root] = TrigramIndex(root, db_path)
+        _indexes.move_to_end(root)
+        transient = [r for r, i in _indexes.items() if i.db_path is None]
+        for old in transient[:-MAX_TRANSIENT_INDEXES]:
+            del _indexes[old]
+        return index
+
+
+def _glob_matcher(glob: str) -> re.Pattern:
+    """Globs without a slash match the file name, others the whole relative path."""
+    if "/" in glob:
+        return re.compile(f"^{glob_to_regex(glob.lstrip('/'))}$")
+    return re.compile(f"^(?:.*/)?{glob_to_regex(glob)}$")
+
+
+class SearchFilesTool(Tool):
+    """Tool to search file contents with a regex, like grep -rn.
+
+    The workspace index is persisted in ``index_dir`` (default
+    ``~/.nanobot/index``) so a restart only re-reads files that changed.
+    """
+
+    def __init__(self, workspace: Path, allowed_dir: Path | None = None, index_dir: Path | None = None):
+        self._workspace = workspace.resolve()
+        self._allowed_dir = allowed_dir
+        self._index_dir = index_dir
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents with a regular expression (like grep -rn, but faster). "
+            "Respects .gitignore. Returns matches as path:line:text. "
+            "Prefer this over running grep or find with exec."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Python regular expression (or plain text with literal=true)"
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Directory or file to search (default: workspace)"
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only search files matching this glob, e.g. '*.py' or 'src/**/*.ts'"
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Case-insensitive match (default false)"
+                },
+                "literal": {
+                    "type": "boolean",
+                    "description": "Treat pattern as plain text, not a regex (default false)"
+                },
+                "context": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": 5,
+                    "description": "Lines of context around each match (default 0)"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 1000,
+                    "description": "Maximum matching lines to return (default 100)"
+                }
+            },
+            "required": ["pattern"]
+        }
+
+    async def execute(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+        ignore_case: bool = False,
+        literal: bool = False,
+        context: int = 0,
+        max_results: int = 100,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            target = _resolve_path(path, self._allowed_dir) if path else self._workspace
+            if not target.exists():
+                return f"Error: Path not found: {path}"
+            regex_source = re.escape(pattern) if literal else pattern
+            try:
+                regex = re.compile(regex_source, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                return f"Error: Invalid regex: {e}"
+            return await run_fs(
+                self._search, target, regex, regex_source, glob, max(0, min(context, 5)), max(1, max_results),
+            )
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _search(
+        self, target: Path, regex: re.Pattern, source: str, glob: str | None, context: int, max_results: int,
+    ) -> str:
+        if target.is_file():
+            root, files = target.parent, [target.name]
+        else:
+            # The workspace index is persisted and shared; other trees get an in-memory one
+            inside = target == self._workspace or self._workspace in target.parents
+            root = self._workspace if inside else target
+            index_dir = (self._index_dir or get_data_path() / "index") if inside else None
+            index = _index_for(root, index_dir)
+            index.refresh()
+            prefix = "" if target == root else target.relative_to(root).as_posix() + "/"
+            files = [f for f in index.candidates(source) if f.startswith(prefix)]
+        if glob:
+            matcher = _glob_matcher(glob)
+            files = [f for f in files if matcher.match(f)]
+
+        display_root = self._workspace if self._workspace in (root, *root.parents) else root
+        blocks: list[str] = []
+        skipped: list[str] = []
+        matches = 0
+        size = 0
+        truncated = False
+        for n, rel in enumerate(files, 1):
+            file = root / rel
+            try:
+                file_size = file.stat().st_size
+                if file_size > MAX_INDEXED_BYTES:
+                    # Not in the index: skip binaries, scan text directly unless huge
+                    with open(file, "rb") as f:
+                        if b"\0" in f.read(8192):
+                            continue
+                    if file_size > MAX_SCAN_BYTES:
+                        skipped.append(rel)
+                        continue
+                lines = file.read_text(encoding="utf-8", errors="replace").splitlines()
+            except OSError:
+                continue
+            hits = [i for i, line in enumerate(lines) if regex.search(line)]
+            if not hits:
+                continue
+            if matches + len(hits) > max_results:
+                hits = hits[:max_results - matches]
+                truncated = True
+            shown = file.relative_to(display_root).as_posix() if display_root in file.parents else str(file)
+            block = self._format(shown, lines, hits, context)
+            if blocks and size + len(block) > MAX_OUTPUT_CHARS:
+                truncated = True
+                break
+            blocks.append(block[:MAX_OUTPUT_CHARS])
+            size += len(block)
+            matches += len(hits)
+            if truncated or matches >= max_results:
+                truncated = truncated or n < len(files)
+                break
+
+        note = ""
+        if skipped:
+            shown = ", ".join(skipped[:5]) + (", ..." if len(skipped) > 5 else "")
+            note = f"(not searched, larger than {MAX_SCAN_BYTES // 1024 // 1024} MB: {shown})"
+        if not blocks:
+            return f"No matches for {source!r}" + (f"\n\n{note}" if note else "")
+        result = ("\n--\n" if context else "\n").join(blocks)
+        if truncated:
+            result += f"\n\n(stopped at {matches} matches; narrow the pattern, path or glob for more)"
+        if note:
+            result += f"\n\n{note}"
+        return result
+
+    @staticmethod
+    def _format(shown: str, lines: list[str], hits: list[int], context: int) -> str:
+        """ripgrep-style output: ``path:N:text`` for matches, ``path-N-text`` for context."""
+        out: list[str] = []
+        last = -1
+        hit_set = set(hits)
+        for i in hits:
+            start, end = max(0, i - context, last + 1), min(len(lines), i + context + 1)
+            if context and out and start > last + 1:
+                out.append("--")
+            for j in range(start, end):
+                sep = ":" if j in hit_set else "-"
+                out.append(f"{shown}{sep}{j + 1}{sep}{lines[j][:MAX_LINE_CHARS]}")
+            last = max(last, end - 1)
+        return "\n".join(out)
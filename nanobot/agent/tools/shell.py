@@ -3,10 +3,200 @@
 import asyncio
 import os
 import re
+import secrets
+import shlex
+import signal
+import sys
+import time
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.providers.base import get_llm_call_tags
+
+_READ_CHUNK = 64 * 1024
+_ANSI = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+
+
+def _strip_ansi(text: str) -> str:
+    return _ANSI.sub("", text)
+
+
+class _Capture:
+    """Keeps the first ``head`` and last ``tail`` bytes of a stream and counts the rest."""
+
+    def __init__(self, head: int, tail: int):
+        self.head_limit = head
+        self.tail_limit = tail
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.tail_limit:
+                del self.tail[:len(self.tail) - self.tail_limit]
+
+    @property
+    def omitted(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        head = _strip_ansi(self.head.decode("utf-8", errors="replace"))
+        if not self.tail:
+            return head
+        tail = bytes(self.tail)
+        if self.omitted:
+            # Don't start the tail in the middle of a UTF-8 character
+            skip = 0
+            while skip < min(3, len(tail)) and tail[skip] & 0xC0 == 0x80:
+                skip += 1
+            tail = tail[skip:]
+        tail_text = _strip_ansi(tail.decode("utf-8", errors="replace"))
+        if not self.omitted:
+            return head + tail_text
+        return f"{head}\n... ({self.omitted} bytes omitted of {self.total} total) ...\n{tail_text}"
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a process and everything it started (its whole process group)."""
+    if process.returncode is not None:
+        return
+    try:
+        if sys.platform != "win32":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _Shell:
+    """A long-lived ``bash`` whose command boundaries are marked by a sentinel line."""
+
+    def __init__(self, process: asyncio.subprocess.Process, cwd: str):
+        self.process = process
+        self.cwd = cwd
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+        self._marker = f"__nanobot_{secrets.token_hex(8)}__".encode()
+        self._done = re.compile(rb"\n" + re.escape(self._marker) + rb" (-?\d+) ([^\n]*)\n")
+
+    @classmethod
+    async def spawn(cls, cwd: str) -> "_Shell":
+        process = await asyncio.create_subprocess_exec(
+            "bash", "--noprofile", "--norc",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+            start_new_session=True,
+        )
+        return cls(process, cwd)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def run(self, command: str, capture: _Capture, timeout: float, max_bytes: int) -> tuple[int | None, str | None]:
+        """Run ``command``; returns (exit code, error notice). The shell is killed on timeout or overflow."""
+        marker = self._marker.decode()
+        script = f"{{\n{command}\n}} < /dev/null 2>&1\nprintf '\\n{marker} %d %s\\n' \"$?\" \"$PWD\"\n"
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+
+        pending = bytearray()
+        keep = len(self._marker) + 4096  # Room for the exit code and $PWD after the marker
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                chunk = await asyncio.wait_for(self.process.stdout.read(_READ_CHUNK), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                await self.close()
+                return None, f"Error: Command timed out after {timeout:g} seconds; the shell session was reset"
+            if not chunk:
+                capture.feed(bytes(pending))
+                await self.close()
+                code = self.process.returncode
+                return code, f"Shell exited with code {code}; a new one will start with the next command"
+            pending += chunk
+            if match := self._done.search(pending):
+                capture.feed(bytes(pending[:match.start()]))
+                self.cwd = match.group(2).decode(errors="replace") or self.cwd
+                self.last_used = time.monotonic()
+                return int(match.group(1)), None
+            if len(pending) > keep:
+                capture.feed(bytes(pending[:-keep]))
+                del pending[:-keep]
+            if capture.total > max_bytes:
+                await self.close()
+                return None, f"Output exceeded {max_bytes} bytes; command was killed and the shell session reset"
+
+    async def close(self) -> None:
+        _kill_group(self.process)
+        self.process.stdin.close()
+        try:
+            # Drain what is left in the pipe so the transport can close
+            await asyncio.wait_for(asyncio.gather(self.process.stdout.read(), self.process.wait()), timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            pass
+
+
+class ShellPool:
+    """
+    Persistent shells keyed by session, so ``cd``, ``export`` and activated
+    virtualenvs carry over between ``exec`` calls.
+
+    Shells idle for ``idle_timeout`` seconds are closed, and at most
+    ``max_shells`` are kept (the least recently used idle one is closed to
+    make room).
+    """
+
+    def __init__(self, cwd: str, idle_timeout: float = 600, max_shells: int = 8):
+        self.cwd = cwd
+        self.idle_timeout = idle_timeout
+        self.max_shells = max_shells
+        self._shells: dict[str, _Shell] = {}
+
+    def __len__(self) -> int:
+        return len(self._shells)
+
+    async def acquire(self, key: str) -> _Shell:
+        await self._reap()
+        shell = self._shells.get(key)
+        if shell is None or not shell.alive:
+            idle = sorted((s.last_used, k) for k, s in self._shells.items() if not s.lock.locked())
+            while len(self._shells) >= self.max_shells and idle:
+                await self._shells.pop(idle.pop(0)[1]).close()
+            shell = self._shells[key] = await _Shell.spawn(self.cwd)
+        return shell
+
+    async def _reap(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, shell in list(self._shells.items()):
+            if not shell.alive or (shell.last_used < cutoff and not shell.lock.locked()):
+                del self._shells[key]
+                await shell.close()
+
+    async def reset(self, key: str) -> None:
+        """Close the shell of ``key`` (e.g. when its session is cleared)."""
+        if shell := self._shells.pop(key, None):
+            await shell.close()
+
+    async def close_all(self) -> None:
+        for key in list(self._shells):
+            await self.reset(key)
+
+
+def _within(path: str, root: Path) -> bool:
+    resolved = Path(path).resolve()
+    return resolved == root or root in resolved.parents
 
 
 class ExecTool(Tool):
@@ -19,8 +209,14 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        max_output_bytes: int = 10_000_000,
+        max_output_chars: int = 10_000,
+        shells: ShellPool | None = None,
     ):
         self.timeout = timeout
+        self.shells = shells
+        self.max_output_bytes = max_output_bytes
+        self.max_output_chars = max_output_chars
         self.working_dir = working_dir
         self.deny_patterns = deny_patterns or [
             r"\brm\s+-[rf]{1,2}\b",          # rm -r, rm -rf, rm -fr
@@ -41,6 +237,12 @@ class ExecTool(Tool):
     
     @property
     def description(self) -> str:
+        if self.shells is not None:
+            return (
+                "Execute a shell command and return its output. Use with caution. "
+                "Commands share one shell per conversation: cd, exported variables and "
+                "activated virtualenvs persist between calls."
+            )
         return "Execute a shell command and return its output. Use with caution."
     
     @property
@@ -61,6 +263,10 @@ class ExecTool(Tool):
         }
     
     async def execute(self, command: str, working_dir: str | None = None, **kwargs: Any) -> str:
+        session = get_llm_call_tags().get("session") if self.shells is not None else None
+        if session:
+            return await self._execute_in_shell(session, command, working_dir)
+
         cwd = working_dir or self.working_dir or os.getcwd()
         guard_error = self._guard_command(command, cwd)
         if guard_error:
@@ -72,42 +278,91 @@ class ExecTool(Tool):
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                start_new_session=sys.platform != "win32",
             )
-            
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                return f"Error: Command timed out after {self.timeout} seconds"
-            
-            output_parts = []
-            
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
-            
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                if stderr_text.strip():
-                    output_parts.append(f"STDERR:\n{stderr_text}")
-            
-            if process.returncode != 0:
-                output_parts.append(f"\nExit code: {process.returncode}")
-            
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
-            
         except Exception as e:
             return f"Error executing command: {str(e)}"
 
+        # Stream both pipes into bounded head/tail buffers instead of buffering everything
+        stdout = _Capture(self.max_output_chars * 6 // 10, self.max_output_chars * 4 // 10)
+        stderr = _Capture(self.max_output_chars // 4, self.max_output_chars // 4)
+        over_budget = asyncio.Event()
+
+        async def pump(stream: asyncio.StreamReader, capture: _Capture) -> None:
+            while chunk := await stream.read(_READ_CHUNK):
+                capture.feed(chunk)
+                if stdout.total + stderr.total > self.max_output_bytes:
+                    over_budget.set()
+
+        readers = asyncio.gather(pump(process.stdout, stdout), pump(process.stderr, stderr))
+        budget = asyncio.ensure_future(over_budget.wait())
+        notice = None
+        try:
+            done, _ = await asyncio.wait({readers, budget}, timeout=self.timeout, return_when=asyncio.FIRST_COMPLETED)
+            if budget in done:
+                notice = f"Output exceeded {self.max_output_bytes} bytes; command was killed"
+            elif not done:
+                notice = f"Error: Command timed out after {self.timeout} seconds"
+            if notice:
+                _kill_group(process)
+            else:
+                await asyncio.wait_for(process.wait(), timeout=max(1, self.timeout))
+        except asyncio.TimeoutError:
+            _kill_group(process)
+            notice = f"Error: Command timed out after {self.timeout} seconds"
+        finally:
+            budget.cancel()
+        try:
+            # Once the group is dead the pipes hit EOF; drain them so the transport closes
+            await asyncio.wait_for(asyncio.gather(readers, process.wait()), timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            readers.cancel()
+
+        return self._format(stdout, stderr, process.returncode, notice)
+
+    async def _execute_in_shell(self, session: str, command: str, working_dir: str | None) -> str:
+        """Run ``command`` in the session's persistent shell (``working_dir`` changes its directory)."""
+        # Paths are checked against the workspace, never the shell's current directory
+        root = Path(self.working_dir or self.shells.cwd).resolve()
+        guard_error = self._guard_command(command, str(root))
+        if guard_error:
+            return guard_error
+        if working_dir and self.restrict_to_workspace and not _within(working_dir, root):
+            return "Error: Command blocked by safety guard (working_dir outside workspace)"
+        shell = await self.shells.acquire(session)
+        async with shell.lock:
+            if working_dir:
+                command = f"cd -- {shlex.quote(working_dir)} && {command}"
+            output = _Capture(self.max_output_chars * 6 // 10, self.max_output_chars * 4 // 10)
+            try:
+                exit_code, notice = await shell.run(command, output, self.timeout, self.max_output_bytes)
+            except Exception as e:
+                await self.shells.reset(session)
+                return f"Error executing command: {str(e)}"
+            if self.restrict_to_workspace and not _within(shell.cwd, root):
+                await self.shells.reset(session)
+                notice = notice or "The shell left the workspace; it was reset to the workspace directory"
+        return self._format(output, None, exit_code, notice)
+
+    @staticmethod
+    def _format(stdout: _Capture, stderr: _Capture | None, exit_code: int | None, notice: str | None) -> str:
+        output_parts = []
+        if stdout.total:
+            output_parts.append(stdout.text())
+        if stderr and stderr.total:
+            stderr_text = stderr.text()
+            if stderr_text.strip():
+                output_parts.append(f"STDERR:\n{stderr_text}")
+        truncated = stdout.omitted or (stderr and stderr.omitted)
+        if truncated:
+            sizes = f"{stdout.total} bytes stdout, {stderr.total} bytes stderr" if stderr else f"{stdout.total} bytes"
+            output_parts.append(f"\nTotal output: {sizes}")
+        if notice:
+            output_parts.insert(0, notice)
+        elif exit_code != 0 or truncated:
+            output_parts.append(f"\nExit code: {exit_code}")
+        return "\n".join(output_parts) if output_parts else "(no output)"
+
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
@@ -122,7 +377,7 @@ class ExecTool(Tool):
                 return "Error: Command blocked by safety guard (not in allowlist)"
 
         if self.restrict_to_workspace:
-            if "..\\" in cmd or "../" in cmd:
+            if "..\\" in cmd or "../" in cmd or re.search(r"(?:^|[\s;&|(=])\.\.(?:$|[\s;&|)])", cmd):
                 return "Error: Command blocked by safety guard (path traversal detected)"
 
             cwd_path = Path(cwd).resolve()
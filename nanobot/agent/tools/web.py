@@ -1,19 +1,39 @@
 """Web tools: web_search and web_fetch."""
 
+import asyncio
 import html
 import json
+import multiprocessing
 import os
 import re
-from typing import Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.fsio import run_fs
+from nanobot.utils.http import get_client, host_slot
+from nanobot.utils.httpcache import HttpCache, get_cache
+from nanobot.utils.searchcache import get_search_cache
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
+MAX_BATCH = 20  # Items per web_search/web_fetch call
+BATCH_PER_HOST = 2  # Concurrent batch requests per host
+BATCH_BUDGET_S = 60.0  # Total time for a batch; unfinished items are reported as errors
+MIN_DOWNLOAD_BYTES = 512 * 1024
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+HTML_BYTES_PER_CHAR = 20  # Markup allowance per character of extracted text
+EXTRACT_TIMEOUT_S = 20.0
+EXTRACT_WORKERS = 2
+_MAGIC = (b"%PDF", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"PK\x03\x04", b"\x1f\x8b", b"RIFF", b"\x00\x00\x00")
+_BINARY_TYPES = ("image/", "audio/", "video/", "font/", "application/pdf", "application/zip",
+                 "application/gzip", "application/octet-stream")
 
 
 def _strip_tags(text: str) -> str:
@@ -30,6 +50,37 @@ def _normalize(text: str) -> str:
     return re.sub(r'\n{3,}', '\n\n', text).strip()
 
 
+def _download_cap(max_chars: int) -> int:
+    """Bytes worth downloading for ``max_chars`` of extracted text (HTML markup included)."""
+    return min(MAX_DOWNLOAD_BYTES, max(MIN_DOWNLOAD_BYTES, max_chars * HTML_BYTES_PER_CHAR))
+
+
+def _is_binary(ctype: str, head: bytes) -> bool:
+    """Sniff the first chunk of a response: known binary signatures, NUL bytes or a binary type."""
+    if head.startswith(_MAGIC) or b"\0" in head[:1024]:
+        return True
+    ctype = ctype.split(";")[0].strip().lower()
+    if ctype.startswith(_BINARY_TYPES):
+        # Servers mislabel text as octet-stream; trust the bytes if they look like markup
+        return not head.lstrip()[:15].lower().startswith((b"<!doctype", b"<html", b"{", b"["))
+    return False
+
+
+async def _read_capped(response: httpx.Response, cap: int) -> tuple[bytes | None, bool]:
+    """Read at most ``cap`` bytes of a streamed body; (None, False) if it is binary."""
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        if not chunks and _is_binary(response.headers.get("content-type", ""), chunk):
+            return None, False
+        if size + len(chunk) > cap:
+            chunks.append(chunk[:cap - size])
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks), False
+
+
 def _validate_url(url: str) -> tuple[bool, str]:
     """Validate URL: must be http(s) with valid domain."""
     try:
@@ -43,121 +94,316 @@ def _validate_url(url: str) -> tuple[bool, str]:
         return False, str(e)
 
 
+async def _run_batch(items: list[str], run: Callable[[str], Awaitable[Any]], host: Callable[[str], str]) -> list[Any]:
+    """
+    Run ``run(item)`` for every item concurrently, at most ``BATCH_PER_HOST``
+    at a time per host, within ``BATCH_BUDGET_S`` in total. Failed or
+    unfinished items get their exception in place of a result.
+    """
+    if not items:
+        return []
+    per_host: dict[str, asyncio.Semaphore] = {}
+
+    async def one(item: str) -> Any:
+        sem = per_host.setdefault(host(item), asyncio.Semaphore(BATCH_PER_HOST))
+        async with sem:
+            return await run(item)
+
+    tasks = [asyncio.create_task(one(item)) for item in items]
+    _, pending = await asyncio.wait(tasks, timeout=BATCH_BUDGET_S)
+    for task in pending:
+        task.cancel()
+    results: list[Any] = []
+    for task in tasks:
+        if task in pending:
+            results.append(TimeoutError(f"not finished within the {BATCH_BUDGET_S:g}s batch budget"))
+        elif task.exception() is not None:
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results
+
+
 class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
-    description = "Search the web. Returns titles, URLs, and snippets."
+    description = (
+        "Search the web. Returns titles, URLs, and snippets. "
+        "Pass several queries in 'queries' to run them concurrently in one call."
+    )
     parameters = {
         "type": "object",
         "properties": {
             "query": {"type": "string", "description": "Search query"},
+            "queries": {"type": "array", "items": {"type": "string"}, "maxItems": MAX_BATCH,
+                        "description": "Several search queries, run concurrently (instead of query)"},
             "count": {"type": "integer", "description": "Results (1-10)", "minimum": 1, "maximum": 10}
         },
-        "required": ["query"]
+        "required": []
     }
     
     def __init__(self, api_key: str | None = None, max_results: int = 5):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
     
-    async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
+    async def execute(
+        self, query: str | None = None, queries: list[str] | None = None, count: int | None = None, **kwargs: Any,
+    ) -> str:
         if not self.api_key:
             return "Error: BRAVE_API_KEY not configured"
-        
+        n = min(max(count or self.max_results, 1), 10)
+        queries = [q for q in queries or [] if q.strip()][:MAX_BATCH]
+        if queries:
+            results = await _run_batch(queries, lambda q: self._search(q, n), lambda q: BRAVE_SEARCH_URL)
+            return "\n\n".join(
+                f"Error for: {q}\n{r}" if isinstance(r, BaseException) else r for q, r in zip(queries, results)
+            )
+        if not query or not query.strip():
+            return "Error: query or queries is required"
         try:
-            n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
-            
-            results = r.json().get("web", {}).get("results", [])
-            if not results:
-                return f"No results for: {query}"
-            
-            lines = [f"Results for: {query}\n"]
-            for i, item in enumerate(results[:n], 1):
-                lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
-                if desc := item.get("description"):
-                    lines.append(f"   {desc}")
-            return "\n".join(lines)
+            return await self._search(query, n)
         except Exception as e:
             return f"Error: {e}"
 
+    async def _search(self, query: str, n: int) -> str:
+        """Search through the shared cache, which coalesces identical queries and applies quotas."""
+        return await get_search_cache().search(self.api_key, query, n, lambda: self._query_api(query, n))
+
+    async def _query_api(self, query: str, n: int) -> str:
+        async with host_slot(BRAVE_SEARCH_URL):
+            r = await get_client().get(
+                BRAVE_SEARCH_URL,
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+        r.raise_for_status()
+        
+        results = r.json().get("web", {}).get("results", [])
+        if not results:
+            return f"No results for: {query}"
+        
+        lines = [f"Results for: {query}\n"]
+        for i, item in enumerate(results[:n], 1):
+            lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
+            if desc := item.get("description"):
+                lines.append(f"   {desc}")
+        return "\n".join(lines)
+
 
 class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
-    description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    description = (
+        "Fetch URL and extract readable content (HTML → markdown/text). "
+        "Pass several URLs in 'urls' to fetch them concurrently in one call."
+    )
     parameters = {
         "type": "object",
         "properties": {
             "url": {"type": "string", "description": "URL to fetch"},
+            "urls": {"type": "array", "items": {"type": "string"}, "maxItems": MAX_BATCH,
+                     "description": "Several URLs, fetched concurrently (instead of url)"},
             "extractMode": {"type": "string", "enum": ["markdown", "text"], "default": "markdown"},
-            "maxChars": {"type": "integer", "minimum": 100}
+            "maxChars": {"type": "integer", "minimum": 100, "description": "Max chars per page"}
         },
-        "required": ["url"]
+        "required": []
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(self, max_chars: int = 50000, cache: HttpCache | None = None):
         self.max_chars = max_chars
+        self.cache = cache  # Defaults to the process-wide cache (see nanobot.utils.httpcache)
     
-    async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
-        max_chars = maxChars or self.max_chars
+    async def execute(
+        self,
+        url: str | None = None,
+        urls: list[str] | None = None,
+        extractMode: str = "markdown",
+        maxChars: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        urls = [u for u in dict.fromkeys(urls or []) if u.strip()][:MAX_BATCH]
+        if urls:
+            # Without an explicit maxChars, the batch shares the single-page budget
+            max_chars = maxChars or max(2000, self.max_chars // len(urls))
+            results = await _run_batch(
+                urls, lambda u: self._fetch(u, extractMode, max_chars), lambda u: urlparse(u).netloc.lower(),
+            )
+            return json.dumps({"results": [
+                {"error": str(r) or type(r).__name__, "url": u} if isinstance(r, BaseException) else r
+                for u, r in zip(urls, results)
+            ]})
+        if not url or not url.strip():
+            return json.dumps({"error": "url or urls is required"})
+        return json.dumps(await self._fetch(url, extractMode, maxChars or self.max_chars))
 
+    async def _fetch(self, url: str, extract_mode: str, max_chars: int) -> dict[str, Any]:
         # Validate URL before fetching
         is_valid, error_msg = _validate_url(url)
         if not is_valid:
-            return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
+            return {"error": f"URL validation failed: {error_msg}", "url": url}
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
-            
-            ctype = r.headers.get("content-type", "")
-            
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
+            clipped = False
+            cache = self.cache or get_cache()
+            # SQLite reads and writes (entries up to 5 MB) run on the fs pool, not the event loop
+            entry = await run_fs(cache.lookup, url) if cache else None
+            if entry and cache.is_fresh(entry):
+                await run_fs(cache.record, "hit")
             else:
-                text, extractor = r.text, "raw"
+                headers = {"User-Agent": USER_AGENT}
+                if entry:
+                    headers.update(cache.conditional_headers(entry))
+                client = get_client(follow_redirects=True, max_redirects=MAX_REDIRECTS)
+                async with host_slot(url):
+                    async with client.stream("GET", url, headers=headers, timeout=30.0) as r:
+                        not_modified = entry is not None and r.status_code == 304
+                        if not not_modified:
+                            r.raise_for_status()
+                            data, clipped = await _read_capped(r, _download_cap(max_chars))
+                if not_modified:
+                    entry = await run_fs(cache.revalidated, url, entry, r)
+                    await run_fs(cache.record, "revalidated")
+                elif data is None:
+                    size = r.headers.get("content-length", "unknown")
+                    ctype = r.headers.get("content-type", "unknown type")
+                    return {"error": f"Binary content ({ctype}, {size} bytes) not fetched", "url": url}
+                else:
+                    body = data.decode(r.charset_encoding or "utf-8", errors="replace")
+                    # A clipped body is only valid for this maxChars, so it is not cached
+                    entry = await run_fs(cache.store, url, r, body) if cache and not clipped else None
+                    if cache:
+                        await run_fs(cache.record, "miss")
+                    if entry is None:
+                        entry = {"final_url": str(r.url), "status": r.status_code,
+                                 "content_type": r.headers.get("content-type", ""), "body": body, "extracts": {}}
+
+            extract = entry["extracts"].get(extract_mode)
+            if extract is None:
+                text, extractor = await self._extract(entry["content_type"], entry["body"], extract_mode)
+                if cache and "fresh_until" in entry:
+                    await run_fs(cache.save_extract, url, entry, extract_mode, text, extractor)
+            else:
+                text, extractor = extract["text"], extract["extractor"]
             
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
+            truncated = clipped or len(text) > max_chars
+            text = text[:max_chars]
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            return {"url": url, "finalUrl": entry["final_url"], "status": entry["status"],
+                    "extractor": extractor, "truncated": truncated, "length": len(text), "text": text}
         except Exception as e:
-            return json.dumps({"error": str(e), "url": url})
-    
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+            return {"error": str(e), "url": url}
+
+    async def _extract(self, ctype: str, body: str, extract_mode: str) -> tuple[str, str]:
+        """Turn a response body into (text, extractor name); HTML is parsed in a worker process."""
+        # JSON
+        if "application/json" in ctype:
+            try:
+                return json.dumps(json.loads(body), indent=2), "json"
+            except ValueError:
+                return body, "raw"  # e.g. clipped by the download cap
+        # HTML
+        if "text/html" in ctype or body[:256].lstrip().lower().startswith(("<!doctype", "<html")):
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(_extraction_threads, _extract_in_worker, body, extract_mode)
+            return text, "readability"
+        return body, "raw"
+
+
+# HTML extraction runs in worker processes so a huge or pathological page
+# cannot block the event loop (and every channel with it). Each extraction
+# holds one worker for its duration, so an overrun only kills that worker.
+_extraction_threads = ThreadPoolExecutor(EXTRACT_WORKERS, thread_name_prefix="nanobot-extract")
+_idle_workers: list["_ExtractionWorker"] = []
+_idle_lock = threading.Lock()
+
+
+class _ExtractionWorker:
+    """A process running ``_extraction_worker_main``, fed one page at a time over a pipe."""
+
+    def __init__(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_extraction_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def extract(self, body: str, extract_mode: str, timeout: float) -> str:
+        self.conn.send((body, extract_mode))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"HTML extraction did not finish within {timeout:g}s")
+        ok, value = self.conn.recv()
+        if not ok:
+            raise RuntimeError(f"HTML extraction failed: {value}")
+        return value
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+def _extraction_worker_main(conn: Any) -> None:
+    while True:
+        try:
+            body, extract_mode = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, _extract_html(body, extract_mode)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+def _extract_in_worker(body: str, extract_mode: str, timeout: float | None = None) -> str:
+    """Extract ``body`` in an idle worker (starting one if needed); blocking, run on ``_extraction_threads``."""
+    with _idle_lock:
+        worker = _idle_workers.pop() if _idle_workers else None
+    if worker is None or not worker.process.is_alive():
+        worker = _ExtractionWorker()
+    try:
+        text = worker.extract(body, extract_mode, EXTRACT_TIMEOUT_S if timeout is None else timeout)
+    except RuntimeError:
+        with _idle_lock:
+            _idle_workers.append(worker)  # The worker reported an error and is still usable
+        raise
+    except (TimeoutError, EOFError, OSError) as e:
+        worker.kill()  # Only this extraction's worker; others keep running
+        if isinstance(e, TimeoutError):
+            raise
+        raise RuntimeError("HTML extraction worker exited unexpectedly") from e
+    with _idle_lock:
+        _idle_workers.append(worker)
+    return text
+
+
+def _close_extraction_workers() -> None:
+    """Stop the idle extraction workers; new ones start on demand."""
+    with _idle_lock:
+        workers = list(_idle_workers)
+        _idle_workers.clear()
+    for worker in workers:
+        worker.kill()
+
+
+def _extract_html(body: str, extract_mode: str) -> str:
+    from readability import Document
+
+    doc = Document(body)
+    content = _to_markdown(doc.summary()) if extract_mode == "markdown" else _strip_tags(doc.summary())
+    return f"# {doc.title()}\n\n{content}" if doc.title() else content
+
+
+def _to_markdown(html: str) -> str:
+    """Convert HTML to markdown."""
+    # Convert links, headings, lists before stripping tags
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    return _normalize(_strip_tags(text))
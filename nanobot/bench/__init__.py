@@ -0,0 +1,18 @@
+"""Offline benchmarks: fake LLM endpoint, load harness and session replay."""
+
+from nanobot.bench.cassette import Cassette, ReplayProvider, record_agent
+from nanobot.bench.fake_llm import FakeLLMServer, FakeProfile
+from nanobot.bench.replay import compare_reports, replay_sessions
+from nanobot.bench.runner import SyntheticChannel, run_benchmark
+
+__all__ = [
+    "Cassette",
+    "FakeLLMServer",
+    "FakeProfile",
+    "ReplayProvider",
+    "SyntheticChannel",
+    "compare_reports",
+    "record_agent",
+    "replay_sessions",
+    "run_benchmark",
+]
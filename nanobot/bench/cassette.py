@@ -0,0 +1,198 @@
+"""Record LLM responses and tool results per session, and serve them back."""
+
+import dataclasses
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import (
+    LLMError,
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+    get_llm_call_tags,
+)
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+# Purposes whose replies can be taken from the session file when there is no cassette
+_FALLBACK_PURPOSES = {"interactive", "cron", "heartbeat"}
+
+
+def session_stem(session_key: str) -> str:
+    """File stem used for a session key (matches SessionManager's naming)."""
+    return safe_filename(session_key.replace(":", "_"))
+
+
+def response_to_dict(response: LLMResponse) -> dict[str, Any]:
+    return dataclasses.asdict(response)
+
+
+def response_from_dict(raw: dict[str, Any]) -> LLMResponse:
+    raw = dict(raw)
+    raw["tool_calls"] = [ToolCallRequest(**tc) for tc in raw.get("tool_calls") or []]
+    if raw.get("error"):
+        raw["error"] = LLMError(**raw["error"])
+    return LLMResponse(**raw)
+
+
+class Cassette:
+    """
+    A directory of JSONL recordings, one file per session.
+
+    Each line is either ``{"kind": "llm", "purpose": ..., "response": ...}``
+    or ``{"kind": "tool", "name": ..., "arguments": ..., "result": ...}``,
+    in the order the calls completed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._tapes: dict[str, dict[str, deque]] = {}
+
+    def file_for(self, session_key: str) -> Path:
+        return self.path / f"{session_stem(session_key or 'unknown')}.jsonl"
+
+    def append(self, session_key: str, entry: dict[str, Any]) -> None:
+        ensure_dir(self.path)
+        with open(self.file_for(session_key), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def has(self, session_key: str) -> bool:
+        return self.file_for(session_key).exists()
+
+    def tape(self, session_key: str) -> dict[str, deque]:
+        """Recorded entries of a session, queued by ``llm:<purpose>`` and ``tool``."""
+        if session_key not in self._tapes:
+            tape: dict[str, deque] = defaultdict(deque)
+            path = self.file_for(session_key)
+            if path.exists():
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = f"llm:{entry['purpose']}" if entry["kind"] == "llm" else "tool"
+                    tape[key].append(entry)
+            self._tapes[session_key] = tape
+        return self._tapes[session_key]
+
+
+class RecordingProvider(LLMProvider):
+    """Pass calls through to ``inner`` and append each response to a cassette."""
+
+    def __init__(self, inner: LLMProvider, cassette: Cassette):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.cassette = cassette
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        response = await self.inner.chat(messages, tools, model, max_tokens, temperature)
+        tags = get_llm_call_tags()
+        self.cassette.append(tags.get("session", ""), {
+            "kind": "llm",
+            "purpose": tags.get("purpose", "interactive"),
+            "response": response_to_dict(response),
+        })
+        return response
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+class RecordingToolRegistry(ToolRegistry):
+    """Tool registry sharing another registry's tools and recording every result."""
+
+    def __init__(self, inner: ToolRegistry, cassette: Cassette):
+        super().__init__()
+        self._tools = inner._tools
+        self.cassette = cassette
+
+    async def execute(self, name: str, params: dict[str, Any]) -> str:
+        result = await super().execute(name, params)
+        self.cassette.append(get_llm_call_tags().get("session", ""), {
+            "kind": "tool", "name": name, "arguments": params, "result": result,
+        })
+        return result
+
+
+def record_agent(agent: Any, path: Path) -> Cassette:
+    """Record an AgentLoop's LLM calls and tool results to cassettes in ``path``."""
+    cassette = Cassette(path)
+    agent.provider = RecordingProvider(agent.provider, cassette)
+    agent.subagents.provider = agent.provider
+    agent.tools = RecordingToolRegistry(agent.tools, cassette)
+    logger.info(f"Recording sessions to {path}")
+    return cassette
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Serve LLM responses from cassettes instead of calling a model.
+
+    Responses are handed out in recorded order per session and purpose. For
+    sessions without a cassette, ``fallback_replies`` (the assistant turns
+    of the session file) answer user-facing calls as plain text.
+    """
+
+    def __init__(self, cassette: Cassette | None = None, model: str = "replay"):
+        super().__init__(None, None)
+        self.cassette = cassette
+        self.model = model
+        self.fallback_replies: dict[str, deque[str]] = {}
+        self.misses = 0
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        tags = get_llm_call_tags()
+        session, purpose = tags.get("session", ""), tags.get("purpose", "interactive")
+        if self.cassette and self.cassette.has(session):
+            queue = self.cassette.tape(session)[f"llm:{purpose}"]
+            if queue:
+                return response_from_dict(queue.popleft()["response"])
+        elif purpose in _FALLBACK_PURPOSES and self.fallback_replies.get(session):
+            return LLMResponse(content=self.fallback_replies[session].popleft())
+
+        self.misses += 1
+        logger.warning(f"Replay: no recorded {purpose} response for session {session!r}")
+        return LLMResponse.from_error(LLMError("bad_request", f"No recorded {purpose} response"))
+
+    def get_default_model(self) -> str:
+        return self.model
+
+
+class ReplayToolRegistry(ToolRegistry):
+    """Tool registry that returns recorded results instead of running tools."""
+
+    def __init__(self, inner: ToolRegistry, cassette: Cassette | None = None):
+        super().__init__()
+        self._tools = inner._tools
+        self.cassette = cassette
+        self.misses = 0
+
+    async def execute(self, name: str, params: dict[str, Any]) -> str:
+        session = get_llm_call_tags().get("session", "")
+        queue = self.cassette.tape(session)["tool"] if self.cassette else None
+        if queue and queue[0]["name"] == name:
+            return queue.popleft()["result"]
+
+        self.misses += 1
+        logger.warning(f"Replay: no recorded result for tool {name!r} in session {session!r}")
+        return f"Error: no recorded result for tool '{name}'"
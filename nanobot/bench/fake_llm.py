@@ -0,0 +1,107 @@
+"""Local OpenAI-compatible endpoint with scripted latency and tool calls."""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from nanobot.utils.http_server import HttpServer, Request, Response
+
+
+@dataclass
+class FakeProfile:
+    """How the fake model behaves."""
+    latency_ms: float = 200.0  # Mean response latency
+    jitter_ms: float = 50.0  # Standard deviation of the latency
+    tool_calls: int = 1  # Tool-call rounds per turn before the final answer
+    tool: str = "list_dir"
+    tool_args: dict[str, Any] = field(default_factory=lambda: {"path": "."})
+    reply_words: int = 40
+    seed: int | None = None
+
+
+class FakeLLMServer:
+    """
+    Serve ``/v1/chat/completions`` and ``/v1/models`` like an OpenAI endpoint.
+
+    Each turn (messages after the last user message) gets ``tool_calls``
+    rounds of the scripted tool call, then a plain text answer. Usage is
+    estimated at ~4 characters per token.
+    """
+
+    def __init__(self, profile: FakeProfile | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or FakeProfile()
+        self.server = HttpServer(self._handle, host, port)
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._rng = random.Random(self.profile.seed)
+
+    @property
+    def url(self) -> str:
+        """Base URL for CustomProvider's api_base."""
+        return f"{self.server.url}/v1"
+
+    async def start(self) -> None:
+        await self.server.start()
+
+    async def stop(self) -> None:
+        await self.server.stop()
+
+    async def __aenter__(self) -> "FakeLLMServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    async def _handle(self, request: Request) -> Response:
+        if request.method == "GET" and request.path == "/v1/models":
+            return Response.json({"object": "list", "data": [{"id": "fake-model", "object": "model", "owned_by": "nanobot"}]})
+        if request.method == "POST" and request.path == "/v1/chat/completions":
+            return Response.json(await self.complete(request.json()))
+        if request.method == "HEAD":
+            return Response()
+        return Response.json({"error": {"message": "not found"}}, status=404)
+
+    async def complete(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Produce one chat completion for a request body."""
+        self.requests += 1
+        messages = body.get("messages") or []
+        p = self.profile
+        delay = max(0.0, self._rng.gauss(p.latency_ms, p.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        rounds = 0
+        for m in reversed(messages):
+            if m.get("role") == "user":
+                break
+            if m.get("role") == "assistant" and m.get("tool_calls"):
+                rounds += 1
+
+        message: dict[str, Any] = {"role": "assistant", "content": None}
+        if body.get("tools") and rounds < p.tool_calls:
+            message["tool_calls"] = [{
+                "id": f"call_{self.requests}",
+                "type": "function",
+                "function": {"name": p.tool, "arguments": json.dumps(p.tool_args)},
+            }]
+            finish_reason = "tool_calls"
+        else:
+            message["content"] = " ".join(["lorem"] * p.reply_words)
+            finish_reason = "stop"
+
+        prompt = len(json.dumps(messages, ensure_ascii=False)) // 4
+        completion = len(json.dumps(message, ensure_ascii=False)) // 4
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "fake-model",
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion},
+        }
@@ -0,0 +1,147 @@
+"""Replay recorded sessions through the agent loop and time each stage."""
+
+import asyncio
+import json
+import shutil
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from nanobot.bench.cassette import Cassette, ReplayProvider, ReplayToolRegistry
+from nanobot.bench.runner import percentiles
+from nanobot.providers.base import LLMProvider
+
+
+class StageTimer:
+    """Collects wall-clock samples per named stage."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append((time.perf_counter() - start) * 1000)
+
+    def wrap(self, obj: Any, attr: str, stage: str) -> None:
+        """Time every call of ``obj.attr`` (sync or async) as ``stage``."""
+        fn = getattr(obj, attr)
+        if asyncio.iscoroutinefunction(fn):
+            async def timed(*args: Any, **kwargs: Any) -> Any:
+                with self.measure(stage):
+                    return await fn(*args, **kwargs)
+        else:
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                with self.measure(stage):
+                    return fn(*args, **kwargs)
+        setattr(obj, attr, timed)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        stages = {}
+        for stage, values in sorted(self.samples.items()):
+            stats = percentiles(values)
+            stages[stage] = {
+                "count": len(values),
+                "total_ms": round(sum(values), 3),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p95_ms": stats["p95"],
+            }
+        return stages
+
+
+def read_session(path: Path) -> tuple[list[str], list[str]]:
+    """User messages and assistant replies of a session JSONL file, in order."""
+    users, replies = [], []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        if data.get("_type") == "metadata" or not isinstance(data.get("content"), str):
+            continue
+        if data.get("role") == "user":
+            users.append(data["content"])
+        elif data.get("role") == "assistant":
+            replies.append(data["content"])
+    return users, replies
+
+
+def _copy_bootstrap(source: Path | None, target: Path) -> None:
+    """Copy the prompt files and memory so the context matches the original workspace."""
+    if source is None or not source.is_dir():
+        return
+    for path in source.glob("*.md"):
+        shutil.copy2(path, target / path.name)
+    if (source / "memory").is_dir():
+        shutil.copytree(source / "memory", target / "memory", dirs_exist_ok=True)
+
+
+async def replay_sessions(
+    make_agent: Callable[[LLMProvider, Path], Any],
+    session_files: list[Path],
+    workspace: Path,
+    cassettes: Path | None = None,
+    source_workspace: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Replay the user turns of ``session_files`` and report per-stage timings.
+
+    ``make_agent(provider, workspace)`` must return an AgentLoop. LLM calls
+    and tools are answered from ``cassettes`` (see ``record_agent``); without
+    one, the session's own assistant replies are used. Sessions start empty
+    in ``workspace`` so every turn rebuilds history the way it did live.
+    """
+    _copy_bootstrap(source_workspace, workspace)
+    cassette = Cassette(cassettes) if cassettes else None
+    provider = ReplayProvider(cassette)
+    agent = make_agent(provider, workspace)
+    agent.tools = tools = ReplayToolRegistry(agent.tools, cassette)
+
+    timer = StageTimer()
+    timer.wrap(agent.context, "build_messages", "context")
+    timer.wrap(agent.provider, "chat", "llm")
+    timer.wrap(agent.tools, "execute", "tools")
+    timer.wrap(agent.sessions, "get_or_create", "session_load")
+    timer.wrap(agent.sessions, "save", "session_save")
+
+    turns = 0
+    start = time.perf_counter()
+    for path in session_files:
+        key = path.stem.replace("_", ":", 1)
+        users, replies = read_session(path)
+        provider.fallback_replies[key] = deque(replies)
+        channel, _, chat_id = key.partition(":")
+        for content in users:
+            with timer.measure("turn"):
+                await agent.process_direct(content, session_key=key, channel=channel, chat_id=chat_id or "direct")
+            turns += 1
+    wall = time.perf_counter() - start
+
+    return {
+        "sessions": len(session_files),
+        "turns": turns,
+        "wall_s": round(wall, 3),
+        "misses": provider.misses + tools.misses,
+        "stages": timer.report(),
+    }
+
+
+def compare_reports(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Mean time per stage against a baseline report, with absolute and relative deltas."""
+    deltas = {}
+    for stage, stats in current.get("stages", {}).items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        delta = stats["mean_ms"] - before["mean_ms"]
+        deltas[stage] = {
+            "baseline_ms": before["mean_ms"],
+            "current_ms": stats["mean_ms"],
+            "delta_ms": round(delta, 3),
+            "delta_pct": round(delta / before["mean_ms"] * 100, 1) if before["mean_ms"] else 0.0,
+        }
+    return deltas
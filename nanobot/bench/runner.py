@@ -0,0 +1,158 @@
+"""Drive an agent through the message bus with simulated concurrent chats."""
+
+import asyncio
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+
+
+class _TimedBus(MessageBus):
+    """MessageBus that stamps when the agent picks up each message."""
+
+    async def consume_inbound(self) -> InboundMessage:
+        msg = await super().consume_inbound()
+        msg.metadata["bench_dequeued"] = time.perf_counter()
+        return msg
+
+
+class SyntheticChannel(BaseChannel):
+    """In-memory channel standing in for N users chatting at once."""
+
+    name = "bench"
+
+    def __init__(self, bus: MessageBus):
+        super().__init__(SimpleNamespace(allow_from=[]), bus)
+        self.progress_messages = 0
+        self._replies: dict[str, asyncio.Queue[tuple[float, OutboundMessage]]] = defaultdict(asyncio.Queue)
+
+    async def start(self) -> None:
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if msg.metadata.get("_progress"):
+            self.progress_messages += 1
+            return
+        self._replies[msg.chat_id].put_nowait((time.perf_counter(), msg))
+
+    async def ask(self, chat_id: str, content: str, timeout: float) -> dict[str, float]:
+        """Send one message and wait for the final reply; returns timings in ms."""
+        sent = time.perf_counter()
+        await self._handle_message(
+            sender_id=f"user-{chat_id}", chat_id=chat_id, content=content, metadata={"bench_sent": sent},
+        )
+        received, reply = await asyncio.wait_for(self._replies[chat_id].get(), timeout)
+        dequeued = reply.metadata.get("bench_dequeued", sent)
+        return {"latency_ms": (received - sent) * 1000, "queue_ms": (dequeued - sent) * 1000}
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Nearest-rank p50/p95/p99 plus mean and max."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1]
+
+    return {
+        "p50": round(rank(50), 2),
+        "p95": round(rank(95), 2),
+        "p99": round(rank(99), 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return 0.0
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MB (0 if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+async def run_benchmark(
+    make_agent: Callable[[MessageBus], Any],
+    chats: int = 8,
+    turns: int = 5,
+    message: str = "What files are in the workspace?",
+    timeout: float = 120.0,
+) -> dict[str, Any]:
+    """
+    Run ``chats`` concurrent conversations of ``turns`` messages each.
+
+    Every chat sends its next message as soon as the previous reply
+    arrives. ``make_agent(bus)`` must return an object with ``run()`` and
+    ``stop()`` (an AgentLoop or WorkerPool).
+    """
+    bus = _TimedBus()
+    channel = SyntheticChannel(bus)
+    agent = make_agent(bus)
+    await channel.start()
+    agent_task = asyncio.create_task(agent.run())
+
+    async def dispatch() -> None:
+        while True:
+            await channel.send(await bus.consume_outbound())
+
+    dispatch_task = asyncio.create_task(dispatch())
+    samples: list[dict[str, float]] = []
+    errors = 0
+
+    async def chat(index: int) -> None:
+        nonlocal errors
+        for turn in range(turns):
+            try:
+                samples.append(await channel.ask(f"chat-{index}", f"{message} (turn {turn + 1})", timeout))
+            except asyncio.TimeoutError:
+                errors += 1
+
+    rss_start = rss_mb()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(chat(i) for i in range(chats)))
+        wall = time.perf_counter() - start
+    finally:
+        agent.stop()
+        dispatch_task.cancel()
+        await asyncio.gather(agent_task, dispatch_task, return_exceptions=True)
+        await channel.stop()
+
+    return {
+        "chats": chats,
+        "turns_per_chat": turns,
+        "turns": len(samples),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_turns_per_s": round(len(samples) / wall, 3) if wall else 0.0,
+        "latency_ms": percentiles([s["latency_ms"] for s in samples]),
+        "queue_ms": percentiles([s["queue_ms"] for s in samples]),
+        "progress_messages": channel.progress_messages,
+        "memory_mb": {
+            "rss_start": round(rss_start, 1),
+            "rss_end": round(rss_mb(), 1),
+            "peak_rss": round(peak_rss_mb(), 1),
+        },
+    }
@@ -16,6 +16,7 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    trace_id: str | None = None  # Set when published; carried to the replies
     
     @property
     def session_key(self) -> str:
@@ -33,5 +34,6 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    trace_id: str | None = None  # Trace of the turn that produced this message
 
 
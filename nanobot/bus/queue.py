@@ -6,6 +6,8 @@ from typing import Callable, Awaitable
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.utils.metrics import BUS_DEPTH
+from nanobot.utils.tracing import new_trace_id
 
 
 class MessageBus:
@@ -21,15 +23,27 @@ class MessageBus:
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
         self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
         self._running = False
+        BUS_DEPTH.set_function(self.inbound.qsize, queue="inbound")
+        BUS_DEPTH.set_function(self.outbound.qsize, queue="outbound")
     
     async def publish_inbound(self, msg: InboundMessage) -> None:
         """Publish a message from a channel to the agent."""
+        if msg.trace_id is None:
+            msg.trace_id = new_trace_id()
         await self.inbound.put(msg)
     
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
     
+    def inbound_done(self) -> None:
+        """Mark a consumed inbound message as fully handled."""
+        self.inbound.task_done()
+
+    async def join_inbound(self) -> None:
+        """Wait until every published inbound message has been handled."""
+        await self.inbound.join()
+
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
         await self.outbound.put(msg)
@@ -38,6 +52,14 @@ class MessageBus:
         """Consume the next outbound message (blocks until available)."""
         return await self.outbound.get()
     
+    def outbound_done(self) -> None:
+        """Mark a consumed outbound message as delivered (or given up on)."""
+        self.outbound.task_done()
+
+    async def join_outbound(self) -> None:
+        """Wait until every published outbound message has been delivered."""
+        await self.outbound.join()
+
     def subscribe_outbound(
         self, 
         channel: str, 
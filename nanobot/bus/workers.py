@@ -0,0 +1,393 @@
+"""Multi-process agent workers connected to the gateway over a Unix socket.
+
+The gateway process keeps channel I/O, cron and heartbeat, and routes every
+inbound message to one of N agent worker processes. Routing uses consistent
+hashing of the session key, so a session's in-memory state (session cache,
+tool context, subagents) always lives on the same worker.
+
+Frames are newline-delimited JSON objects with a "type" field:
+  gateway → worker: inbound, direct, drain, metrics
+  worker → gateway: hello, outbound, result
+"""
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.utils.metrics import REGISTRY
+
+VIRTUAL_NODES = 64  # Points per worker on the hash ring
+RESPAWN_DELAY_S = 1.0
+METRICS_TIMEOUT_S = 2.0  # How long a /metrics scrape waits for each worker
+FRAME_LIMIT = 64 * 1024 * 1024  # Max bytes per frame (large tool outputs, media paths)
+
+
+class HashRing:
+    """Consistent hash ring mapping session keys to worker indexes."""
+
+    def __init__(self, nodes: list[int], replicas: int = VIRTUAL_NODES):
+        self._points: list[int] = []
+        self._owners: list[int] = []
+        ring = sorted(
+            (self._hash(f"worker-{node}#{i}"), node)
+            for node in nodes
+            for i in range(replicas)
+        )
+        for point, node in ring:
+            self._points.append(point)
+            self._owners.append(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def get(self, key: str) -> int:
+        """Return the worker index owning *key*."""
+        if not self._points:
+            raise ValueError("Hash ring has no nodes")
+        idx = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[idx]
+
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+
+def encode_frame(frame: dict[str, Any]) -> bytes:
+    """Serialize a frame as one JSON line."""
+    return (json.dumps(frame, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def inbound_to_dict(msg: InboundMessage) -> dict[str, Any]:
+    return {
+        "channel": msg.channel,
+        "sender_id": msg.sender_id,
+        "chat_id": msg.chat_id,
+        "content": msg.content,
+        "timestamp": msg.timestamp.isoformat(),
+        "media": msg.media,
+        "metadata": msg.metadata,
+        "trace_id": msg.trace_id,
+    }
+
+
+def inbound_from_dict(data: dict[str, Any]) -> InboundMessage:
+    return InboundMessage(
+        channel=data["channel"],
+        sender_id=data["sender_id"],
+        chat_id=data["chat_id"],
+        content=data["content"],
+        timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else datetime.now(),
+        media=data.get("media") or [],
+        metadata=data.get("metadata") or {},
+        trace_id=data.get("trace_id"),
+    )
+
+
+def outbound_to_dict(msg: OutboundMessage) -> dict[str, Any]:
+    return {
+        "channel": msg.channel,
+        "chat_id": msg.chat_id,
+        "content": msg.content,
+        "reply_to": msg.reply_to,
+        "media": msg.media,
+        "metadata": msg.metadata,
+        "trace_id": msg.trace_id,
+    }
+
+
+def outbound_from_dict(data: dict[str, Any]) -> OutboundMessage:
+    return OutboundMessage(
+        channel=data["channel"],
+        chat_id=data["chat_id"],
+        content=data["content"],
+        reply_to=data.get("reply_to"),
+        media=data.get("media") or [],
+        metadata=data.get("metadata") or {},
+        trace_id=data.get("trace_id"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Gateway side
+# ---------------------------------------------------------------------------
+
+class WorkerPool:
+    """
+    Owns the agent worker processes and routes messages to them.
+
+    Inbound messages are consumed from the gateway bus and forwarded to the
+    worker that owns their session; outbound messages from workers are
+    published back onto the gateway bus for the channel manager.
+    """
+
+    def __init__(self, bus: MessageBus, workers: int, socket_path: Path):
+        if workers < 1:
+            raise ValueError("WorkerPool needs at least one worker")
+        self.bus = bus
+        self.workers = workers
+        self.socket_path = socket_path
+        self.ring = HashRing(list(range(workers)))
+        self._outboxes: dict[int, asyncio.Queue[dict[str, Any]]] = {
+            i: asyncio.Queue() for i in range(workers)
+        }
+        # A frame taken from an outbox but not yet written; sent first on reconnect
+        self._unsent: dict[int, dict[str, Any] | None] = {i: None for i in range(workers)}
+        self._pending: dict[str, tuple[int, asyncio.Future[str]]] = {}
+        self._ids = itertools.count(1)
+        self._server: asyncio.AbstractServer | None = None
+        self._procs: dict[int, asyncio.subprocess.Process] = {}
+        self._connected: set[int] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def alive_workers(self) -> int:
+        """Number of worker processes currently running."""
+        return sum(1 for proc in self._procs.values() if proc.returncode is None)
+
+    def worker_for(self, session_key: str) -> int:
+        """Return the worker index that owns a session."""
+        return self.ring.get(session_key)
+
+    async def start(self) -> None:
+        """Listen on the Unix socket and spawn the worker processes."""
+        self._running = True
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.socket_path), limit=FRAME_LIMIT,
+        )
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._supervise(i)))
+        logger.info(f"Worker pool started: {self.workers} workers on {self.socket_path}")
+
+    async def run(self) -> None:
+        """Route inbound messages from the bus to their session's worker."""
+        while self._running:
+            try:
+                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            key = msg.chat_id if msg.channel == "system" else msg.session_key
+            await self._outboxes[self.worker_for(key)].put(
+                {"type": "inbound", "message": inbound_to_dict(msg)}
+            )
+            self.bus.inbound_done()
+
+    async def process_direct(
+        self,
+        content: str,
+        session_key: str = "cli:direct",
+        channel: str = "cli",
+        chat_id: str = "direct",
+    ) -> str:
+        """Run one turn on the owning worker and wait for its reply (cron, heartbeat)."""
+        return await self._request(self.worker_for(session_key), {
+            "type": "direct", "content": content,
+            "session_key": session_key, "channel": channel, "chat_id": chat_id,
+        })
+
+    async def drain(self) -> None:
+        """Wait until the workers have answered every message already on the bus."""
+        if not self._running:
+            return
+        await self.bus.join_inbound()
+        await asyncio.gather(
+            *(self._request(i, {"type": "drain"}) for i in range(self.workers)),
+            return_exceptions=True,
+        )
+
+    async def metrics(self) -> list[tuple[str, str]]:
+        """Rendered metrics of each connected worker, labelled ``worker="<index>"``."""
+        async def scrape(index: int) -> str:
+            return await asyncio.wait_for(self._request(index, {"type": "metrics"}), METRICS_TIMEOUT_S)
+
+        indexes = sorted(self._connected)
+        results = await asyncio.gather(*(scrape(i) for i in indexes), return_exceptions=True)
+        return [(f'worker="{i}"', text) for i, text in zip(indexes, results) if isinstance(text, str)]
+
+    async def _request(self, worker: int, frame: dict[str, Any]) -> str:
+        """Send a frame that the worker answers with a ``result`` frame and wait for it."""
+        request_id = str(next(self._ids))
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (worker, future)
+        await self._outboxes[worker].put({**frame, "id": request_id})
+        try:
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def stop(self) -> None:
+        """Stop routing, terminate workers and remove the socket."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for proc in self._procs.values():
+            if proc.returncode is None:
+                proc.terminate()
+        for proc in self._procs.values():
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+        self._procs.clear()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+    async def _spawn(self, index: int) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "nanobot", "gateway-worker",
+            "--socket", str(self.socket_path), "--index", str(index),
+        )
+
+    async def _supervise(self, index: int) -> None:
+        """Keep one worker process alive, respawning it if it exits."""
+        while self._running:
+            proc = await self._spawn(index)
+            self._procs[index] = proc
+            code = await proc.wait()
+            if not self._running:
+                break
+            logger.warning(f"Agent worker {index} exited with code {code}, restarting")
+            await asyncio.sleep(RESPAWN_DELAY_S)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+        except json.JSONDecodeError:
+            hello = {}
+        index = hello.get("worker")
+        if hello.get("type") != "hello" or index not in self._outboxes:
+            writer.close()
+            return
+        logger.info(f"Agent worker {index} connected (pid {hello.get('pid')})")
+        self._connected.add(index)
+
+        pump = asyncio.create_task(self._pump(index, writer))
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                kind = frame.get("type")
+                if kind == "outbound":
+                    await self.bus.publish_outbound(outbound_from_dict(frame["message"]))
+                elif kind == "result":
+                    if entry := self._pending.get(frame.get("id", "")):
+                        if not entry[1].done():
+                            entry[1].set_result(frame.get("content") or "")
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"Agent worker {index} connection error: {e}")
+        finally:
+            self._connected.discard(index)
+            pump.cancel()
+            writer.close()
+            self._fail_pending(index)
+            logger.info(f"Agent worker {index} disconnected")
+
+    async def _pump(self, index: int, writer: asyncio.StreamWriter) -> None:
+        """Forward queued frames to a connected worker, in order."""
+        outbox = self._outboxes[index]
+        while True:
+            if self._unsent[index] is None:
+                self._unsent[index] = await outbox.get()
+            try:
+                writer.write(encode_frame(self._unsent[index]))
+                await writer.drain()
+            except ConnectionError:
+                return  # The frame stays first in line for the respawned worker
+            self._unsent[index] = None
+
+    def _fail_pending(self, index: int) -> None:
+        for worker, future in list(self._pending.values()):
+            if worker == index and not future.done():
+                future.set_exception(RuntimeError(f"Agent worker {index} disconnected"))
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+async def run_worker(agent: Any, bus: MessageBus, socket_path: Path, index: int) -> None:
+    """
+    Serve one agent worker: feed gateway frames into a local bus and agent.
+
+    Args:
+        agent: The worker's AgentLoop (consumes from *bus*).
+        bus: The worker-local message bus.
+        socket_path: Gateway Unix socket path.
+        index: This worker's index on the hash ring.
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=FRAME_LIMIT)
+    writer.write(encode_frame({"type": "hello", "worker": index, "pid": os.getpid()}))
+    await writer.drain()
+
+    async def forward_outbound() -> None:
+        while True:
+            msg = await bus.consume_outbound()
+            try:
+                writer.write(encode_frame({"type": "outbound", "message": outbound_to_dict(msg)}))
+                await writer.drain()
+            finally:
+                bus.outbound_done()
+
+    async def direct(frame: dict[str, Any]) -> None:
+        try:
+            content = await agent.process_direct(
+                frame["content"],
+                session_key=frame["session_key"],
+                channel=frame["channel"],
+                chat_id=frame["chat_id"],
+            )
+        except Exception as e:
+            logger.error(f"Worker {index}: direct request failed: {e}")
+            content = f"Error: {e}"
+        writer.write(encode_frame({"type": "result", "id": frame["id"], "content": content}))
+        await writer.drain()
+
+    async def drain(frame: dict[str, Any]) -> None:
+        # Replies are written before the result, so the gateway has them when it resumes
+        await bus.join_inbound()
+        await bus.join_outbound()
+        writer.write(encode_frame({"type": "result", "id": frame["id"], "content": ""}))
+        await writer.drain()
+
+    tasks = [asyncio.create_task(agent.run()), asyncio.create_task(forward_outbound())]
+    direct_tasks: set[asyncio.Task] = set()
+    try:
+        while line := await reader.readline():
+            frame = json.loads(line)
+            if frame.get("type") == "inbound":
+                await bus.publish_inbound(inbound_from_dict(frame["message"]))
+            elif frame.get("type") == "metrics":
+                writer.write(encode_frame({"type": "result", "id": frame["id"], "content": REGISTRY.render()}))
+                await writer.drain()
+            elif frame.get("type") in ("direct", "drain"):
+                handler = direct if frame["type"] == "direct" else drain
+                task = asyncio.create_task(handler(frame))
+                direct_tasks.add(task)
+                task.add_done_callback(direct_tasks.discard)
+        logger.info(f"Worker {index}: gateway closed the connection")
+    finally:
+        agent.stop()
+        for task in [*tasks, *direct_tasks]:
+            task.cancel()
+        await asyncio.gather(*tasks, *direct_tasks, return_exceptions=True)
+        writer.close()
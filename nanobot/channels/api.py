@@ -0,0 +1,208 @@
+"""OpenAI-compatible chat completions API served on the gateway port."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.config.schema import ApiConfig
+from nanobot.utils.http_server import Request, Response, is_loopback
+
+SESSION_HEADER = "x-session-id"
+
+
+def _error(message: str, status: int, kind: str = "invalid_request_error") -> Response:
+    return Response.json({"error": {"message": message, "type": kind}}, status)
+
+
+def key_name(key: str) -> str:
+    """Caller identity of an unnamed API key."""
+    return "key-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+
+
+def _text(content: Any) -> str:
+    """Text of an OpenAI message content (a string or a list of parts)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(p.get("text", "") for p in content if isinstance(p, dict) and p.get("type") == "text")
+    return ""
+
+
+class ApiChannel(BaseChannel):
+    """
+    Drive the agent over HTTP with ``/v1/chat/completions`` and ``/v1/models``.
+
+    Requests go through the message bus like any chat message. The sender
+    is the caller named by its API key; the session is ``X-Session-Id`` or
+    the ``user`` field (a fresh one per request if neither is set), scoped to
+    the caller. The agent keeps the conversation history, so only the
+    last user message of each request is used. With ``stream: true`` the
+    reply is sent as server-sent events; progress updates go out as SSE
+    comments to keep the connection alive during long turns.
+    """
+
+    name = "api"
+
+    def __init__(self, config: ApiConfig, bus: MessageBus):
+        super().__init__(config, bus)
+        self.config: ApiConfig = config
+        self._replies: dict[str, asyncio.Queue[OutboundMessage]] = {}
+        self._by_chat: dict[str, list[str]] = defaultdict(list)
+
+    def mount(self, server: Any) -> None:
+        """Register the API routes on a ``GatewayServer``; refuses to serve other hosts without API keys."""
+        if not self.config.api_keys and not is_loopback(server.host):
+            raise ValueError(
+                f"The API channel needs channels.api.apiKeys when the gateway listens on {server.host}; "
+                "set keys or bind gateway.host to 127.0.0.1"
+            )
+        server.add_route("POST", "/v1/chat/completions", self._chat_completions)
+        server.add_route("GET", "/v1/models", self._models)
+
+    async def start(self) -> None:
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+
+    async def send(self, msg: OutboundMessage) -> None:
+        request_id = msg.metadata.get("api_request_id")
+        if request_id not in self._replies:
+            # Sent by a tool (e.g. message) rather than as the reply: hand it to the chat's oldest request
+            pending = self._by_chat.get(msg.chat_id)
+            if not pending:
+                logger.debug(f"API: dropping message for {msg.chat_id} with no open request")
+                return
+            request_id = pending[0]
+            msg.metadata = {**msg.metadata, "_extra": True}
+        self._replies[request_id].put_nowait(msg)
+
+    def _caller(self, request: Request) -> str | None:
+        """Name of the caller's API key, or None if the key is missing or wrong."""
+        keys = self.config.api_keys
+        if not keys:
+            return "local"  # Only served on loopback, see mount()
+        auth = request.headers.get("authorization", "")
+        token = auth[7:] if auth.lower().startswith("bearer ") else ""
+        named = keys.items() if isinstance(keys, dict) else ((key_name(k), k) for k in keys)
+        caller = None
+        for name, key in named:
+            if hmac.compare_digest(token.encode("utf-8"), key.encode("utf-8")):
+                caller = name
+        return caller
+
+    async def _models(self, request: Request) -> Response:
+        if self._caller(request) is None:
+            return _error("Invalid API key", 401, "authentication_error")
+        return Response.json({
+            "object": "list",
+            "data": [{"id": self.config.model_name, "object": "model", "created": 0, "owned_by": "nanobot"}],
+        })
+
+    async def _chat_completions(self, request: Request) -> Response:
+        if (caller := self._caller(request)) is None:
+            return _error("Invalid API key", 401, "authentication_error")
+        if not self.is_allowed(caller):
+            return _error(f"Caller '{caller}' is not allowed", 403, "permission_error")
+        try:
+            body = request.json()
+            messages = body["messages"]
+        except (ValueError, KeyError, TypeError):
+            messages = None
+        if not isinstance(messages, list) or not all(isinstance(m, dict) for m in messages):
+            return _error("Body must be JSON with a 'messages' list of objects", 400)
+        content = next((_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+        if not content.strip():
+            return _error("No user message to answer", 400)
+
+        session = request.headers.get(SESSION_HEADER) or body.get("user") or uuid.uuid4().hex
+        chat_id = f"{caller}:{session}"  # Callers cannot reach each other's sessions
+
+        request_id = uuid.uuid4().hex
+        self._replies[request_id] = asyncio.Queue()
+        self._by_chat[chat_id].append(request_id)
+        await self._handle_message(
+            sender_id=caller, chat_id=chat_id, content=content, metadata={"api_request_id": request_id},
+        )
+        completion = {"id": f"chatcmpl-{request_id}", "created": int(time.time()), "model": self.config.model_name}
+        if body.get("stream"):
+            return Response(
+                stream=self._stream(request_id, chat_id, completion),
+                content_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
+
+        try:
+            reply = await self._collect(request_id, on_progress=None)
+        except asyncio.TimeoutError:
+            return _error("The agent did not reply in time", 504, "timeout_error")
+        finally:
+            self._close(request_id, chat_id)
+        return Response.json({
+            **completion,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    async def _collect(self, request_id: str, on_progress: asyncio.Queue | None) -> str:
+        """Wait for the final reply; tool-sent messages are prepended to it."""
+        queue = self._replies[request_id]
+        extra: list[str] = []
+        deadline = time.monotonic() + self.config.timeout_s
+        while True:
+            msg = await asyncio.wait_for(queue.get(), max(0.0, deadline - time.monotonic()))
+            if msg.metadata.get("_progress"):
+                if on_progress is not None:
+                    on_progress.put_nowait(msg.content)
+            elif msg.metadata.get("_extra"):
+                extra.append(msg.content)
+            else:
+                return "\n\n".join([*extra, msg.content])
+
+    def _close(self, request_id: str, chat_id: str) -> None:
+        self._replies.pop(request_id, None)
+        pending = self._by_chat.get(chat_id, [])
+        if request_id in pending:
+            pending.remove(request_id)
+        if not pending:
+            self._by_chat.pop(chat_id, None)
+
+    async def _stream(self, request_id: str, chat_id: str, completion: dict[str, Any]) -> AsyncIterator[bytes]:
+        def event(delta: dict[str, Any], finish: str | None = None) -> bytes:
+            chunk = {**completion, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        progress: asyncio.Queue[str] = asyncio.Queue()
+        reply = asyncio.create_task(self._collect(request_id, progress))
+        try:
+            yield event({"role": "assistant", "content": ""})
+            while not reply.done():
+                getter = asyncio.create_task(progress.get())
+                done, _ = await asyncio.wait({reply, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    text = getter.result().replace("\n", " ")
+                    yield f": progress {text}\n\n".encode("utf-8")
+                else:
+                    getter.cancel()
+            try:
+                yield event({"content": reply.result()})
+                yield event({}, "stop")
+            except asyncio.TimeoutError:
+                error = {"error": {"message": "The agent did not reply in time", "type": "timeout_error"}}
+                yield f"data: {json.dumps(error)}\n\n".encode("utf-8")
+            yield b"data: [DONE]\n\n"
+        finally:
+            reply.cancel()
+            self._close(request_id, chat_id)
@@ -1,6 +1,9 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Any
 
 from loguru import logger
@@ -8,6 +11,39 @@ from loguru import logger
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 
+# A burst is flushed at the latest this many windows after its first message,
+# so a chat that never pauses still gets answered.
+MAX_BURST_WINDOWS = 5
+
+
+@dataclass
+class _Burst:
+    """Inbound messages from one chat waiting for the debounce window to close."""
+    messages: list[InboundMessage] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    timer: asyncio.Task | None = None
+
+
+def merge_burst(messages: list[InboundMessage]) -> InboundMessage:
+    """Merge a burst of messages from one chat into a single inbound message."""
+    if len(messages) == 1:
+        return messages[0]
+    multi_sender = len({m.sender_id for m in messages}) > 1
+    lines = [f"{m.sender_id}: {m.content}" if multi_sender else m.content for m in messages if m.content]
+    metadata: dict[str, Any] = {}
+    for m in messages:
+        metadata.update(m.metadata)  # Latest message wins (reply targets, thread ids)
+    last = messages[-1]
+    return InboundMessage(
+        channel=last.channel,
+        sender_id=last.sender_id,
+        chat_id=last.chat_id,
+        content="\n".join(lines),
+        timestamp=messages[0].timestamp,
+        media=[p for m in messages for p in m.media],
+        metadata=metadata,
+    )
+
 
 class BaseChannel(ABC):
     """
@@ -30,6 +66,7 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._bursts: dict[str, _Burst] = {}
     
     @abstractmethod
     async def start(self) -> None:
@@ -94,7 +131,9 @@ class BaseChannel(ABC):
         """
         Handle an incoming message from the chat platform.
         
-        This method checks permissions and forwards to the bus.
+        This method checks permissions and forwards to the bus. If the channel
+        config sets ``debounce_ms``, messages from the same chat arriving within
+        that window are merged into one turn.
         
         Args:
             sender_id: The sender's identifier.
@@ -119,7 +158,45 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        window_s = getattr(self.config, "debounce_ms", 0) / 1000
+        if window_s <= 0:
+            await self.bus.publish_inbound(msg)
+            return
+
+        key = msg.chat_id
+        if msg.content.strip().startswith("/"):
+            # Commands are never merged; flush first to keep ordering
+            await self._flush_burst(key)
+            await self.bus.publish_inbound(msg)
+            return
+
+        burst = self._bursts.setdefault(key, _Burst())
+        burst.messages.append(msg)
+        if burst.timer:
+            burst.timer.cancel()
+        deadline = burst.started + window_s * MAX_BURST_WINDOWS
+        delay = max(0.0, min(window_s, deadline - time.monotonic()))
+        burst.timer = asyncio.create_task(self._flush_burst_after(key, delay))
+
+    async def _flush_burst_after(self, key: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._flush_burst(key)
+
+    async def _flush_burst(self, key: str) -> None:
+        """Publish the pending burst for a chat, if any, as one message."""
+        burst = self._bursts.pop(key, None)
+        if not burst:
+            return
+        if burst.timer and burst.timer is not asyncio.current_task():
+            burst.timer.cancel()
+        if len(burst.messages) > 1:
+            logger.debug(f"{self.name}: merged {len(burst.messages)} messages from {key}")
+        await self.bus.publish_inbound(merge_burst(burst.messages))
+
+    async def flush_bursts(self) -> None:
+        """Publish every pending burst now (before the channel stops)."""
+        for key in list(self._bursts):
+            await self._flush_burst(key)
     
     @property
     def is_running(self) -> bool:
@@ -11,6 +11,10 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
+from nanobot.utils.metrics import CHANNEL_SEND_DURATION, CHANNEL_SEND_ERRORS
+from nanobot.utils.tracing import tracer
+
+OUTBOUND_DRAIN_S = 10.0  # Longest wait for queued replies when stopping
 
 
 class ChannelManager:
@@ -136,6 +140,12 @@ class ChannelManager:
                 logger.info("QQ channel enabled")
             except ImportError as e:
                 logger.warning(f"QQ channel not available: {e}")
+
+        # OpenAI-compatible HTTP API (routes are mounted on the gateway server)
+        if self.config.channels.api.enabled:
+            from nanobot.channels.api import ApiChannel
+            self.channels["api"] = ApiChannel(self.config.channels.api, self.bus)
+            logger.info("API channel enabled")
     
     async def _start_channel(self, name: str, channel: BaseChannel) -> None:
         """Start a channel and log any exceptions."""
@@ -162,12 +172,25 @@ class ChannelManager:
         # Wait for all to complete (they should run forever)
         await asyncio.gather(*tasks, return_exceptions=True)
     
+    async def flush_bursts(self) -> None:
+        """Hand messages still in a debounce window to the agent (before it stops)."""
+        for name, channel in self.channels.items():
+            try:
+                await channel.flush_bursts()
+            except Exception as e:
+                logger.error(f"Error flushing {name}: {e}")
+
     async def stop_all(self) -> None:
-        """Stop all channels and the dispatcher."""
+        """Send the replies still queued, then stop the dispatcher and all channels."""
         logger.info("Stopping all channels...")
         
         # Stop dispatcher
         if self._dispatch_task:
+            try:
+                if not self._dispatch_task.done():
+                    await asyncio.wait_for(self.bus.join_outbound(), timeout=OUTBOUND_DRAIN_S)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self.bus.outbound_size} outbound messages not sent before shutdown")
             self._dispatch_task.cancel()
             try:
                 await self._dispatch_task
@@ -196,11 +219,17 @@ class ChannelManager:
                 channel = self.channels.get(msg.channel)
                 if channel:
                     try:
-                        await channel.send(msg)
+                        with (
+                            CHANNEL_SEND_DURATION.time(channel=msg.channel),
+                            tracer.span("channel.send", trace_id=msg.trace_id, channel=msg.channel),
+                        ):
+                            await channel.send(msg)
                     except Exception as e:
+                        CHANNEL_SEND_ERRORS.inc(channel=msg.channel)
                         logger.error(f"Error sending to {msg.channel}: {e}")
                 else:
                     logger.warning(f"Unknown channel: {msg.channel}")
+                self.bus.outbound_done()
                     
             except asyncio.TimeoutError:
                 continue
@@ -9,7 +9,6 @@ import sys
 
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.table import Table
 from rich.text import Text
 
@@ -29,6 +28,7 @@ app = typer.Typer(
 
 console = Console()
 EXIT_COMMANDS = {"exit", "quit", "/exit", "/quit", ":q"}
+SHUTDOWN_DRAIN_S = 30.0  # Longest wait for in-flight turns when the gateway stops
 
 # ---------------------------------------------------------------------------
 # CLI input: prompt_toolkit for editing, paste, history, and display
@@ -100,7 +100,11 @@ def _init_prompt_session() -> None:
 def _print_agent_response(response: str, render_markdown: bool) -> None:
     """Render assistant response with consistent terminal styling."""
     content = response or ""
-    body = Markdown(content) if render_markdown else Text(content)
+    if render_markdown:
+        from rich.markdown import Markdown  # markdown-it is slow to import; only needed here
+        body = Markdown(content)
+    else:
+        body = Text(content)
     console.print()
     console.print(f"[cyan]{__logo__} nanobot[/cyan]")
     console.print(body)
@@ -279,38 +283,152 @@ This file stores important information that should persist across sessions.
     skills_dir.mkdir(exist_ok=True)
 
 
-def _make_provider(config: Config):
-    """Create the appropriate LLM provider from config."""
-    from nanobot.providers.litellm_provider import LiteLLMProvider
-    from nanobot.providers.openai_codex_provider import OpenAICodexProvider
-    from nanobot.providers.custom_provider import CustomProvider
+def _make_provider(config: Config, route=None):
+    """
+    Create the LLM provider from config.
+
+    Without ``route`` this is the main model with its failover chain and
+    per-purpose routes. Routes served by the same provider share one set of
+    rate limits and retries; the optional response cache wraps the result.
+    """
+    from nanobot.config.schema import ModelRoute
+
+    defaults = config.agents.defaults
+    ledger = _open_usage_ledger(config) if config.usage.enabled else None
+    leaves: dict = {}
+    if route:
+        provider = _make_chain(config, [route], leaves, ledger)
+    else:
+        provider = _make_chain(config, [ModelRoute(model=defaults.model), *defaults.failover.fallbacks], leaves, ledger)
+        if defaults.routing.routes:
+            from nanobot.providers.router import PurposeRouter
+            provider = PurposeRouter(
+                provider,
+                {purpose: (_make_route_provider(config, r, leaves, ledger), r.model)
+                 for purpose, r in defaults.routing.routes.items()},
+                escalate_on_failure=defaults.routing.escalate_on_failure,
+            )
+
+    budget = config.usage.budget
+    if ledger and (budget.session_tokens or budget.daily_tokens or budget.daily_cost_usd):
+        from nanobot.usage import BudgetProvider
+        downgrade = budget.downgrade_to
+        provider = BudgetProvider(
+            provider,
+            ledger,
+            session_tokens=budget.session_tokens,
+            daily_tokens=budget.daily_tokens,
+            daily_cost_usd=budget.daily_cost_usd,
+            downgrade=(_make_route_provider(config, downgrade, leaves, ledger), downgrade.model) if downgrade else None,
+        )
+
+    cache_cfg = defaults.cache
+    if cache_cfg.enabled:
+        from nanobot.providers.cache import CachingProvider
+        provider = CachingProvider(
+            provider,
+            _open_llm_cache(config),
+            purposes=cache_cfg.purposes,
+            cache_zero_temperature=cache_cfg.cache_zero_temperature,
+        )
+    return provider
+
+
+def _make_chain(config: Config, routes: list, leaves: dict, ledger=None):
+    """Create one provider for a route list, failing over in order if there are several."""
+    members = [(_make_route_provider(config, r, leaves, ledger), r.model) for r in routes]
+    if len(members) == 1:
+        return members[0][0]
+
+    from nanobot.providers.failover import FailoverProvider
+    failover = config.agents.defaults.failover
+    return FailoverProvider(
+        members,
+        timeout_s=failover.timeout_s,
+        hedge=failover.hedge,
+        hedge_min_samples=failover.hedge_min_samples,
+        failure_threshold=failover.failure_threshold,
+        cooldown_s=failover.cooldown_s,
+    )
+
+
+def _make_route_provider(config: Config, route, leaves: dict, ledger=None):
+    """Create (or reuse) the governed, metered provider serving one model route."""
+    from nanobot.providers.governor import GovernedProvider
+
+    key = config.get_provider_name(route.model, route.provider) or route.model
+    if key in leaves:
+        return leaves[key]
+    p = config.get_provider(route.model, route.provider)
+    provider = GovernedProvider(
+        _make_base_provider(config, route.model, route.provider),
+        rpm=p.rpm if p else 0,
+        tpm=p.tpm if p else 0,
+        max_concurrency=p.max_concurrency if p else 0,
+        max_retries=p.max_retries if p else 3,
+    )
+    if ledger:
+        from nanobot.usage import MeteredProvider
+        provider = MeteredProvider(provider, ledger)
+    leaves[key] = provider
+    return provider
+
+
+def _open_llm_cache(config: Config):
+    """Open the on-disk LLM response cache."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.utils.diskcache import DiskCache
+
+    cache_cfg = config.agents.defaults.cache
+    return DiskCache(
+        get_data_dir() / "cache" / "llm.sqlite",
+        max_bytes=cache_cfg.max_size_mb * 1024 * 1024,
+        default_ttl=cache_cfg.ttl_s,
+    )
+
+
+def _open_usage_ledger(config: Config):
+    """Open the token usage ledger."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage import UsageLedger
+
+    return UsageLedger(get_data_dir() / "usage" / "ledger.sqlite", prices=config.usage.prices)
 
-    model = config.agents.defaults.model
-    provider_name = config.get_provider_name(model)
-    p = config.get_provider(model)
+
+def _make_base_provider(config: Config, model: str, provider: str | None = None):
+    """Create the appropriate LLM provider for a model.
+
+    Provider modules are imported only for the branch taken: litellm alone
+    takes seconds to import and is not needed for Codex or custom endpoints.
+    """
+    provider_name = config.get_provider_name(model, provider)
+    p = config.get_provider(model, provider)
 
     # OpenAI Codex (OAuth)
     if provider_name == "openai_codex" or model.startswith("openai-codex/"):
+        from nanobot.providers.openai_codex_provider import OpenAICodexProvider
         return OpenAICodexProvider(default_model=model)
 
     # Custom: direct OpenAI-compatible endpoint, bypasses LiteLLM
     if provider_name == "custom":
+        from nanobot.providers.custom_provider import CustomProvider
         return CustomProvider(
             api_key=p.api_key if p else "no-key",
-            api_base=config.get_api_base(model) or "http://localhost:8000/v1",
+            api_base=config.get_api_base(model, provider) or "http://localhost:8000/v1",
             default_model=model,
         )
 
     from nanobot.providers.registry import find_by_name
     spec = find_by_name(provider_name)
     if not model.startswith("bedrock/") and not (p and p.api_key) and not (spec and spec.is_oauth):
-        console.print("[red]Error: No API key configured.[/red]")
+        console.print(f"[red]Error: No API key configured for {model}.[/red]")
         console.print("Set one in ~/.nanobot/config.json under providers section")
         raise typer.Exit(1)
 
+    from nanobot.providers.litellm_provider import LiteLLMProvider
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
-        api_base=config.get_api_base(model),
+        api_base=config.get_api_base(model, provider),
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=provider_name,
@@ -324,51 +442,53 @@ def _make_provider(config: Config):
 
 @app.command()
 def gateway(
-    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    port: int = typer.Option(None, "--port", "-p", help="Gateway HTTP port (default: gateway.port)"),
+    workers: int = typer.Option(None, "--workers", "-w", help="Agent worker processes (0 = in-process agent)"),
+    record: Path | None = typer.Option(None, "--record", help="Record LLM responses and tool results to this directory"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
-    from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
+    from nanobot.gateway import GatewayServer
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.utils import http
+    from nanobot.utils.tracing import tracer
     
     if verbose:
         import logging
         logging.basicConfig(level=logging.DEBUG)
     
+    config = load_config()
+    if port is None:
+        port = config.gateway.port
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
-    config = load_config()
+    http.configure(config.http)
+    _configure_web_cache(config)
+    _configure_tracing(config)
     bus = MessageBus()
-    provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    if workers is None:
+        workers = config.gateway.workers
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
     cron = CronService(cron_store_path)
     
-    # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        mcp_servers=config.tools.mcp_servers,
-    )
+    if workers > 0:
+        # Agent turns run in worker processes, sharded by session key
+        from nanobot.bus.workers import WorkerPool
+        agent = WorkerPool(bus, workers, get_data_dir() / "run" / f"gateway-{os.getpid()}.sock")
+    else:
+        agent = _make_agent_loop(config, bus, cron)
+        if record:
+            from nanobot.bench.cassette import record_agent
+            record_agent(agent, record)
+    if record and workers > 0:
+        console.print("[yellow]Warning: --record needs an in-process agent (--workers 0); not recording[/yellow]")
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
@@ -409,32 +529,190 @@ def gateway(
     else:
         console.print("[yellow]Warning: No channels enabled[/yellow]")
     
+    if workers > 0:
+        console.print(f"[green]✓[/green] Agent workers: {workers}")
+
     cron_status = cron.status()
     if cron_status["jobs"] > 0:
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
     
+    def health() -> dict:
+        channel_status = channels.get_status()
+        if workers > 0:
+            agent_ok = agent.alive_workers == workers
+            status = {"agent": {"workers": workers, "alive": agent.alive_workers}}
+        else:
+            agent_ok = agent.is_running
+            status = {"agent": {"running": agent_ok}}
+        channels_ok = all(c["running"] for c in channel_status.values())
+        return {"ok": agent_ok and channels_ok, **status, "channels": channel_status,
+                "bus": {"inbound": bus.inbound_size, "outbound": bus.outbound_size}}
+
+    server = GatewayServer(
+        config.gateway.host, port, health,
+        remote_metrics=agent.metrics if workers > 0 else None,
+        public_metrics=config.gateway.metrics_public,
+    )
+    if api := channels.get_channel("api"):
+        try:
+            api.mount(server)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+
     async def run():
+        monitor = _start_loop_monitor(config)
+        tasks: list[asyncio.Task] = []
         try:
+            try:
+                await server.start()
+                console.print(f"[green]✓[/green] Metrics: {server.url}/metrics")
+            except OSError as e:
+                # Metrics and the API channel are optional; chat channels still run
+                console.print(f"[yellow]Warning: gateway HTTP endpoints unavailable on "
+                              f"{config.gateway.host}:{port}: {e}[/yellow]")
+            if workers > 0:
+                await agent.start()
             await cron.start()
             await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
+            # Not gathered: a cancelled gather would cancel the agent before shutdown drains it
+            tasks = [asyncio.create_task(agent.run()), asyncio.create_task(channels.start_all())]
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
-            await agent.close_mcp()
             heartbeat.stop()
             cron.stop()
-            agent.stop()
-            await channels.stop_all()
+            await _stop_agent_and_channels(agent, channels)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await server.stop()
+            await http.close_all()
+            tracer.flush()
+            if monitor:
+                monitor.stop()
+
+    asyncio.run(run())
+
+
+async def _stop_agent_and_channels(agent, channels) -> None:
+    """
+    Stop the agent and channels without dropping messages in flight.
+
+    Bursts still in a debounce window are handed to the agent, the agent
+    answers everything queued (for up to ``SHUTDOWN_DRAIN_S``), and the
+    dispatcher sends those replies before the channels stop.
+    """
+    from loguru import logger
+
+    from nanobot.agent.loop import AgentLoop
+
+    await channels.flush_bursts()
+    try:
+        await asyncio.wait_for(agent.drain(), timeout=SHUTDOWN_DRAIN_S)
+    except asyncio.TimeoutError:
+        logger.warning("Agent still busy at shutdown; unanswered messages are dropped")
+    if isinstance(agent, AgentLoop):
+        await agent.close_mcp()
+        agent.stop()
+    else:
+        await agent.stop()
+    await channels.stop_all()
+
+
+@app.command("gateway-worker", hidden=True)
+def gateway_worker(
+    socket: Path = typer.Option(..., "--socket", help="Gateway Unix socket path"),
+    index: int = typer.Option(..., "--index", help="Worker index on the hash ring"),
+):
+    """Run one agent worker process for a multi-process gateway."""
+    from nanobot.config.loader import load_config, get_data_dir
+    from nanobot.bus.queue import MessageBus
+    from nanobot.bus.workers import run_worker
+    from nanobot.cron.service import CronService
+    from nanobot.utils import http
+    from nanobot.utils.tracing import tracer
+
+    config = load_config()
+    http.configure(config.http)
+    _configure_web_cache(config)
+    _configure_tracing(config)
+    bus = MessageBus()
+    # Scheduling happens in the gateway; workers only edit the shared job store
+    cron = CronService(get_data_dir() / "cron" / "jobs.json")
+    agent = _make_agent_loop(config, bus, cron)
+
+    async def run():
+        monitor = _start_loop_monitor(config)
+        try:
+            await run_worker(agent, bus, socket, index)
+        finally:
+            await agent.close_mcp()
+            await http.close_all()
+            tracer.flush()
+            if monitor:
+                monitor.stop()
     
     asyncio.run(run())
 
 
+def _configure_web_cache(config: Config) -> None:
+    """Open the web_fetch and web_search caches shared by all sessions and subagents."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.utils import httpcache, searchcache
+
+    httpcache.configure(config.tools.web.cache, get_data_dir() / "cache" / "web.sqlite")
+    searchcache.configure(config.tools.web.search, get_data_dir() / "cache" / "search.sqlite")
+
+
+def _start_loop_monitor(config: Config):
+    """Start logging code that blocks the running event loop, if enabled."""
+    from nanobot.utils.looplag import LoopLagMonitor
+
+    if config.gateway.loop_lag_threshold_ms <= 0:
+        return None
+    monitor = LoopLagMonitor(threshold=config.gateway.loop_lag_threshold_ms / 1000)
+    monitor.start()
+    return monitor
+
+
+def _configure_tracing(config: Config) -> None:
+    """Turn on span tracing if configured."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.utils.tracing import tracer
+
+    tracer.configure(config.tracing, get_data_dir() / "traces" / "spans.jsonl")
+
+
+def _make_agent_loop(config: Config, bus, cron):
+    """Create the gateway's AgentLoop from config."""
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.session.manager import SessionManager
+
+    return AgentLoop(
+        bus=bus,
+        provider=_make_provider(config),
+        workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        temperature=config.agents.defaults.temperature,
+        max_tokens=config.agents.defaults.max_tokens,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        memory_window=config.agents.defaults.memory_window,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        python_config=config.tools.python,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=SessionManager(config.workspace_path),
+        mcp_servers=config.tools.mcp_servers,
+    )
+
+
 
 
 # ============================================================================
@@ -448,15 +726,21 @@ def agent(
     session_id: str = typer.Option("cli:direct", "--session", "-s", help="Session ID"),
     markdown: bool = typer.Option(True, "--markdown/--no-markdown", help="Render assistant output as Markdown"),
     logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs during chat"),
+    record: Path | None = typer.Option(None, "--record", help="Record LLM responses and tool results to this directory"),
 ):
     """Interact with the agent directly."""
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.cron.service import CronService
+    from nanobot.utils import http
+    from nanobot.utils.tracing import tracer
     from loguru import logger
     
     config = load_config()
+    http.configure(config.http)
+    _configure_web_cache(config)
+    _configure_tracing(config)
     
     bus = MessageBus()
     provider = _make_provider(config)
@@ -481,10 +765,14 @@ def agent(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        python_config=config.tools.python,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
     )
+    if record:
+        from nanobot.bench.cassette import record_agent
+        record_agent(agent_loop, record)
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
     def _thinking_ctx():
@@ -504,6 +792,8 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await http.close_all()
+            tracer.flush()
         
         asyncio.run(run_once())
     else:
@@ -546,6 +836,8 @@ def agent(
                         break
             finally:
                 await agent_loop.close_mcp()
+                await http.close_all()
+                tracer.flush()
         
         asyncio.run(run_interactive())
 
@@ -622,6 +914,14 @@ def channels_status():
         slack_config
     )
 
+    # OpenAI-compatible API
+    api = config.channels.api
+    table.add_row(
+        "API",
+        "✓" if api.enabled else "✗",
+        f"port {config.gateway.port}, " + ("token auth" if api.api_keys else "no auth")
+    )
+
     console.print(table)
 
 
@@ -916,6 +1216,270 @@ def status():
                 has_key = bool(p.api_key)
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
+        cache_cfg = config.agents.defaults.cache
+        if cache_cfg.enabled:
+            from nanobot.providers.cache import cache_stats
+
+            stats = cache_stats(_open_llm_cache(config))
+            rate = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+            console.print(
+                f"LLM cache: {stats['hits']}/{stats['lookups']} hits ({rate:.0%}), "
+                f"{stats['saved_tokens']} tokens saved, {stats['entries']} entries "
+                f"({stats['bytes'] / 1024 / 1024:.1f} MB)"
+            )
+
+        _configure_web_cache(config)
+        if config.tools.web.cache.enabled:
+            from nanobot.utils.httpcache import get_cache
+
+            stats = get_cache().stats()
+            rate = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+            console.print(
+                f"Web cache: {stats['hits']}/{stats['lookups']} hits ({rate:.0%}), "
+                f"{stats['entries']} pages ({stats['bytes'] / 1024 / 1024:.1f} MB)"
+            )
+        if config.tools.web.search.api_key:
+            from nanobot.utils.searchcache import get_search_cache
+
+            stats = get_search_cache().stats()
+            rate = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+            quota = config.tools.web.search.monthly_quota
+            console.print(
+                f"Web search: {stats['hits']}/{stats['lookups']} cached ({rate:.0%}), "
+                f"{stats['api_calls_this_month']}{f'/{quota}' if quota else ''} API calls this month"
+            )
+
+        if config.usage.enabled:
+            from nanobot.usage.ledger import start_of_day
+
+            today = _open_usage_ledger(config).totals(since=start_of_day())
+            console.print(
+                f"Usage today: {today['total_tokens']:,} tokens "
+                f"({today['cached_tokens']:,} cached) in {today['calls']} calls, ${today['cost']:.2f}"
+            )
+
+
+@app.command()
+def usage(
+    by: str = typer.Option("purpose", "--by", "-b", help="Group by session, channel, purpose, model or day"),
+    days: int = typer.Option(1, "--days", "-d", help="Days to include (1 = today)"),
+):
+    """Show LLM token usage and cost."""
+    from nanobot.config.loader import load_config
+    from nanobot.usage.ledger import start_of_day
+
+    config = load_config()
+    since = start_of_day() - (max(1, days) - 1) * 86400
+    try:
+        rows = _open_usage_ledger(config).breakdown(by, since=since)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if not rows:
+        console.print("No usage recorded.")
+        return
+
+    table = Table(title=f"LLM usage by {by}")
+    table.add_column(by.capitalize(), style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt", justify="right")
+    table.add_column("Cached", justify="right")
+    table.add_column("Completion", justify="right")
+    table.add_column("Cost", justify="right")
+    for row in rows:
+        table.add_row(
+            str(row["key"] or "-"), str(row["calls"]), f"{row['prompt_tokens']:,}",
+            f"{row['cached_tokens']:,}", f"{row['completion_tokens']:,}", f"${row['cost']:.2f}",
+        )
+    console.print(table)
+
+
+@app.command()
+def traces(
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of turns to show"),
+    file: Path | None = typer.Option(None, "--file", "-f", help="Span file (default: from config)"),
+):
+    """Show the slowest traced turns and where they spent their time."""
+    from datetime import datetime
+
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.utils.tracing import STAGES, load_spans, slowest_turns
+
+    config = load_config()
+    path = file or (Path(config.tracing.path).expanduser() if config.tracing.path
+                    else get_data_dir() / "traces" / "spans.jsonl")
+    turns = slowest_turns(load_spans(path), limit)
+    if not turns:
+        hint = "" if config.tracing.enabled else " (tracing is off; set tracing.enabled in config)"
+        console.print(f"No traced turns in {path}{hint}")
+        return
+
+    table = Table(title="Slowest turns (ms)")
+    table.add_column("Trace", style="cyan")
+    table.add_column("When")
+    table.add_column("Session")
+    table.add_column("Total", justify="right")
+    for stage in STAGES.values():
+        table.add_column(stage.capitalize(), justify="right")
+    table.add_column("Slowest tool")
+    for turn in turns:
+        when = datetime.fromtimestamp(turn["start_ns"] / 1e9).strftime("%m-%d %H:%M:%S")
+        table.add_row(
+            turn["trace_id"][:8], when, turn["session"], f"{turn['total_ms']:.0f}",
+            *(f"{turn['stages'][stage]:.0f}" for stage in STAGES.values()),
+            turn["slowest_tool"] or "-",
+        )
+    console.print(table)
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+bench_app = typer.Typer(help="Offline benchmarks against a local fake LLM")
+app.add_typer(bench_app, name="bench")
+
+
+def _bench_config(api_base: str, workspace: Path) -> Config:
+    """Config for a benchmark agent talking to the fake endpoint."""
+    return Config.model_validate({
+        "providers": {"custom": {"apiKey": "bench", "apiBase": api_base}},
+        "agents": {"defaults": {"model": "fake-model", "workspace": str(workspace)}},
+        "usage": {"enabled": False},
+    })
+
+
+@bench_app.command("run")
+def bench_run(
+    chats: int = typer.Option(8, "--chats", "-c", help="Concurrent chats"),
+    turns: int = typer.Option(5, "--turns", "-t", help="Messages per chat"),
+    latency_ms: float = typer.Option(200.0, "--latency-ms", help="Mean fake LLM latency"),
+    jitter_ms: float = typer.Option(50.0, "--jitter-ms", help="Fake LLM latency standard deviation"),
+    tool_calls: int = typer.Option(1, "--tool-calls", help="Tool-call rounds per turn"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report here"),
+    logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs"),
+):
+    """Load-test the agent loop against a local fake OpenAI-compatible server."""
+    import json
+    import tempfile
+
+    from loguru import logger
+
+    from nanobot.bench import FakeLLMServer, FakeProfile, run_benchmark
+    from nanobot.utils import http
+
+    if logs:
+        logger.enable("nanobot")
+    else:
+        logger.disable("nanobot")
+
+    async def _run() -> dict:
+        with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as tmp:
+            workspace = Path(tmp)
+            profile = FakeProfile(
+                latency_ms=latency_ms, jitter_ms=jitter_ms, tool_calls=tool_calls,
+                tool_args={"path": str(workspace)},
+            )
+            try:
+                async with FakeLLMServer(profile) as server:
+                    config = _bench_config(server.url, workspace)
+                    report = await run_benchmark(lambda bus: _make_agent_loop(config, bus, None), chats, turns)
+                    report["llm"] = {
+                        "requests": server.requests,
+                        "prompt_tokens": server.prompt_tokens,
+                        "completion_tokens": server.completion_tokens,
+                    }
+                    report["profile"] = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "tool_calls": tool_calls}
+                    return report
+            finally:
+                await http.close_all()
+
+    report = asyncio.run(_run())
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+
+    lat, queue = report["latency_ms"], report["queue_ms"]
+    console.print(f"{__logo__} {report['turns']} turns ({report['errors']} errors) in {report['wall_s']}s "
+                  f"— {report['throughput_turns_per_s']} turns/s")
+    console.print(f"Turn latency ms: p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}")
+    console.print(f"Queue time ms:   p50 {queue['p50']}  p95 {queue['p95']}  p99 {queue['p99']}")
+    console.print(f"Peak RSS: {report['memory_mb']['peak_rss']} MB")
+    if output:
+        console.print(f"Report written to {output}")
+
+
+@bench_app.command("replay")
+def bench_replay(
+    sessions: list[Path] = typer.Argument(None, help="Session JSONL files (default: all in the workspace)"),
+    cassettes: Path | None = typer.Option(None, "--cassettes", help="Recorded cassettes (from --record)"),
+    baseline: Path | None = typer.Option(None, "--baseline", "-b", help="Compare against this report"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report here"),
+    logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs"),
+):
+    """Replay recorded sessions offline and report per-stage timings."""
+    import json
+    import tempfile
+
+    from loguru import logger
+
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bench import compare_reports, replay_sessions
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.loader import load_config
+
+    if logs:
+        logger.enable("nanobot")
+    else:
+        logger.disable("nanobot")
+
+    config = load_config()
+    defaults = config.agents.defaults
+    files = sessions or sorted((config.workspace_path / "sessions").glob("*.jsonl"))
+    if not files:
+        console.print("[red]No session files to replay[/red]")
+        raise typer.Exit(1)
+
+    def make_agent(provider, workspace: Path) -> AgentLoop:
+        return AgentLoop(
+            bus=MessageBus(),
+            provider=provider,
+            workspace=workspace,
+            model=defaults.model,
+            temperature=defaults.temperature,
+            max_tokens=defaults.max_tokens,
+            max_iterations=defaults.max_tool_iterations,
+            memory_window=defaults.memory_window,
+        )
+
+    async def _run() -> dict:
+        with tempfile.TemporaryDirectory(prefix="nanobot-replay-") as tmp:
+            return await replay_sessions(make_agent, files, Path(tmp), cassettes, config.workspace_path)
+
+    report = asyncio.run(_run())
+    deltas = compare_reports(report, json.loads(baseline.read_text())) if baseline else {}
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+
+    console.print(f"{__logo__} Replayed {report['turns']} turns from {report['sessions']} sessions "
+                  f"in {report['wall_s']}s ({report['misses']} cassette misses)")
+    table = Table(title="Stage timings")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    if baseline:
+        table.add_column("Δ vs baseline", justify="right")
+    for stage, stats in report["stages"].items():
+        row = [stage, str(stats["count"]), f"{stats['mean_ms']:.3f}", f"{stats['p95_ms']:.3f}"]
+        if baseline:
+            delta = deltas.get(stage)
+            row.append(f"{delta['delta_ms']:+.3f} ({delta['delta_pct']:+.1f}%)" if delta else "-")
+        table.add_row(*row)
+    console.print(table)
+    if output:
+        console.print(f"Report written to {output}")
+
 
 # ============================================================================
 # OAuth Login
@@ -12,7 +12,13 @@ class Base(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
 
-class WhatsAppConfig(Base):
+class ChannelConfig(Base):
+    """Settings shared by all chat channels."""
+
+    debounce_ms: int = 0  # Merge messages a chat sends within this window into one turn (0 = off)
+
+
+class WhatsAppConfig(ChannelConfig):
     """WhatsApp channel configuration."""
 
     enabled: bool = False
@@ -21,7 +27,7 @@ class WhatsAppConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed phone numbers
 
 
-class TelegramConfig(Base):
+class TelegramConfig(ChannelConfig):
     """Telegram channel configuration."""
 
     enabled: bool = False
@@ -30,7 +36,7 @@ class TelegramConfig(Base):
     proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
 
 
-class FeishuConfig(Base):
+class FeishuConfig(ChannelConfig):
     """Feishu/Lark channel configuration using WebSocket long connection."""
 
     enabled: bool = False
@@ -41,7 +47,7 @@ class FeishuConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user open_ids
 
 
-class DingTalkConfig(Base):
+class DingTalkConfig(ChannelConfig):
     """DingTalk channel configuration using Stream mode."""
 
     enabled: bool = False
@@ -50,7 +56,7 @@ class DingTalkConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed staff_ids
 
 
-class DiscordConfig(Base):
+class DiscordConfig(ChannelConfig):
     """Discord channel configuration."""
 
     enabled: bool = False
@@ -60,7 +66,7 @@ class DiscordConfig(Base):
     intents: int = 37377  # GUILDS + GUILD_MESSAGES + DIRECT_MESSAGES + MESSAGE_CONTENT
 
 
-class EmailConfig(Base):
+class EmailConfig(ChannelConfig):
     """Email channel configuration (IMAP inbound + SMTP outbound)."""
 
     enabled: bool = False
@@ -139,7 +145,7 @@ class SlackDMConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed Slack user IDs
 
 
-class SlackConfig(Base):
+class SlackConfig(ChannelConfig):
     """Slack channel configuration."""
 
     enabled: bool = False
@@ -155,7 +161,7 @@ class SlackConfig(Base):
     dm: SlackDMConfig = Field(default_factory=SlackDMConfig)
 
 
-class QQConfig(Base):
+class QQConfig(ChannelConfig):
     """QQ channel configuration using botpy SDK."""
 
     enabled: bool = False
@@ -164,6 +170,17 @@ class QQConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user openids (empty = public access)
 
 
+class ApiConfig(Base):
+    """OpenAI-compatible HTTP API served on the gateway port."""
+
+    enabled: bool = False
+    # Accepted bearer tokens, or {"name": token} to name callers; required unless the gateway binds to loopback
+    api_keys: list[str] | dict[str, str] = Field(default_factory=list)
+    allow_from: list[str] = Field(default_factory=list)  # Allowed callers (key names, or "key-<hash>" for unnamed keys)
+    model_name: str = "nanobot"  # Model id reported by /v1/models
+    timeout_s: int = 600  # Max seconds to wait for the agent's reply
+
+
 class ChannelsConfig(Base):
     """Configuration for chat channels."""
 
@@ -176,6 +193,42 @@ class ChannelsConfig(Base):
     email: EmailConfig = Field(default_factory=EmailConfig)
     slack: SlackConfig = Field(default_factory=SlackConfig)
     qq: QQConfig = Field(default_factory=QQConfig)
+    api: ApiConfig = Field(default_factory=ApiConfig)
+
+
+class LLMCacheConfig(Base):
+    """LLM response cache configuration (opt-in)."""
+
+    enabled: bool = False
+    purposes: list[str] = Field(default_factory=lambda: ["cron", "heartbeat", "consolidation"])  # interactive, system, subagent, cron, heartbeat, consolidation
+    cache_zero_temperature: bool = True  # Also cache any temperature-0 call
+    ttl_s: int = 86400
+    max_size_mb: int = 64
+
+
+class ModelRoute(Base):
+    """A model and the provider that serves it."""
+
+    model: str
+    provider: str | None = None  # Name under `providers`; auto-detected from the model when unset
+
+
+class FailoverConfig(Base):
+    """Failover and hedging across providers."""
+
+    fallbacks: list[ModelRoute] = Field(default_factory=list)  # Tried in order after the main model
+    timeout_s: float = 120.0  # Per-attempt timeout before failing over
+    hedge: bool = False  # Also ask the next provider when the first is slower than its rolling p95
+    hedge_min_samples: int = 20  # Latency samples needed before hedging starts
+    failure_threshold: int = 3  # Consecutive failures before a provider is skipped
+    cooldown_s: float = 60.0  # How long a failing provider is skipped
+
+
+class RoutingConfig(Base):
+    """Per-purpose model routing."""
+
+    routes: dict[str, ModelRoute] = Field(default_factory=dict)  # interactive, consolidation, subagent, heartbeat, cron, system
+    escalate_on_failure: bool = True  # Retry on the main model when a routed model fails or returns nothing
 
 
 class AgentDefaults(Base):
@@ -187,6 +240,9 @@ class AgentDefaults(Base):
     temperature: float = 0.7
     max_tool_iterations: int = 20
     memory_window: int = 50
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    failover: FailoverConfig = Field(default_factory=FailoverConfig)
+    routing: RoutingConfig = Field(default_factory=RoutingConfig)
 
 
 class AgentsConfig(Base):
@@ -201,6 +257,10 @@ class ProviderConfig(Base):
     api_key: str = ""
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
+    rpm: int = 0  # Requests per minute (0 = unlimited)
+    tpm: int = 0  # Tokens per minute (0 = unlimited)
+    max_concurrency: int = 0  # Max in-flight requests (0 = unlimited)
+    max_retries: int = 3  # Retries on rate limits, timeouts and 5xx errors
 
 
 class ProvidersConfig(Base):
@@ -227,8 +287,55 @@ class ProvidersConfig(Base):
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
-    host: str = "0.0.0.0"
+    host: str = "127.0.0.1"  # 0.0.0.0 exposes /metrics, /healthz and the API channel to the network
     port: int = 18790
+    metrics_public: bool = False  # Serve /metrics and /healthz to other machines, not just localhost
+    workers: int = 0  # Agent worker processes (0 = run the agent inside the gateway process)
+    loop_lag_threshold_ms: int = 250  # Log code blocking the event loop longer than this (0 disables)
+
+
+class HttpConfig(Base):
+    """Shared HTTP connection pool configuration (tools and providers)."""
+
+    http2: bool = False  # Requires the "h2" package
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    max_per_host: int = 8  # Concurrent requests per host from web tools
+
+
+class ModelPrice(Base):
+    """Model price in USD per million tokens."""
+
+    input: float = 0.0
+    output: float = 0.0
+    cached_input: float | None = None  # Defaults to the input price
+
+
+class BudgetConfig(Base):
+    """Usage budgets (0 = unlimited). All budgets reset at local midnight."""
+
+    session_tokens: int = 0  # Tokens per session key per day
+    daily_tokens: int = 0
+    daily_cost_usd: float = 0.0  # Needs `prices` for the models in use
+    downgrade_to: ModelRoute | None = None  # Cheaper model to use once over budget; refuse if unset
+
+
+class UsageConfig(Base):
+    """Token usage ledger configuration."""
+
+    enabled: bool = True
+    prices: dict[str, ModelPrice] = Field(default_factory=dict)  # Keyed by model name
+    budget: BudgetConfig = Field(default_factory=BudgetConfig)
+
+
+class TracingConfig(Base):
+    """Per-turn span tracing configuration."""
+
+    enabled: bool = False
+    sample_rate: float = 1.0  # Fraction of turns traced
+    path: str = ""  # Span JSONL file (default: ~/.nanobot/traces/spans.jsonl)
+    max_file_mb: int = 50  # Rotate to <path>.1 beyond this size
 
 
 class WebSearchConfig(Base):
@@ -236,18 +343,46 @@ class WebSearchConfig(Base):
 
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    cache_ttl_s: int = 3600  # Reuse results of an identical query for this long (0 disables)
+    requests_per_minute: int = 60  # API calls per minute per key (0: unlimited)
+    monthly_quota: int = 0  # API calls per key and calendar month (0: unlimited)
+
+
+class WebCacheConfig(Base):
+    """HTTP cache for web_fetch (honours Cache-Control, ETag and Last-Modified)."""
+
+    enabled: bool = True
+    min_ttl_s: int = 60  # Treat every fetched page as fresh for at least this long
+    max_size_mb: int = 128
 
 
 class WebToolsConfig(Base):
     """Web tools configuration."""
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    cache: WebCacheConfig = Field(default_factory=WebCacheConfig)
 
 
 class ExecToolConfig(Base):
     """Shell exec tool configuration."""
 
     timeout: int = 60
+    max_output_bytes: int = 10_000_000  # Kill a command once it has written this much output
+    persistent_shell: bool = False  # One long-lived shell per session, so cd/export/venvs carry over
+    shell_idle_timeout: int = 600  # Close a session's shell after this many idle seconds
+    max_shells: int = 8
+
+
+class PythonToolConfig(Base):
+    """Persistent Python interpreter tool configuration."""
+
+    enabled: bool = False
+    python: str = ""  # Interpreter to run (default: the one running nanobot)
+    timeout: int = 60  # Wall-clock seconds per call; the interpreter is reset when exceeded
+    cpu_seconds: int = 60  # CPU seconds per call
+    memory_mb: int = 2048  # Address-space limit of the interpreter
+    idle_timeout: int = 900  # Close an interpreter after this many idle seconds
+    max_kernels: int = 4
 
 
 class MCPServerConfig(Base):
@@ -264,6 +399,7 @@ class ToolsConfig(Base):
 
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    python: PythonToolConfig = Field(default_factory=PythonToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
@@ -275,6 +411,9 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
     @property
@@ -282,10 +421,16 @@ class Config(BaseSettings):
         """Get expanded workspace path."""
         return Path(self.agents.defaults.workspace).expanduser()
 
-    def _match_provider(self, model: str | None = None) -> tuple["ProviderConfig | None", str | None]:
+    def _match_provider(
+        self, model: str | None = None, provider: str | None = None,
+    ) -> tuple["ProviderConfig | None", str | None]:
         """Match provider config and its registry name. Returns (config, spec_name)."""
         from nanobot.providers.registry import PROVIDERS
 
+        # Explicitly named provider (e.g. from a ModelRoute)
+        if provider:
+            return getattr(self.providers, provider, None), provider
+
         model_lower = (model or self.agents.defaults.model).lower()
 
         # Match by keyword (order follows PROVIDERS registry)
@@ -305,14 +450,14 @@ class Config(BaseSettings):
                 return p, spec.name
         return None, None
 
-    def get_provider(self, model: str | None = None) -> ProviderConfig | None:
+    def get_provider(self, model: str | None = None, provider: str | None = None) -> ProviderConfig | None:
         """Get matched provider config (api_key, api_base, extra_headers). Falls back to first available."""
-        p, _ = self._match_provider(model)
+        p, _ = self._match_provider(model, provider)
         return p
 
-    def get_provider_name(self, model: str | None = None) -> str | None:
+    def get_provider_name(self, model: str | None = None, provider: str | None = None) -> str | None:
         """Get the registry name of the matched provider (e.g. "deepseek", "openrouter")."""
-        _, name = self._match_provider(model)
+        _, name = self._match_provider(model, provider)
         return name
 
     def get_api_key(self, model: str | None = None) -> str | None:
@@ -320,16 +465,15 @@ class Config(BaseSettings):
         p = self.get_provider(model)
         return p.api_key if p else None
 
-    def get_api_base(self, model: str | None = None) -> str | None:
+    def get_api_base(self, model: str | None = None, provider: str | None = None) -> str | None:
         """Get API base URL for the given model. Applies default URLs for known gateways."""
         from nanobot.providers.registry import find_by_name
 
-        p, name = self._match_provider(model)
+        p, name = self._match_provider(model, provider)
         if p and p.api_base:
             return p.api_base
         # Only gateways get a default api_base here. Standard providers
-        # (like Moonshot) set their base URL via env vars in _setup_env
-        # to avoid polluting the global litellm.api_base.
+        # (like Moonshot) get theirs from LiteLLMProvider._default_api_base.
         if name:
             spec = find_by_name(name)
             if spec and spec.is_gateway and spec.default_api_base:
@@ -11,6 +11,10 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils.fsio import atomic_write
+from nanobot.utils.metrics import CRON_LAG
+
+STORE_POLL_S = 5  # How often the scheduler checks the job store for changes from other processes
 
 
 def _now_ms() -> int:
@@ -56,60 +60,94 @@ class CronService:
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
         self._store: CronStore | None = None
+        self._store_stamp: tuple[int, int, int] | None = None
+        self._synced_ids: set[str] = set()  # Job ids in the file when we last read or wrote it
         self._timer_task: asyncio.Task | None = None
         self._running = False
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+        """Load jobs from disk, merging in changes another process made to the file."""
+        stamp = self._file_stamp()
+        if self._store and stamp == self._store_stamp:
             return self._store
         
-        if self.store_path.exists():
-            try:
-                data = json.loads(self.store_path.read_text())
-                jobs = []
-                for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
-            except Exception as e:
-                logger.warning(f"Failed to load cron store: {e}")
+        self._store_stamp = stamp
+        try:
+            disk = self._read_jobs() if stamp is not None else []
+        except Exception as e:
+            logger.warning(f"Failed to load cron store: {e}")
+            if not self._store:
                 self._store = CronStore()
-        else:
-            self._store = CronStore()
+            return self._store
         
+        if not self._store:
+            self._store = CronStore(jobs=disk)
+        else:
+            self._store.jobs = self._merge(disk)
+        self._synced_ids = {j.id for j in disk}
         return self._store
     
+    def _file_stamp(self) -> tuple[int, int, int] | None:
+        try:
+            st = self.store_path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_ino, st.st_size
+
+    def _merge(self, disk: list[CronJob]) -> list[CronJob]:
+        """Combine our jobs with the file's: keep adds and removals from both sides, newest edit wins."""
+        ours = {j.id: j for j in self._store.jobs}
+        merged = []
+        for job in disk:
+            mine = ours.pop(job.id, None)
+            if mine is None:
+                if job.id not in self._synced_ids:  # Added by another process
+                    merged.append(job)
+            else:
+                merged.append(mine if mine.updated_at_ms >= job.updated_at_ms else job)
+        # Jobs we have that the file lacks: added here, or removed by another process
+        merged.extend(j for j in ours.values() if j.id not in self._synced_ids)
+        return merged
+
+    def _read_jobs(self) -> list[CronJob]:
+        data = json.loads(self.store_path.read_text())
+        jobs = []
+        for j in data.get("jobs", []):
+            jobs.append(CronJob(
+                id=j["id"],
+                name=j["name"],
+                enabled=j.get("enabled", True),
+                schedule=CronSchedule(
+                    kind=j["schedule"]["kind"],
+                    at_ms=j["schedule"].get("atMs"),
+                    every_ms=j["schedule"].get("everyMs"),
+                    expr=j["schedule"].get("expr"),
+                    tz=j["schedule"].get("tz"),
+                ),
+                payload=CronPayload(
+                    kind=j["payload"].get("kind", "agent_turn"),
+                    message=j["payload"].get("message", ""),
+                    deliver=j["payload"].get("deliver", False),
+                    channel=j["payload"].get("channel"),
+                    to=j["payload"].get("to"),
+                ),
+                state=CronJobState(
+                    next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
+                    last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
+                    last_status=j.get("state", {}).get("lastStatus"),
+                    last_error=j.get("state", {}).get("lastError"),
+                ),
+                created_at_ms=j.get("createdAtMs", 0),
+                updated_at_ms=j.get("updatedAtMs", 0),
+                delete_after_run=j.get("deleteAfterRun", False),
+            ))
+        return jobs
+
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Save jobs to disk, first merging in changes made by other processes."""
         if not self._store:
             return
+        self._load_store()
         
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -148,7 +186,10 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        # Replacing the file gives it a new inode, so other processes notice even same-tick writes
+        atomic_write(self.store_path, json.dumps(data, indent=2).encode("utf-8"))
+        self._store_stamp = self._file_stamp()
+        self._synced_ids = {j.id for j in self._store.jobs}
     
     async def start(self) -> None:
         """Start the cron service."""
@@ -188,12 +229,12 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
         
-        next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running:
             return
         
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        # Wake at least every STORE_POLL_S to pick up jobs other processes added
+        next_wake = self._get_next_wake_ms()
+        delay_s = STORE_POLL_S if not next_wake else min(STORE_POLL_S, max(0, next_wake - _now_ms()) / 1000)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -204,6 +245,7 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
+        self._load_store()
         if not self._store:
             return
         
@@ -214,9 +256,11 @@ class CronService:
         ]
         
         for job in due_jobs:
+            CRON_LAG.observe(max(0, _now_ms() - job.state.next_run_at_ms) / 1000)
             await self._execute_job(job)
         
-        self._save_store()
+        if due_jobs:
+            self._save_store()
         self._arm_timer()
     
     async def _execute_job(self, job: CronJob) -> None:
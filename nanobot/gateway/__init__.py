@@ -0,0 +1,5 @@
+"""HTTP endpoints served on the gateway port."""
+
+from nanobot.gateway.server import GatewayServer
+
+__all__ = ["GatewayServer"]
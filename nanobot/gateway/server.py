@@ -0,0 +1,90 @@
+"""Gateway HTTP server: metrics, health and pluggable routes."""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.utils.http_server import Handler, HttpServer, Request, Response, is_loopback
+from nanobot.utils.metrics import REGISTRY, merge_expositions
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class GatewayServer:
+    """
+    Serve ``/metrics`` (Prometheus text format) and ``/healthz`` on the gateway port.
+
+    ``health()`` returns a dict of component states with an ``ok`` flag;
+    ``/healthz`` answers 503 when it is false. Both answer only clients on
+    this machine unless ``public_metrics`` is set. ``remote_metrics()`` returns
+    ``(label, text)`` renders from other processes (agent workers), merged
+    into ``/metrics``. Other features register their endpoints with
+    ``add_route``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        health: Callable[[], dict[str, Any]] | None = None,
+        remote_metrics: Callable[[], Awaitable[list[tuple[str, str]]]] | None = None,
+        public_metrics: bool = False,
+    ):
+        self.health = health or (lambda: {"ok": True})
+        self.remote_metrics = remote_metrics
+        self.public_metrics = public_metrics
+        self.started = time.monotonic()
+        self._routes: dict[tuple[str, str], Handler] = {}
+        self._http = HttpServer(self._handle, host, port)
+        self.add_route("GET", "/metrics", self._metrics)
+        self.add_route("GET", "/healthz", self._healthz)
+
+    @property
+    def url(self) -> str:
+        return self._http.url
+
+    @property
+    def host(self) -> str:
+        return self._http.host
+
+    def add_route(self, method: str, path: str, handler: Handler) -> None:
+        self._routes[(method.upper(), path)] = handler
+
+    async def start(self) -> None:
+        await self._http.start()
+        logger.info(f"Gateway HTTP endpoints on {self._http.host}:{self._http.port}")
+
+    async def stop(self) -> None:
+        await self._http.stop()
+
+    async def _handle(self, request: Request) -> Response:
+        handler = self._routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self._routes):
+                return Response.json({"error": "method not allowed"}, 405)
+            return Response.json({"error": "not found"}, 404)
+        return await handler(request)
+
+    def _local_only(self, request: Request) -> Response | None:
+        if self.public_metrics or is_loopback(request.peer):
+            return None
+        return Response.json({"error": "forbidden"}, 403)
+
+    async def _metrics(self, request: Request) -> Response:
+        if denied := self._local_only(request):
+            return denied
+        text = REGISTRY.render()
+        if self.remote_metrics:
+            text = merge_expositions([("", text), *await self.remote_metrics()])
+        return Response(body=text.encode("utf-8"), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    async def _healthz(self, request: Request) -> Response:
+        if denied := self._local_only(request):
+            return denied
+        try:
+            status = dict(self.health())
+        except Exception as e:
+            status = {"ok": False, "error": str(e)}
+        status["uptime_s"] = round(time.monotonic() - self.started, 1)
+        return Response.json(status, 200 if status.get("ok") else 503)
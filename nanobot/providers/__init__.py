@@ -1,7 +1,28 @@
 """LLM provider abstraction module."""
 
+from typing import TYPE_CHECKING
+
 from nanobot.providers.base import LLMProvider, LLMResponse
-from nanobot.providers.litellm_provider import LiteLLMProvider
-from nanobot.providers.openai_codex_provider import OpenAICodexProvider
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider", "OpenAICodexProvider"]
+if TYPE_CHECKING:
+    from nanobot.providers.custom_provider import CustomProvider
+    from nanobot.providers.litellm_provider import LiteLLMProvider
+    from nanobot.providers.openai_codex_provider import OpenAICodexProvider
+
+# Concrete providers pull in heavy SDKs (litellm, openai, oauth), so they are
+# imported on first access rather than with the package.
+_LAZY = {
+    "LiteLLMProvider": "nanobot.providers.litellm_provider",
+    "OpenAICodexProvider": "nanobot.providers.openai_codex_provider",
+    "CustomProvider": "nanobot.providers.custom_provider",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider", "OpenAICodexProvider", "CustomProvider"]
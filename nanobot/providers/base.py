@@ -1,8 +1,32 @@
 """Base LLM provider interface."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterator
+
+# Tags describing why an LLM call is made (purpose, session, channel).
+# Set by the agent around its calls; read by provider wrappers.
+_call_tags: ContextVar[dict[str, str]] = ContextVar("llm_call_tags", default={})
+
+
+@contextmanager
+def llm_call_tags(**tags: str) -> Iterator[None]:
+    """Tag all LLM calls made inside this block, e.g. ``llm_call_tags(purpose="cron")``."""
+    token = _call_tags.set({**_call_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _call_tags.reset(token)
+
+
+def get_llm_call_tags() -> dict[str, str]:
+    """Get the tags of the current LLM call context."""
+    return _call_tags.get()
 
 
 @dataclass
@@ -13,6 +37,99 @@ class ToolCallRequest:
     arguments: dict[str, Any]
 
 
+@dataclass
+class LLMError:
+    """A failed LLM call, classified so callers can retry or report it."""
+    kind: str  # rate_limit, timeout, connection, server, auth, bad_request, budget, unknown
+    message: str
+    retryable: bool = False
+    retry_after: float | None = None  # Seconds, from the Retry-After header
+    status_code: int | None = None
+
+
+_RETRYABLE_KINDS = {"rate_limit", "timeout", "connection", "server"}
+
+
+def _parse_retry_after(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(e: BaseException) -> float | None:
+    value = getattr(e, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(e, "response", None), "headers", None) \
+            or getattr(e, "litellm_response_headers", None)
+        if headers:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+    return _parse_retry_after(value)
+
+
+def classify_error(e: BaseException) -> LLMError:
+    """Map a provider/SDK exception to an LLMError (duck-typed: litellm, openai, httpx)."""
+    name = type(e).__name__.lower()
+    status = getattr(e, "status_code", None)
+    if not isinstance(status, int):
+        status = None
+
+    if status == 429 or "ratelimit" in name:
+        kind = "rate_limit"
+    elif status in (401, 403) or "authentication" in name or "permissiondenied" in name:
+        kind = "auth"
+    elif status == 408 or "timeout" in name or isinstance(e, (asyncio.TimeoutError, TimeoutError)):
+        kind = "timeout"
+    elif "connect" in name or isinstance(e, ConnectionError):
+        kind = "connection"
+    elif (status and status >= 500) or "serviceunavailable" in name or "internalserver" in name:
+        kind = "server"
+    elif (status and status >= 400) or "badrequest" in name or "contextwindow" in name:
+        kind = "bad_request"
+    else:
+        kind = "unknown"
+
+    return LLMError(
+        kind=kind,
+        message=str(e) or type(e).__name__,
+        retryable=kind in _RETRYABLE_KINDS,
+        retry_after=_retry_after(e),
+        status_code=status,
+    )
+
+
+def _field(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def parse_usage(usage: Any) -> dict[str, int]:
+    """
+    Normalize a usage object or dict from any API to our usage dict.
+
+    Understands OpenAI chat (prompt/completion tokens), Responses API
+    (input/output tokens) and Anthropic cache-read fields. ``cached_tokens``
+    is the part of the prompt served from the provider's prompt cache.
+    """
+    if not usage:
+        return {}
+    prompt = _field(usage, "prompt_tokens") or _field(usage, "input_tokens") or 0
+    completion = _field(usage, "completion_tokens") or _field(usage, "output_tokens") or 0
+    details = _field(usage, "prompt_tokens_details") or _field(usage, "input_tokens_details")
+    cached = (_field(details, "cached_tokens") if details else None) or _field(usage, "cache_read_input_tokens") or 0
+    return {
+        "prompt_tokens": int(prompt),
+        "completion_tokens": int(completion),
+        "total_tokens": int(_field(usage, "total_tokens") or prompt + completion),
+        "cached_tokens": int(cached),
+    }
+
+
 @dataclass
 class LLMResponse:
     """Response from an LLM provider."""
@@ -21,6 +138,12 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error: LLMError | None = None  # Set when finish_reason is "error"
+
+    @classmethod
+    def from_error(cls, error: LLMError) -> "LLMResponse":
+        """Build the response for a failed call."""
+        return cls(content=None, finish_reason="error", error=error)
     
     @property
     def has_tool_calls(self) -> bool:
@@ -64,6 +187,13 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def warmup(self) -> None:
+        """
+        Open connections to the provider endpoint ahead of the first request.
+
+        A no-op for providers whose HTTP client nanobot does not own (LiteLLM).
+        """
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -0,0 +1,130 @@
+"""Response cache wrapping any LLM provider."""
+
+import dataclasses
+import hashlib
+import json
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest, get_llm_call_tags
+from nanobot.utils.coalesce import Coalescer
+from nanobot.utils.diskcache import DiskCache
+from nanobot.utils.fsio import run_fs
+
+
+def request_key(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """Hash a canonicalized chat request."""
+    payload = json.dumps(
+        {"messages": messages, "tools": tools or [], "model": model,
+         "max_tokens": max_tokens, "temperature": temperature},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _dump(response: LLMResponse) -> bytes:
+    return json.dumps(dataclasses.asdict(response), ensure_ascii=False).encode("utf-8")
+
+
+def _load(data: bytes) -> LLMResponse:
+    raw = json.loads(data)
+    raw["tool_calls"] = [ToolCallRequest(**tc) for tc in raw.get("tool_calls", [])]
+    return LLMResponse(**raw)
+
+
+class CachingProvider(LLMProvider):
+    """
+    Serve repeated identical requests from a disk cache.
+
+    Only calls whose purpose tag is listed in ``purposes`` (or, optionally,
+    any temperature-0 call) are cached. Concurrent identical requests share
+    a single upstream call. Error responses are never stored. SQLite access
+    runs on the fsio thread pool.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        cache: DiskCache,
+        purposes: list[str],
+        cache_zero_temperature: bool = True,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.cache = cache
+        self.purposes = set(purposes)
+        self.cache_zero_temperature = cache_zero_temperature
+        self._coalescer: Coalescer[LLMResponse] = Coalescer()
+
+    def _cacheable(self, temperature: float) -> bool:
+        if self.cache_zero_temperature and temperature == 0:
+            return True
+        return get_llm_call_tags().get("purpose", "interactive") in self.purposes
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        if not self._cacheable(temperature):
+            return await self.inner.chat(messages, tools, model, max_tokens, temperature)
+
+        key = request_key(messages, tools, model or self.get_default_model(), max_tokens, temperature)
+        if (response := await run_fs(self._lookup, key)) is not None:
+            logger.debug(f"LLM cache hit {key[:12]}")
+            return response
+
+        async def call() -> LLMResponse:
+            await run_fs(self.cache.incr, "misses")
+            response = await self.inner.chat(messages, tools, model, max_tokens, temperature)
+            if response.finish_reason != "error":
+                await run_fs(self.cache.set, key, _dump(response))
+            return response
+
+        response, shared = await self._coalescer.run(key, call)
+        if shared:
+            await run_fs(self._record_hit, "coalesced", response)
+        return response
+
+    def _lookup(self, key: str) -> LLMResponse | None:
+        if (data := self.cache.get(key)) is None:
+            return None
+        response = _load(data)
+        self._record_hit("hits", response)
+        return response
+
+    def _record_hit(self, counter: str, response: LLMResponse) -> None:
+        self.cache.incr(counter)
+        self.cache.incr("saved_prompt_tokens", response.usage.get("prompt_tokens", 0))
+        self.cache.incr("saved_completion_tokens", response.usage.get("completion_tokens", 0))
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+def cache_stats(cache: DiskCache) -> dict[str, int]:
+    """Summarize persisted cache counters."""
+    counters = cache.counters()
+    entries, size = cache.size()
+    hits = counters.get("hits", 0) + counters.get("coalesced", 0)
+    lookups = hits + counters.get("misses", 0)
+    return {
+        "entries": entries,
+        "bytes": size,
+        "hits": hits,
+        "lookups": lookups,
+        "saved_tokens": counters.get("saved_prompt_tokens", 0) + counters.get("saved_completion_tokens", 0),
+    }
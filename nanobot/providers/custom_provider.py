@@ -5,9 +5,16 @@ from __future__ import annotations
 from typing import Any
 
 import json_repair
-from openai import AsyncOpenAI
+from openai import DEFAULT_TIMEOUT, AsyncOpenAI
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+    classify_error,
+    parse_usage,
+)
+from nanobot.utils import http
 
 
 class CustomProvider(LLMProvider):
@@ -15,7 +22,21 @@ class CustomProvider(LLMProvider):
     def __init__(self, api_key: str = "no-key", api_base: str = "http://localhost:8000/v1", default_model: str = "default"):
         super().__init__(api_key, api_base)
         self.default_model = default_model
-        self._client = AsyncOpenAI(api_key=api_key, base_url=api_base)
+        self._client: AsyncOpenAI | None = None
+        self._http_client = None
+
+    def _get_client(self) -> AsyncOpenAI:
+        # Bind to the shared connection pool of the running event loop
+        pooled = http.get_client()
+        if self._client is None or self._http_client is not pooled:
+            # The pooled client's 30 s default is for tools; keep the SDK's LLM timeout.
+            # Retries are left to the provider governor.
+            self._client = AsyncOpenAI(
+                api_key=self.api_key, base_url=self.api_base, http_client=pooled,
+                timeout=DEFAULT_TIMEOUT, max_retries=0,
+            )
+            self._http_client = pooled
+        return self._client
 
     async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
                    model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
@@ -24,9 +45,9 @@ class CustomProvider(LLMProvider):
         if tools:
             kwargs.update(tools=tools, tool_choice="auto")
         try:
-            return self._parse(await self._client.chat.completions.create(**kwargs))
+            return self._parse(await self._get_client().chat.completions.create(**kwargs))
         except Exception as e:
-            return LLMResponse(content=f"Error: {e}", finish_reason="error")
+            return LLMResponse.from_error(classify_error(e))
 
     def _parse(self, response: Any) -> LLMResponse:
         choice = response.choices[0]
@@ -36,12 +57,14 @@ class CustomProvider(LLMProvider):
                             arguments=json_repair.loads(tc.function.arguments) if isinstance(tc.function.arguments, str) else tc.function.arguments)
             for tc in (msg.tool_calls or [])
         ]
-        u = response.usage
         return LLMResponse(
             content=msg.content, tool_calls=tool_calls, finish_reason=choice.finish_reason or "stop",
-            usage={"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens} if u else {},
+            usage=parse_usage(response.usage),
             reasoning_content=getattr(msg, "reasoning_content", None),
         )
 
+    async def warmup(self) -> None:
+        await http.warm(self.api_base)
+
     def get_default_model(self) -> str:
         return self.default_model
@@ -0,0 +1,159 @@
+"""Failover and hedged requests across several providers."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+
+# Errors that another provider will not fix
+_NO_FAILOVER = {"bad_request"}
+
+
+@dataclass
+class _Member:
+    """One provider/model pair with its health and latency history."""
+    provider: LLMProvider
+    model: str
+    failures: int = 0
+    down_until: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=100))
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def p95(self, min_samples: int) -> float | None:
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class FailoverProvider(LLMProvider):
+    """
+    Try an ordered list of providers until one succeeds.
+
+    A provider that fails ``failure_threshold`` times in a row is skipped for
+    ``cooldown_s``. With ``hedge`` on, a second request goes to the next
+    provider when the first is slower than its rolling p95 latency; the
+    first good answer wins and the other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        routes: list[tuple[LLMProvider, str]],
+        timeout_s: float = 120.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        failure_threshold: int = 3,
+        cooldown_s: float = 60.0,
+    ):
+        primary = routes[0][0]
+        super().__init__(primary.api_key, primary.api_base)
+        self.members = [_Member(provider, model) for provider, model in routes]
+        self.timeout_s = timeout_s
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        # The caller's model applies to the primary; fallbacks use their own
+        request = (messages, tools, max_tokens, temperature)
+        models = {id(self.members[0]): model or self.members[0].model}
+        candidates = [m for m in self.members if m.healthy] or list(self.members)
+
+        response: LLMResponse | None = None
+        while candidates:
+            first = candidates.pop(0)
+            second = candidates[0] if self.hedge and candidates else None
+            used, response, hedged = await self._race(first, second, models, request)
+            if not response.error or response.error.kind in _NO_FAILOVER:
+                return response
+            if hedged:
+                candidates.pop(0)
+            if candidates:
+                logger.warning(f"LLM {used.model} failed ({response.error.kind}), failing over to {candidates[0].model}")
+        return response
+
+    async def _race(
+        self,
+        first: _Member,
+        second: _Member | None,
+        models: dict[int, str],
+        request: tuple,
+    ) -> tuple[_Member, LLMResponse, bool]:
+        """Call ``first``; hedge with ``second`` if it is slower than its p95.
+
+        Returns the member that answered, its response, and whether ``second`` was used.
+        """
+        primary = asyncio.create_task(self._call(first, models, request))
+        delay = first.p95(self.hedge_min_samples) if second else None
+        if delay is None:
+            return first, await primary, False
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return first, primary.result(), False
+
+        logger.info(f"LLM {first.model} slower than p95 ({delay:.1f}s), hedging with {second.model}")
+        owners = {primary: first, asyncio.create_task(self._call(second, models, request)): second}
+        pending = set(owners)
+        result: tuple[_Member, LLMResponse, bool] | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = owners[task], task.result(), True
+                    if not result[1].error:
+                        return result
+            return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, member: _Member, models: dict[int, str], request: tuple) -> LLMResponse:
+        messages, tools, max_tokens, temperature = request
+        start = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                member.provider.chat(messages, tools, models.get(id(member), member.model), max_tokens, temperature),
+                timeout=self.timeout_s,
+            )
+        except asyncio.TimeoutError:
+            member.latencies.append(time.monotonic() - start)  # A lower bound, so p95 is not flattered
+            response = LLMResponse.from_error(
+                LLMError("timeout", f"No response within {self.timeout_s:.0f}s", retryable=True)
+            )
+        except asyncio.CancelledError:
+            # Lost a hedge race: how long it ran is a lower bound on its latency
+            member.latencies.append(time.monotonic() - start)
+            raise
+
+        if response.error is None:
+            member.failures = 0
+            member.latencies.append(time.monotonic() - start)
+        elif response.error.kind not in _NO_FAILOVER:
+            member.failures += 1
+            if member.failures >= self.failure_threshold:
+                member.down_until = time.monotonic() + self.cooldown_s
+                logger.warning(f"LLM {member.model} marked down for {self.cooldown_s:.0f}s after {member.failures} failures")
+        return response
+
+    async def warmup(self) -> None:
+        await asyncio.gather(*(m.provider.warmup() for m in self.members))
+
+    def get_default_model(self) -> str:
+        return self.members[0].model
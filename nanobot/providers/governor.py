@@ -0,0 +1,135 @@
+"""Rate limiting, concurrency control and retries for LLM providers."""
+
+import asyncio
+import json
+import random
+import time
+from contextlib import AsyncExitStack
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, get_llm_call_tags
+from nanobot.utils.metrics import LLM_DURATION, LLM_TOKENS
+from nanobot.utils.ratelimit import TokenBucket
+
+
+def estimate_tokens(messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None) -> int:
+    """Rough prompt token estimate (~4 characters per token)."""
+    chars = len(json.dumps(messages, ensure_ascii=False, default=str))
+    if tools:
+        chars += len(json.dumps(tools, ensure_ascii=False))
+    return chars // 4 + 1
+
+
+class GovernedProvider(LLMProvider):
+    """
+    Govern calls to one provider.
+
+    Requests wait for the RPM/TPM buckets and a free in-flight slot before
+    going out. Retryable errors (rate limits, timeouts, 5xx) are retried with
+    exponential backoff and jitter, honouring ``Retry-After``; a rate limit
+    also pauses every other caller of this provider for that long.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rpm = TokenBucket(rpm) if rpm > 0 else None
+        self._tpm = TokenBucket(tpm) if tpm > 0 else None
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._paused_until = 0.0
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        start = time.perf_counter()
+        response = await self._chat_with_retries(messages, tools, model, max_tokens, temperature)
+        model = model or self.get_default_model()
+        outcome = response.error.kind if response.error else "ok"
+        purpose = get_llm_call_tags().get("purpose", "interactive")
+        LLM_DURATION.observe(time.perf_counter() - start, model=model, purpose=purpose, outcome=outcome)
+        for kind in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            if response.usage.get(kind):
+                LLM_TOKENS.inc(response.usage[kind], model=model, kind=kind.removesuffix("_tokens"))
+        return response
+
+    async def _chat_with_retries(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMResponse:
+        attempt = 0
+        while True:
+            response = await self._attempt(messages, tools, model, max_tokens, temperature)
+            error = response.error
+            if error is None or not error.retryable or attempt >= self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, error.retry_after)
+            if error.kind == "rate_limit":
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            attempt += 1
+            logger.warning(
+                f"LLM {error.kind} error, retry {attempt}/{self.max_retries} in {delay:.1f}s: {error.message[:200]}"
+            )
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMResponse:
+        if (pause := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(pause)
+        estimate = estimate_tokens(messages, tools) if self._tpm else 0
+        if self._rpm:
+            await self._rpm.acquire()
+        if self._tpm:
+            await self._tpm.acquire(estimate)
+
+        async with AsyncExitStack() as stack:
+            if self._slots:
+                await stack.enter_async_context(self._slots)
+            response = await self.inner.chat(messages, tools, model, max_tokens, temperature)
+
+        if self._tpm and response.usage:
+            self._tpm.adjust(response.usage.get("total_tokens", estimate) - estimate)
+        return response
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Exponential backoff with jitter; Retry-After wins when it is longer."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max * 4))
+        return delay
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
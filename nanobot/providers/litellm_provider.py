@@ -2,13 +2,12 @@
 
 import json
 import json_repair
-import os
 from typing import Any
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest, classify_error, parse_usage
 from nanobot.providers.registry import find_by_model, find_gateway
 
 
@@ -38,41 +37,22 @@ class LiteLLMProvider(LLMProvider):
         # api_key / api_base are fallback for auto-detection.
         self._gateway = find_gateway(provider_name, api_key, api_base)
         
-        # Configure environment variables
-        if api_key:
-            self._setup_env(api_key, api_base, default_model)
-        
-        if api_base:
-            litellm.api_base = api_base
+        # Endpoint for this instance only. Several providers can share the process
+        # (failover, purpose routes, budget downgrade), so litellm.api_base and
+        # os.environ are never set; key and base are passed on every call.
+        self._api_base = api_base or self._default_api_base(default_model)
         
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
         # Drop unsupported parameters for providers (e.g., gpt-5 rejects some params)
         litellm.drop_params = True
     
-    def _setup_env(self, api_key: str, api_base: str | None, model: str) -> None:
-        """Set environment variables based on detected provider."""
+    def _default_api_base(self, model: str) -> str | None:
+        """Base URL a provider needs when none is configured (e.g. Moonshot's ``MOONSHOT_API_BASE``)."""
         spec = self._gateway or find_by_model(model)
-        if not spec:
-            return
-        if not spec.env_key:
-            # OAuth/provider-only specs (for example: openai_codex)
-            return
-
-        # Gateway/local overrides existing env; standard provider doesn't
-        if self._gateway:
-            os.environ[spec.env_key] = api_key
-        else:
-            os.environ.setdefault(spec.env_key, api_key)
-
-        # Resolve env_extras placeholders:
-        #   {api_key}  → user's API key
-        #   {api_base} → user's api_base, falling back to spec.default_api_base
-        effective_base = api_base or spec.default_api_base
-        for env_name, env_val in spec.env_extras:
-            resolved = env_val.replace("{api_key}", api_key)
-            resolved = resolved.replace("{api_base}", effective_base)
-            os.environ.setdefault(env_name, resolved)
+        if spec and any("{api_base}" in value for _, value in spec.env_extras):
+            return spec.default_api_base or None
+        return None
     
     def _resolve_model(self, model: str) -> str:
         """Resolve model name by applying provider/gateway prefixes."""
@@ -145,8 +125,8 @@ class LiteLLMProvider(LLMProvider):
             kwargs["api_key"] = self.api_key
         
         # Pass api_base for custom endpoints
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
+        if self._api_base:
+            kwargs["api_base"] = self._api_base
         
         # Pass extra headers (e.g. APP-Code for AiHubMix)
         if self.extra_headers:
@@ -160,11 +140,8 @@ class LiteLLMProvider(LLMProvider):
             response = await acompletion(**kwargs)
             return self._parse_response(response)
         except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            # Return a typed error for the caller (retry, failover or report)
+            return LLMResponse.from_error(classify_error(e))
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -185,13 +162,7 @@ class LiteLLMProvider(LLMProvider):
                     arguments=args,
                 ))
         
-        usage = {}
-        if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+        usage = parse_usage(getattr(response, "usage", None))
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
@@ -5,16 +5,27 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import time
 from typing import Any, AsyncGenerator
 
 import httpx
 from loguru import logger
 
 from oauth_cli_kit import get_token as get_codex_token
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+    classify_error,
+    get_llm_call_tags,
+    parse_usage,
+)
+from nanobot.utils import http
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "nanobot"
+TOKEN_REFRESH_MARGIN_S = 60  # Refresh the OAuth token this long before it expires
+_TOOL_CACHE_SIZE = 8
 
 
 class OpenAICodexProvider(LLMProvider):
@@ -23,6 +34,11 @@ class OpenAICodexProvider(LLMProvider):
     def __init__(self, default_model: str = "openai-codex/gpt-5.1-codex"):
         super().__init__(api_key=None, api_base=None)
         self.default_model = default_model
+        self._token: Any = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        # id(tools) -> (tools, converted); tool lists are reused by ToolRegistry
+        self._converted_tools: dict[int, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = {}
 
     async def chat(
         self,
@@ -35,7 +51,7 @@ class OpenAICodexProvider(LLMProvider):
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
 
-        token = await asyncio.to_thread(get_codex_token)
+        token = await self._get_token()
         headers = _build_headers(token.account_id, token.access)
 
         body: dict[str, Any] = {
@@ -46,34 +62,66 @@ class OpenAICodexProvider(LLMProvider):
             "input": input_items,
             "text": {"verbosity": "medium"},
             "include": ["reasoning.encrypted_content"],
-            "prompt_cache_key": _prompt_cache_key(messages),
+            "prompt_cache_key": _prompt_cache_key(system_prompt, tools),
             "tool_choice": "auto",
             "parallel_tool_calls": True,
         }
 
         if tools:
-            body["tools"] = _convert_tools(tools)
+            body["tools"] = self._get_converted_tools(tools)
 
         url = DEFAULT_CODEX_URL
 
         try:
             try:
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=True)
+                content, tool_calls, finish_reason, usage = await _request_codex(url, headers, body, verify=True)
             except Exception as e:
                 if "CERTIFICATE_VERIFY_FAILED" not in str(e):
                     raise
                 logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=False)
+                content, tool_calls, finish_reason, usage = await _request_codex(url, headers, body, verify=False)
             return LLMResponse(
                 content=content,
                 tool_calls=tool_calls,
                 finish_reason=finish_reason,
+                usage=usage,
             )
         except Exception as e:
-            return LLMResponse(
-                content=f"Error calling Codex: {str(e)}",
-                finish_reason="error",
-            )
+            error = classify_error(e)
+            if error.kind == "auth":
+                self._token = None  # Force a token refresh on the next call
+            return LLMResponse.from_error(error)
+
+    async def _get_token(self) -> Any:
+        """Return the OAuth token, refreshing it (in a thread) only near expiry."""
+        if self._token is not None and time.time() < self._token_expires_at:
+            return self._token
+        async with self._token_lock:
+            if self._token is None or time.time() >= self._token_expires_at:
+                token = await asyncio.to_thread(get_codex_token)
+                expires = token.expires / 1000 if token.expires else time.time() + 300
+                self._token = token
+                self._token_expires_at = expires - TOKEN_REFRESH_MARGIN_S
+            return self._token
+
+    def _get_converted_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        entry = self._converted_tools.get(id(tools))
+        if entry is not None and entry[0] is tools:
+            return entry[1]
+        converted = _convert_tools(tools)
+        if len(self._converted_tools) >= _TOOL_CACHE_SIZE:
+            self._converted_tools.pop(next(iter(self._converted_tools)))
+        self._converted_tools[id(tools)] = (tools, converted)
+        return converted
+
+    async def warmup(self) -> None:
+        # Fetching the token here also takes its refresh off the first turn
+        try:
+            token = await self._get_token()
+        except Exception as e:
+            logger.debug(f"Codex warm-up skipped: {e}")
+            return
+        await http.warm(DEFAULT_CODEX_URL, headers=_build_headers(token.account_id, token.access))
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -97,18 +145,31 @@ def _build_headers(account_id: str, token: str) -> dict[str, str]:
     }
 
 
+class CodexHTTPError(RuntimeError):
+    """Non-200 response from the Codex endpoint."""
+
+    def __init__(self, status_code: int, message: str, retry_after: str | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
 async def _request_codex(
     url: str,
     headers: dict[str, str],
     body: dict[str, Any],
     verify: bool,
-) -> tuple[str, list[ToolCallRequest], str]:
-    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
-        async with client.stream("POST", url, headers=headers, json=body) as response:
-            if response.status_code != 200:
-                text = await response.aread()
-                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
-            return await _consume_sse(response)
+) -> tuple[str, list[ToolCallRequest], str, dict[str, int]]:
+    client = http.get_client(verify=verify)
+    async with client.stream("POST", url, headers=headers, json=body, timeout=60.0) as response:
+        if response.status_code != 200:
+            text = await response.aread()
+            raise CodexHTTPError(
+                response.status_code,
+                _friendly_error(response.status_code, text.decode("utf-8", "ignore")),
+                retry_after=response.headers.get("retry-after"),
+            )
+        return await _consume_sse(response)
 
 
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -217,8 +278,20 @@ def _split_tool_call_id(tool_call_id: Any) -> tuple[str, str | None]:
     return "call_0", None
 
 
-def _prompt_cache_key(messages: list[dict[str, Any]]) -> str:
-    raw = json.dumps(messages, ensure_ascii=True, sort_keys=True)
+def _prompt_cache_key(system_prompt: str, tools: list[dict[str, Any]] | None) -> str:
+    """
+    Key that stays the same across turns so the server-side prompt cache can hit.
+
+    Uses the session when the agent tagged one; otherwise the tool set and
+    the first line of the instructions, which do not change between turns.
+    """
+    session = get_llm_call_tags().get("session")
+    if session:
+        raw = f"session:{session}"
+    else:
+        first_line = system_prompt.split("\n", 1)[0]
+        names = ",".join(sorted(str((t.get("function") or t).get("name")) for t in tools or []))
+        raw = f"prefix:{first_line}|{names}"
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
@@ -242,11 +315,12 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
         buffer.append(line)
 
 
-async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
-    content = ""
+async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str, dict[str, int]]:
+    content: list[str] = []
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
+    usage: dict[str, int] = {}
 
     async for event in _iter_sse(response):
         event_type = event.get("type")
@@ -259,18 +333,18 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                 tool_call_buffers[call_id] = {
                     "id": item.get("id") or "fc_0",
                     "name": item.get("name"),
-                    "arguments": item.get("arguments") or "",
+                    "arguments": [item.get("arguments") or ""],
                 }
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            content.append(event.get("delta") or "")
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
-                tool_call_buffers[call_id]["arguments"] += event.get("delta") or ""
+                tool_call_buffers[call_id]["arguments"].append(event.get("delta") or "")
         elif event_type == "response.function_call_arguments.done":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
-                tool_call_buffers[call_id]["arguments"] = event.get("arguments") or ""
+                tool_call_buffers[call_id]["arguments"] = [event.get("arguments") or ""]
         elif event_type == "response.output_item.done":
             item = event.get("item") or {}
             if item.get("type") == "function_call":
@@ -278,7 +352,7 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                 if not call_id:
                     continue
                 buf = tool_call_buffers.get(call_id) or {}
-                args_raw = buf.get("arguments") or item.get("arguments") or "{}"
+                args_raw = "".join(buf.get("arguments") or []) or item.get("arguments") or "{}"
                 try:
                     args = json.loads(args_raw)
                 except Exception:
@@ -291,12 +365,13 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     )
                 )
         elif event_type == "response.completed":
-            status = (event.get("response") or {}).get("status")
-            finish_reason = _map_finish_reason(status)
+            completed = event.get("response") or {}
+            finish_reason = _map_finish_reason(completed.get("status"))
+            usage = parse_usage(completed.get("usage"))
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    return "".join(content), tool_calls, finish_reason, usage
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
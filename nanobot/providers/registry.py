@@ -35,7 +35,8 @@ class ProviderSpec:
     litellm_prefix: str = ""                 # "dashscope" → model becomes "dashscope/{model}"
     skip_prefixes: tuple[str, ...] = ()      # don't prefix if model already starts with these
 
-    # extra env vars, e.g. (("ZHIPUAI_API_KEY", "{api_key}"),)
+    # extra env vars LiteLLM reads, e.g. (("ZHIPUAI_API_KEY", "{api_key}"),);
+    # LiteLLMProvider passes the key and base per call instead of setting them
     env_extras: tuple[tuple[str, str], ...] = ()
 
     # gateway / local detection
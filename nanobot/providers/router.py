@@ -0,0 +1,57 @@
+"""Route LLM calls to different models by purpose."""
+
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, get_llm_call_tags
+
+
+class PurposeRouter(LLMProvider):
+    """
+    Send each call to the model configured for its purpose tag.
+
+    Purposes without a route use the main provider and the caller's model.
+    With ``escalate_on_failure``, a routed call that errors or comes back
+    empty is retried once on the main provider.
+    """
+
+    def __init__(
+        self,
+        main: LLMProvider,
+        routes: dict[str, tuple[LLMProvider, str]],
+        escalate_on_failure: bool = False,
+    ):
+        super().__init__(main.api_key, main.api_base)
+        self.main = main
+        self.routes = routes
+        self.escalate_on_failure = escalate_on_failure
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        purpose = get_llm_call_tags().get("purpose", "interactive")
+        route = self.routes.get(purpose)
+        if route is None:
+            return await self.main.chat(messages, tools, model, max_tokens, temperature)
+
+        provider, route_model = route
+        response = await provider.chat(messages, tools, route_model, max_tokens, temperature)
+        if self.escalate_on_failure and (response.error or not (response.content or response.has_tool_calls)):
+            reason = response.error.kind if response.error else "empty response"
+            logger.warning(f"LLM {route_model} failed for {purpose} ({reason}), escalating to main model")
+            return await self.main.chat(messages, tools, model, max_tokens, temperature)
+        return response
+
+    async def warmup(self) -> None:
+        await self.main.warmup()
+        for provider, _ in self.routes.values():
+            await provider.warmup()
+
+    def get_default_model(self) -> str:
+        return self.main.get_default_model()
@@ -9,6 +9,8 @@ from typing import Any
 from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.metrics import SESSION_CACHE_SIZE
+from nanobot.utils.tracing import tracer
 
 
 @dataclass
@@ -71,6 +73,7 @@ class SessionManager:
         self.sessions_dir = ensure_dir(self.workspace / "sessions")
         self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
         self._cache: dict[str, Session] = {}
+        SESSION_CACHE_SIZE.set_function(self._cache.__len__)
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -151,7 +154,7 @@ class SessionManager:
         """Save a session to disk."""
         path = self._get_session_path(session.key)
 
-        with open(path, "w") as f:
+        with tracer.span("session.save", messages=len(session.messages)), open(path, "w") as f:
             metadata_line = {
                 "_type": "metadata",
                 "created_at": session.created_at.isoformat(),
@@ -0,0 +1,6 @@
+"""Token usage ledger and budgets."""
+
+from nanobot.usage.ledger import UsageLedger
+from nanobot.usage.provider import BudgetProvider, MeteredProvider
+
+__all__ = ["UsageLedger", "MeteredProvider", "BudgetProvider"]
@@ -0,0 +1,101 @@
+"""SQLite ledger of per-call LLM token usage."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Columns usage can be grouped by
+GROUP_BY = ("session", "channel", "purpose", "model", "day")
+
+
+def start_of_day(now: float | None = None) -> float:
+    """Local midnight as a timestamp."""
+    d = datetime.fromtimestamp(now or time.time())
+    return d.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+class UsageLedger:
+    """
+    One row per LLM call: tags, token counts and estimated cost.
+
+    Rows are small fixed-width records, so a year of heavy use stays in the
+    tens of megabytes. Safe to share between threads and worker processes.
+    """
+
+    def __init__(self, path: Path, prices: dict[str, Any] | None = None):
+        self.path = path
+        self.prices = prices or {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            "ts REAL NOT NULL, day TEXT NOT NULL, session TEXT, channel TEXT, purpose TEXT, model TEXT, "
+            "prompt INTEGER NOT NULL, completion INTEGER NOT NULL, cached INTEGER NOT NULL, cost REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_ts ON calls (ts)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_session ON calls (session, ts)")
+
+    def cost(self, model: str, prompt: int, completion: int, cached: int) -> float:
+        """Estimated USD cost from configured per-million-token prices (0 if unknown)."""
+        price = self.prices.get(model)
+        if price is None:
+            return 0.0
+        cached_price = price.cached_input if price.cached_input is not None else price.input
+        return ((prompt - cached) * price.input + cached * cached_price + completion * price.output) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        usage: dict[str, int],
+        session: str | None = None,
+        channel: str | None = None,
+        purpose: str | None = None,
+    ) -> None:
+        """Record one call."""
+        now = time.time()
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+        cached = usage.get("cached_tokens", 0)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, datetime.fromtimestamp(now).strftime("%Y-%m-%d"), session, channel, purpose, model,
+                 prompt, completion, cached, self.cost(model, prompt, completion, cached)),
+            )
+
+    def totals(self, since: float = 0.0, session: str | None = None) -> dict[str, float]:
+        """Sum usage since a timestamp, optionally for one session."""
+        sql = ("SELECT COUNT(*), COALESCE(SUM(prompt), 0), COALESCE(SUM(completion), 0), "
+               "COALESCE(SUM(cached), 0), COALESCE(SUM(cost), 0) FROM calls WHERE ts >= ?")
+        params: list[Any] = [since]
+        if session is not None:
+            sql += " AND session = ?"
+            params.append(session)
+        with self._lock:
+            calls, prompt, completion, cached, cost = self._db.execute(sql, params).fetchone()
+        return {"calls": calls, "prompt_tokens": prompt, "completion_tokens": completion,
+                "cached_tokens": cached, "total_tokens": prompt + completion, "cost": cost}
+
+    def breakdown(self, by: str, since: float = 0.0, limit: int = 50) -> list[dict[str, Any]]:
+        """Usage grouped by one of GROUP_BY, largest first."""
+        if by not in GROUP_BY:
+            raise ValueError(f"Cannot group usage by '{by}' (use one of: {', '.join(GROUP_BY)})")
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {by}, COUNT(*), SUM(prompt), SUM(completion), SUM(cached), SUM(cost) FROM calls "
+                f"WHERE ts >= ? GROUP BY {by} ORDER BY SUM(prompt) + SUM(completion) DESC LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        return [
+            {"key": key, "calls": calls, "prompt_tokens": prompt, "completion_tokens": completion,
+             "cached_tokens": cached, "cost": cost}
+            for key, calls, prompt, completion, cached, cost in rows
+        ]
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,114 @@
+"""Provider wrappers that meter usage and enforce budgets."""
+
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse, get_llm_call_tags
+from nanobot.usage.ledger import UsageLedger, start_of_day
+from nanobot.utils.fsio import run_fs
+
+
+class MeteredProvider(LLMProvider):
+    """Record the usage of every successful call in the ledger, tagged with the call context."""
+
+    def __init__(self, inner: LLMProvider, ledger: UsageLedger):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.ledger = ledger
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        response = await self.inner.chat(messages, tools, model, max_tokens, temperature)
+        if response.usage:
+            tags = get_llm_call_tags()
+            try:
+                await run_fs(
+                    self.ledger.record,
+                    model or self.get_default_model(),
+                    response.usage,
+                    tags.get("session"),
+                    tags.get("channel"),
+                    tags.get("purpose", "interactive"),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to record LLM usage: {e}")
+        return response
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+
+class BudgetProvider(LLMProvider):
+    """
+    Stop overspending once a daily budget, or a session's share of the day, is used up.
+
+    Budgets reset at local midnight. Over budget, calls go to the
+    ``downgrade`` provider/model if one is set, otherwise they fail with a
+    ``budget`` error.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        ledger: UsageLedger,
+        session_tokens: int = 0,
+        daily_tokens: int = 0,
+        daily_cost_usd: float = 0.0,
+        downgrade: tuple[LLMProvider, str] | None = None,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.ledger = ledger
+        self.session_tokens = session_tokens
+        self.daily_tokens = daily_tokens
+        self.daily_cost_usd = daily_cost_usd
+        self.downgrade = downgrade
+
+    def exceeded(self) -> str | None:
+        """Return which budget is used up, if any (blocking; queries the ledger)."""
+        today = start_of_day()
+        if self.daily_tokens or self.daily_cost_usd:
+            day = self.ledger.totals(since=today)
+            if self.daily_tokens and day["total_tokens"] >= self.daily_tokens:
+                return "daily token budget"
+            if self.daily_cost_usd and day["cost"] >= self.daily_cost_usd:
+                return "daily cost budget"
+        session = get_llm_call_tags().get("session")
+        if self.session_tokens and session:
+            if self.ledger.totals(since=today, session=session)["total_tokens"] >= self.session_tokens:
+                return "session token budget"
+        return None
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        budget = await run_fs(self.exceeded)
+        if budget is None:
+            return await self.inner.chat(messages, tools, model, max_tokens, temperature)
+        if self.downgrade:
+            provider, cheap_model = self.downgrade
+            logger.info(f"{budget} reached, using {cheap_model}")
+            return await provider.chat(messages, tools, cheap_model, max_tokens, temperature)
+        logger.warning(f"{budget} reached, refusing LLM call")
+        return LLMResponse.from_error(LLMError("budget", f"{budget} reached"))
+
+    async def warmup(self) -> None:
+        await self.inner.warmup()
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
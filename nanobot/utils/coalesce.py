@@ -0,0 +1,44 @@
+"""Request coalescing: concurrent identical calls share one execution."""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelledError(Exception):
+    """The shared call was cancelled by the caller running it."""
+
+
+class Coalescer(Generic[T]):
+    """
+    Run at most one call per key at a time; callers arriving while it runs get its result.
+
+    Cancelling the caller that runs the call only cancels that caller: a
+    waiting caller then runs the call again instead of seeing the
+    cancellation. Exceptions raised by the call are shared like results.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future[T]] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, shared)``; ``shared`` is True if another caller's run was reused."""
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending), True
+            except _LeaderCancelledError:
+                continue  # The first waiter to wake takes over
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except BaseException as e:
+            future.set_exception(_LeaderCancelledError() if isinstance(e, asyncio.CancelledError) else e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result, False
@@ -0,0 +1,96 @@
+"""Size-bounded on-disk LRU cache with TTL, backed by SQLite."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class DiskCache:
+    """
+    A small key/value cache stored in one SQLite file.
+
+    Entries expire after their TTL and the least recently used entries are
+    evicted once the total stored size exceeds ``max_bytes``. Named counters
+    (hits, misses, ...) are persisted alongside so they survive restarts.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 86400):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            now = time.time()
+            row = self._db.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        """Store a value and evict LRU entries if the cache grew too large."""
+        with self._lock:
+            now = time.time()
+            expires = now + (self.default_ttl if ttl is None else ttl)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Add to a persisted counter."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount),
+            )
+
+    def counters(self) -> dict[str, int]:
+        """Return all persisted counters."""
+        with self._lock:
+            return dict(self._db.execute("SELECT name, value FROM counters").fetchall())
+
+    def size(self) -> tuple[int, int]:
+        """Return (entry count, total bytes)."""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return count, total
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
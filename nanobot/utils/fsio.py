@@ -0,0 +1,68 @@
+"""Filesystem I/O off the event loop.
+
+Tools run on the same event loop that serves every channel, so a slow disk
+or network-mounted workspace must not block it. Blocking filesystem work is
+run on a small dedicated thread pool (separate from the default executor,
+so it cannot starve DNS lookups and other ``to_thread`` users), and files
+are written atomically so a crash or a concurrent reader never sees a
+half-written file.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+FS_WORKERS = 8
+
+_pool: ThreadPoolExecutor | None = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=FS_WORKERS, thread_name_prefix="nanobot-fs")
+    return _pool
+
+
+async def run_fs(fn: Callable[..., T], *args: Any) -> T:
+    """Run blocking ``fn(*args)`` on the filesystem thread pool (with the caller's context)."""
+    call = functools.partial(contextvars.copy_context().run, fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(_executor(), call)
+
+
+def _default_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+_DEFAULT_MODE = _default_mode()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` via a synced temp file and a rename, keeping its permissions."""
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _DEFAULT_MODE
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
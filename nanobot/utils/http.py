@@ -0,0 +1,117 @@
+"""Process-wide pooled HTTP clients.
+
+Web tools, Groq transcription and the providers nanobot speaks HTTP to
+itself (custom endpoints, Codex) share keep-alive connection pools instead
+of creating an ``httpx.AsyncClient`` per request, so repeated calls to the
+same host skip DNS, TCP and TLS setup. LiteLLM keeps its own per-provider
+clients and is not part of this pool. Clients and the web tools' per-host
+limits are kept per event loop, because httpx connection pools cannot be
+shared across loops.
+"""
+
+import asyncio
+import importlib.util
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+
+@dataclass
+class _Settings:
+    http2: bool = False
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_per_host: int = 8
+
+
+_settings = _Settings()
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def configure(config: Any) -> None:
+    """Apply pool settings from ``HttpConfig``. Affects clients created afterwards."""
+    http2 = config.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    _settings.http2 = http2
+    _settings.max_connections = config.max_connections
+    _settings.max_keepalive_connections = config.max_keepalive_connections
+    _settings.keepalive_expiry = config.keepalive_expiry
+    _settings.max_per_host = config.max_per_host
+
+
+def get_client(
+    *,
+    verify: bool = True,
+    follow_redirects: bool = False,
+    max_redirects: int = 20,
+) -> httpx.AsyncClient:
+    """
+    Get the shared client for the running event loop.
+
+    Callers pass per-request timeouts and headers; only options that are
+    fixed per client are part of the pool key.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    key = (verify, follow_redirects, max_redirects)
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=verify,
+            follow_redirects=follow_redirects,
+            max_redirects=max_redirects,
+            http2=_settings.http2,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=_settings.max_connections,
+                max_keepalive_connections=_settings.max_keepalive_connections,
+                keepalive_expiry=_settings.keepalive_expiry,
+            ),
+        )
+        clients[key] = client
+    return client
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """
+    Limit concurrent requests per host (``max_per_host``).
+
+    Used by the web tools, whose hosts are arbitrary. LLM calls are capped
+    per provider instead (``maxConcurrency``), so providers do not take a slot.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _host_slots.setdefault(loop, {})
+    host = urlparse(url).netloc.lower()
+    sem = slots.get(host)
+    if sem is None:
+        sem = slots[host] = asyncio.Semaphore(max(1, _settings.max_per_host))
+    async with sem:
+        yield
+
+
+async def warm(url: str, verify: bool = True, headers: dict[str, str] | None = None) -> None:
+    """Open a pooled connection to *url*'s host ahead of the first real request."""
+    try:
+        await get_client(verify=verify).head(url, headers=headers, timeout=5.0)
+        logger.debug(f"Warmed HTTP connection to {urlparse(url).netloc}")
+    except Exception as e:
+        logger.debug(f"HTTP warm-up for {url} failed: {e}")
+
+
+async def close_all() -> None:
+    """Close all shared clients of the running event loop."""
+    loop = asyncio.get_running_loop()
+    clients = _clients.pop(loop, {})
+    _host_slots.pop(loop, None)
+    for client in clients.values():
+        await client.aclose()
@@ -0,0 +1,205 @@
+"""Minimal asyncio HTTP/1.1 server for local endpoints (metrics, API, benchmarks).
+
+Supports keep-alive, Content-Length request bodies and chunked streaming
+responses. It is meant for small internal endpoints, not as a general web
+server.
+"""
+
+import asyncio
+import ipaddress
+import json
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from loguru import logger
+
+MAX_HEADER_BYTES = 64 * 1024
+IDLE_TIMEOUT_S = 60  # Close connections that send no complete request head for this long
+READ_TIMEOUT_S = 30  # Close connections whose request body does not arrive within this
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a host or client address only reaches this machine."""
+    if host == "localhost":
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return (getattr(address, "ipv4_mapped", None) or address).is_loopback
+
+
+class _BadRequestError(Exception):
+    """A request that is answered with an error status and a closed connection."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]  # Lower-case names
+    body: bytes = b""
+    peer: str = ""  # Client address
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class Response:
+    """An HTTP response; set ``stream`` to send a chunked body."""
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "text/plain; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+    stream: AsyncIterator[bytes] | None = None
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200) -> "Response":
+        return cls(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    @classmethod
+    def text(cls, text: str, status: int = 200) -> "Response":
+        return cls(status, text.encode("utf-8"))
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class HttpServer:
+    """Serve ``handler`` on host:port. Port 0 picks a free port (see ``port``)."""
+
+    def __init__(
+        self,
+        handler: Handler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_body: int = 10 * 1024 * 1024,
+        idle_timeout: float = IDLE_TIMEOUT_S,
+        read_timeout: float = READ_TIMEOUT_S,
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self.read_timeout = read_timeout
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.debug(f"HTTP server listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "HttpServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _BadRequestError as e:
+                    await self._write_response(writer, Response.text(str(e), e.status), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                request.peer = (writer.get_extra_info("peername") or ("",))[0]
+                try:
+                    response = await self.handler(request)
+                except Exception as e:
+                    logger.error(f"HTTP handler error on {request.method} {request.path}: {e}")
+                    response = Response.text("Internal Server Error", 500)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Server shutting down; end this connection quietly
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        """The next request, or None when the client closed or idled past ``idle_timeout``."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise _BadRequestError(431, "Request Header Fields Too Large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise _BadRequestError(400, "Bad Request")
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise _BadRequestError(400, "Bad Request")
+        if length < 0:
+            raise _BadRequestError(400, "Bad Request")
+        if length > self.max_body:
+            raise _BadRequestError(413, "Request Entity Too Large")
+        body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers, body)
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, response: Response, keep_alive: bool) -> None:
+        reason = HTTPStatus(response.status).phrase
+        headers = {"Content-Type": response.content_type, **response.headers}
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        if response.stream is None:
+            headers["Content-Length"] = str(len(response.body))
+        else:
+            headers["Transfer-Encoding"] = "chunked"
+        head = f"HTTP/1.1 {response.status} {reason}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n")
+
+        if response.stream is None:
+            writer.write(response.body)
+        else:
+            async for chunk in response.stream:
+                if chunk:
+                    writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
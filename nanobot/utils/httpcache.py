@@ -0,0 +1,162 @@
+"""HTTP response cache for web tools, with conditional revalidation.
+
+Responses are stored in a ``DiskCache`` keyed by URL, together with the
+text extracted from them per extract mode, so a repeated fetch skips both
+the download and the readability pass. Freshness follows
+``Cache-Control``/``Expires`` (with a configurable minimum TTL); stale
+entries that carry an ``ETag`` or ``Last-Modified`` are revalidated with a
+conditional request instead of being downloaded again.
+"""
+
+import json
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+from nanobot.utils.diskcache import DiskCache
+from nanobot.utils.metrics import REGISTRY
+
+WEB_CACHE_REQUESTS = REGISTRY.counter(
+    "nanobot_web_cache_requests_total", "web_fetch cache lookups by result.", ("result",),
+)
+
+MAX_BODY_CHARS = 5_000_000  # Larger bodies are not cached
+KEEP_STALE_S = 7 * 86400  # How long stale entries with validators are kept for revalidation
+HEURISTIC_MAX_S = 86400
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _cache_control(headers: Any) -> dict[str, str]:
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def freshness(headers: Any, now: float) -> float | None:
+    """Seconds a response stays fresh, or None if it must not be stored."""
+    cc = _cache_control(headers)
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if name in cc:
+            try:
+                return max(0.0, float(cc[name]))
+            except ValueError:
+                return 0.0
+    date = _http_date(headers.get("date")) or now
+    if (expires := _http_date(headers.get("expires"))) is not None:
+        return max(0.0, expires - date)
+    if (modified := _http_date(headers.get("last-modified"))) is not None:
+        # Heuristic freshness: 10% of the document's age (RFC 9111 4.2.2)
+        return min(HEURISTIC_MAX_S, max(0.0, (date - modified) / 10))
+    return 0.0
+
+
+class HttpCache:
+    """Cache of fetched pages and their extracted text, keyed by URL."""
+
+    def __init__(self, cache: DiskCache, min_ttl: float = 60):
+        self.cache = cache
+        self.min_ttl = min_ttl
+
+    def lookup(self, url: str) -> dict[str, Any] | None:
+        """The stored entry for ``url`` (fresh or stale), or None."""
+        data = self.cache.get(url)
+        return json.loads(data) if data is not None else None
+
+    @staticmethod
+    def is_fresh(entry: dict[str, Any], now: float | None = None) -> bool:
+        return (now or time.time()) < entry["fresh_until"]
+
+    @staticmethod
+    def conditional_headers(entry: dict[str, Any]) -> dict[str, str]:
+        headers = {}
+        if etag := entry.get("etag"):
+            headers["If-None-Match"] = etag
+        if modified := entry.get("last_modified"):
+            headers["If-Modified-Since"] = modified
+        return headers
+
+    def store(self, url: str, response: Any, body: str) -> dict[str, Any] | None:
+        """Store a 200 response; returns the new entry (None if it may not be cached)."""
+        now = time.time()
+        lifetime = freshness(response.headers, now)
+        if lifetime is None or len(body) > MAX_BODY_CHARS:
+            self.cache.delete(url)
+            return None
+        entry = {
+            "final_url": str(response.url),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fresh_until": now + max(lifetime, self.min_ttl),
+            "body": body,
+            "extracts": {},
+        }
+        self._save(url, entry, now)
+        return entry
+
+    def revalidated(self, url: str, entry: dict[str, Any], response: Any) -> dict[str, Any]:
+        """Refresh an entry after a 304 Not Modified (extracts stay valid)."""
+        now = time.time()
+        lifetime = freshness(response.headers, now) or 0.0
+        entry["fresh_until"] = now + max(lifetime, self.min_ttl)
+        entry["etag"] = response.headers.get("etag") or entry.get("etag")
+        entry["last_modified"] = response.headers.get("last-modified") or entry.get("last_modified")
+        self._save(url, entry, now)
+        return entry
+
+    def save_extract(self, url: str, entry: dict[str, Any], mode: str, text: str, extractor: str) -> None:
+        entry["extracts"][mode] = {"text": text, "extractor": extractor}
+        self._save(url, entry, time.time())
+
+    def _save(self, url: str, entry: dict[str, Any], now: float) -> None:
+        ttl = entry["fresh_until"] - now
+        if entry.get("etag") or entry.get("last_modified"):
+            ttl = max(ttl, KEEP_STALE_S)
+        self.cache.set(url, json.dumps(entry, ensure_ascii=False).encode("utf-8"), ttl=ttl)
+
+    def record(self, result: str) -> None:
+        """Count a lookup result: hit, revalidated or miss."""
+        WEB_CACHE_REQUESTS.inc(result=result)
+        self.cache.incr(result)
+
+    def stats(self) -> dict[str, int]:
+        counters = self.cache.counters()
+        entries, size = self.cache.size()
+        hits = counters.get("hit", 0) + counters.get("revalidated", 0)
+        return {"entries": entries, "bytes": size, "hits": hits, "lookups": hits + counters.get("miss", 0)}
+
+
+_shared: HttpCache | None = None
+
+
+def configure(config: Any, path: Path) -> None:
+    """Open the shared cache from ``WebCacheConfig`` (or disable it)."""
+    global _shared
+    if _shared is not None:
+        _shared.cache.close()
+        _shared = None
+    if config.enabled:
+        disk = DiskCache(path, max_bytes=config.max_size_mb * 1024 * 1024, default_ttl=config.min_ttl_s)
+        _shared = HttpCache(disk, min_ttl=config.min_ttl_s)
+
+
+def get_cache() -> HttpCache | None:
+    """The cache configured for this process, if any."""
+    return _shared
@@ -0,0 +1,74 @@
+"""Event loop lag monitor.
+
+A task on the loop records a heartbeat every ``interval`` seconds and a
+watchdog thread checks it. When the loop has not come back for longer than
+``threshold`` the watchdog logs the loop thread's current stack, which names
+the callback that is blocking every channel, while it is still blocking.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from loguru import logger
+
+from nanobot.utils.metrics import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    "nanobot_event_loop_lag_seconds", "Delay of event loop wakeups past their scheduled time.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = REGISTRY.counter(
+    "nanobot_event_loop_stalls_total", "Times the event loop was blocked longer than the lag threshold.",
+)
+
+
+class LoopLagMonitor:
+    """Logs callbacks that block the running event loop longer than ``threshold`` seconds."""
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self._beat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread = 0
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from inside it)."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="nanobot-looplag", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _tick(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            LOOP_LAG.observe(max(0.0, now - expected))
+            self._beat = now
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.threshold or beat == reported:
+                continue
+            reported = beat
+            LOOP_STALLS.inc()
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)).rstrip() if frame else "(unknown)"
+            logger.warning(f"Event loop blocked for over {blocked:.2f}s in:\n{stack}")
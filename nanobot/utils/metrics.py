@@ -0,0 +1,239 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms are kept in plain dicts keyed by label
+values; nothing is exported until ``/metrics`` is scraped. Values that are
+cheap to read on demand (queue depths, cache sizes) are registered as
+callback gauges instead of being updated on every change.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+_LE_INF = 'le="+Inf"'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, optionally read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._callbacks: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels: str) -> None:
+        self._callbacks[self._key(labels)] = fn
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        return self._callbacks[key]() if key in self._callbacks else self._values.get(key, 0)
+
+    def _samples(self) -> list[str]:
+        values = dict(self._values)
+        for key, fn in self._callbacks.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, hits in zip(self.buckets, series):
+                cumulative += hits
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, _LE_INF)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _with_label(sample: str, label: str) -> str:
+    series, _, value = sample.rpartition(" ")
+    if series.endswith("}"):
+        return f"{series[:-1]},{label}}} {value}"
+    return f"{series}{{{label}}} {value}"
+
+
+def merge_expositions(sources: list[tuple[str, str]]) -> str:
+    """
+    Merge rendered metrics from several processes into one exposition.
+
+    ``sources`` are ``(label, text)`` pairs; every sample of a source gets its
+    label (e.g. ``worker="1"``) unless it is empty. Samples of one metric stay
+    grouped under a single HELP/TYPE header, as the format requires.
+    """
+    headers: dict[str, list[str]] = {}
+    samples: dict[str, list[str]] = {}
+    for label, text in sources:
+        name = ""
+        for line in text.splitlines():
+            if line.startswith("# "):
+                name = line.split(" ", 3)[2]
+                family = headers.setdefault(name, [])
+                if len(family) < 2:
+                    family.append(line)
+                samples.setdefault(name, [])
+            elif line:
+                samples.setdefault(name, []).append(_with_label(line, label) if label else line)
+    lines = []
+    for name, family in headers.items():
+        lines.extend(family)
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Metrics recorded by nanobot
+BUS_DEPTH = REGISTRY.gauge("nanobot_bus_queue_depth", "Messages waiting on the bus.", ("queue",))
+TURNS_IN_FLIGHT = REGISTRY.gauge("nanobot_turns_in_flight", "Agent turns being processed.")
+TURN_DURATION = REGISTRY.histogram("nanobot_turn_duration_seconds", "Agent turn duration.", ("channel",))
+LLM_DURATION = REGISTRY.histogram(
+    "nanobot_llm_request_duration_seconds", "LLM call latency, retries included.", ("model", "purpose", "outcome"),
+)
+LLM_TOKENS = REGISTRY.counter("nanobot_llm_tokens_total", "LLM tokens used.", ("model", "kind"))
+TOOL_DURATION = REGISTRY.histogram("nanobot_tool_duration_seconds", "Tool execution latency.", ("tool",))
+TOOL_ERRORS = REGISTRY.counter("nanobot_tool_errors_total", "Tool calls that returned an error.", ("tool",))
+CHANNEL_SEND_DURATION = REGISTRY.histogram(
+    "nanobot_channel_send_duration_seconds", "Channel send latency.", ("channel",),
+)
+CHANNEL_SEND_ERRORS = REGISTRY.counter("nanobot_channel_send_errors_total", "Failed channel sends.", ("channel",))
+SESSION_CACHE_SIZE = REGISTRY.gauge("nanobot_session_cache_size", "Sessions held in memory.")
+CRON_LAG = REGISTRY.histogram(
+    "nanobot_cron_lag_seconds", "Delay between a cron job's scheduled and actual start.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
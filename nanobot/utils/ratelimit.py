@@ -0,0 +1,45 @@
+"""Async token bucket for request and token rate limits."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate_per_minute``.
+
+    Waiters are served in arrival order. The balance may go negative via
+    ``adjust`` when a call used more than was reserved up front; later
+    callers then wait for the debt to be repaid.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Wait until ``amount`` tokens are available and take them. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """Take (positive) or return (negative) tokens after the fact."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
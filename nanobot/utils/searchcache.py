@@ -0,0 +1,128 @@
+"""Result cache, request coalescing and quotas for the web search API.
+
+Identical searches (after normalizing the query) are answered from a TTL
+cache, and concurrent identical searches share one API request, so parallel
+subagents or repeated cron runs don't each pay for the same query. Calls
+that do reach the API are rate limited per API key and counted against an
+optional monthly quota.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from nanobot.utils.coalesce import Coalescer
+from nanobot.utils.diskcache import DiskCache
+from nanobot.utils.fsio import run_fs
+from nanobot.utils.metrics import REGISTRY
+from nanobot.utils.ratelimit import TokenBucket
+
+WEB_SEARCH_REQUESTS = REGISTRY.counter(
+    "nanobot_web_search_requests_total", "web_search lookups by result.", ("result",),
+)
+
+
+class QuotaExceededError(Exception):
+    """The monthly search quota for an API key is used up."""
+
+
+def search_key(query: str, count: int) -> str:
+    """Cache key of a search: case and whitespace of the query don't matter."""
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(f"{count}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def _api_key_id(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class SearchCache:
+    """Wraps search API calls with a TTL cache, coalescing, rate limit and quota."""
+
+    def __init__(
+        self,
+        cache: DiskCache | None = None,
+        ttl: float = 3600,
+        requests_per_minute: float = 0,
+        monthly_quota: int = 0,
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.requests_per_minute = requests_per_minute
+        self.monthly_quota = monthly_quota
+        self._coalescer: Coalescer[str] = Coalescer()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._calls: dict[str, int] = {}  # Month counters when there is no disk cache
+
+    async def search(self, api_key: str, query: str, count: int, fetch: Callable[[], Awaitable[str]]) -> str:
+        """Return the result of ``fetch()`` for this query, from cache or a shared in-flight call."""
+        key = search_key(query, count)
+        if self.cache is not None and self.ttl > 0 and (data := await run_fs(self.cache.get, key)) is not None:
+            await run_fs(self._record, "hit")
+            return data.decode("utf-8")
+
+        async def call() -> str:
+            result = await self._call_api(api_key, fetch)
+            if self.cache is not None and self.ttl > 0:
+                await run_fs(self.cache.set, key, result.encode("utf-8"), self.ttl)
+            return result
+
+        result, shared = await self._coalescer.run(key, call)
+        if shared:
+            await run_fs(self._record, "coalesced")
+        return result
+
+    async def _call_api(self, api_key: str, fetch: Callable[[], Awaitable[str]]) -> str:
+        key_id = _api_key_id(api_key)
+        month = f"calls:{key_id}:{time.strftime('%Y-%m')}"
+        if self.monthly_quota and await run_fs(self._used, month) >= self.monthly_quota:
+            await run_fs(self._record, "quota")
+            raise QuotaExceededError(f"Monthly web search quota of {self.monthly_quota} requests used up")
+        if self.requests_per_minute > 0:
+            bucket = self._buckets.get(key_id)
+            if bucket is None:
+                bucket = self._buckets[key_id] = TokenBucket(self.requests_per_minute, capacity=1)
+            await bucket.acquire()
+        await run_fs(self._record, "miss")
+        await run_fs(self._count, month)
+        return await fetch()
+
+    def _used(self, counter: str) -> int:
+        if self.cache is not None:
+            return self.cache.counters().get(counter, 0)
+        return self._calls.get(counter, 0)
+
+    def _count(self, counter: str) -> None:
+        if self.cache is not None:
+            self.cache.incr(counter)
+        else:
+            self._calls[counter] = self._calls.get(counter, 0) + 1
+
+    def _record(self, result: str) -> None:
+        WEB_SEARCH_REQUESTS.inc(result=result)
+        if self.cache is not None:
+            self.cache.incr(result)
+
+    def stats(self) -> dict[str, int]:
+        counters = self.cache.counters() if self.cache is not None else {}
+        hits = counters.get("hit", 0) + counters.get("coalesced", 0)
+        return {"hits": hits, "lookups": hits + counters.get("miss", 0),
+                "api_calls_this_month": sum(v for k, v in counters.items()
+                                            if k.startswith("calls:") and k.endswith(time.strftime("%Y-%m")))}
+
+
+_shared = SearchCache()  # Coalescing only, until configured
+
+
+def configure(config: Any, path: Path) -> None:
+    """Apply ``WebSearchConfig`` (cache TTL, rate limit and quota) to the shared search cache."""
+    global _shared
+    if _shared.cache is not None:
+        _shared.cache.close()
+    cache = DiskCache(path, default_ttl=config.cache_ttl_s) if config.cache_ttl_s > 0 or config.monthly_quota else None
+    _shared = SearchCache(cache, config.cache_ttl_s, config.requests_per_minute, config.monthly_quota)
+
+
+def get_search_cache() -> SearchCache:
+    return _shared
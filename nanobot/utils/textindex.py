@@ -0,0 +1,316 @@
+"""Trigram index over a directory tree, for fast regex search.
+
+Each text file is reduced to the set of (lower-cased) byte trigrams it
+contains. A search first extracts the literal strings a regex requires,
+keeps only files containing all of their trigrams, and runs the regex on
+those alone. The index is persisted in SQLite and refreshed incrementally
+by comparing mtimes and sizes, so repeated searches only re-read files
+that changed.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+    from re._constants import BRANCH, LITERAL, SUBPATTERN
+except ImportError:  # pragma: no cover
+    import sre_parse
+    from sre_constants import BRANCH, LITERAL, SUBPATTERN
+
+MAX_INDEXED_BYTES = 4 * 1024 * 1024  # Larger files are not indexed; searches must scan them directly
+ALWAYS_SKIP = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".mypy_cache", ".pytest_cache"}
+
+
+# ---------------------------------------------------------------------------
+# .gitignore
+# ---------------------------------------------------------------------------
+
+def glob_to_regex(glob: str) -> str:
+    """Regex body for a gitignore-style glob (``*`` stays within a path segment, ``**`` spans them)."""
+    out, i = [], 0
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("/**", i) and i + 3 == len(glob):
+            out.append("/.*")
+            i += 3
+            continue
+        if c == "*":
+            out.append(".*" if glob.startswith("**", i) else "[^/]*")
+            i += 2 if glob.startswith("**", i) else 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end].replace("\\", "\\\\")
+                out.append(f"[{'^' + body[1:] if body.startswith('!') else body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """Matcher for .gitignore rules collected while walking a tree (last match wins)."""
+
+    def __init__(self):
+        self._rules: list[tuple[re.Pattern, bool, bool]] = []  # (regex, negated, dir_only)
+
+    def add_file(self, path: Path, base: str) -> None:
+        """Add the rules of a .gitignore located in relative directory ``base`` ('' for the root)."""
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        prefix = re.escape(base + "/") if base else ""
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            body = glob_to_regex(line)
+            regex = f"^{prefix}{body}$" if anchored else f"^{prefix}(?:.*/)?{body}$"
+            self._rules.append((re.compile(regex), negated, dir_only))
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        for regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                result = not negated
+        return result
+
+
+def walk_files(root: Path) -> dict[str, os.stat_result]:
+    """Regular files under ``root`` (relative POSIX path -> stat), honouring .gitignore files."""
+    ignore = GitIgnore()
+    files: dict[str, os.stat_result] = {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        directory = root / rel_dir if rel_dir else root
+        if (directory / ".gitignore").is_file():
+            ignore.add_file(directory / ".gitignore", rel_dir)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ALWAYS_SKIP and not ignore.ignored(rel, True):
+                        stack.append(rel)
+                elif entry.is_file(follow_symlinks=False) and not ignore.ignored(rel, False):
+                    files[rel] = entry.stat()
+            except OSError:
+                continue
+    return files
+
+
+# ---------------------------------------------------------------------------
+# Trigrams and regex literals
+# ---------------------------------------------------------------------------
+
+def trigrams(data: bytes) -> array:
+    """Sorted distinct trigrams of lower-cased ``data``, packed as 24-bit ints."""
+    data = data.lower()
+    unique = set(zip(data, data[1:], data[2:]))
+    return array("I", sorted((a << 16) | (b << 8) | c for a, b, c in unique))
+
+
+def _literal_runs(parsed) -> list[str]:
+    """Literal strings every match of a parsed sequence must contain."""
+    runs, current = [], []
+    for op, arg in parsed:
+        if op is LITERAL and arg < 128:
+            current.append(chr(arg))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is SUBPATTERN:
+            inner = _literal_runs(arg[-1])
+            if inner:
+                runs.extend(inner)
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def required_literals(pattern: str) -> list[list[str]] | None:
+    """
+    Literal substrings a match of ``pattern`` must contain.
+
+    Returns alternatives (any one may match), each a list of ASCII literals
+    that must all be present, or None when no useful literal (3+ chars) can
+    be derived and every file has to be searched. Only ASCII is used so the
+    case-folded trigrams stay valid for case-insensitive searches.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is BRANCH:
+        branches = items[0][1][1]
+    else:
+        branches = [parsed]
+    alternatives = []
+    for branch in branches:
+        runs = [r for r in _literal_runs(branch) if len(r) >= 3]
+        if not runs:
+            return None
+        alternatives.append(runs)
+    return alternatives
+
+
+def _contains_all(grams: array, wanted: list[int]) -> bool:
+    n = len(grams)
+    for g in wanted:
+        i = bisect_left(grams, g)
+        if i == n or grams[i] != g:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Entry:
+    mtime_ns: int
+    size: int
+    grams: array | None  # None: binary, or not indexed because it is too large
+
+
+class TrigramIndex:
+    """Incrementally maintained trigram index of the text files under ``root``."""
+
+    def __init__(self, root: Path, db_path: Path | None = None):
+        self.root = root
+        self.db_path = db_path
+        self._entries: dict[str, _Entry] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, _Entry]:
+        entries: dict[str, _Entry] = {}
+        if self.db_path and self.db_path.exists():
+            try:
+                with sqlite3.connect(self.db_path) as db:
+                    for path, mtime_ns, size, blob in db.execute("SELECT path, mtime_ns, size, grams FROM files"):
+                        grams = None
+                        if blob is not None:
+                            grams = array("I")
+                            grams.frombytes(blob)
+                        entries[path] = _Entry(mtime_ns, size, grams)
+            except sqlite3.Error:
+                entries = {}
+        return entries
+
+    def _save(self, changed: dict[str, _Entry], removed: list[str]) -> None:
+        if not self.db_path or not (changed or removed):
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, grams BLOB)"
+            )
+            db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+            db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                [(p, e.mtime_ns, e.size, e.grams.tobytes() if e.grams is not None else None)
+                 for p, e in changed.items()],
+            )
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Re-index files whose mtime or size changed since the last refresh.
+
+        Only a directory walk with ``stat`` is needed for unchanged files, so
+        this is cheap enough to run before every search. Returns the number
+        of updated and removed files.
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            current = walk_files(self.root)
+            changed: dict[str, _Entry] = {}
+            for rel, st in current.items():
+                entry = self._entries.get(rel)
+                if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                    continue
+                changed[rel] = self._index_file(rel, st)
+            removed = [rel for rel in self._entries if rel not in current]
+            for rel in removed:
+                del self._entries[rel]
+            self._entries.update(changed)
+            try:
+                self._save(changed, removed)
+            except sqlite3.Error:
+                pass  # The in-memory index is still valid
+            return {"updated": len(changed), "removed": len(removed)}
+
+    def _index_file(self, rel: str, st: os.stat_result) -> _Entry:
+        grams = None
+        if st.st_size <= MAX_INDEXED_BYTES:
+            try:
+                data = (self.root / rel).read_bytes()
+                if b"\0" not in data[:8192]:
+                    grams = trigrams(data)
+            except OSError:
+                pass
+        return _Entry(st.st_mtime_ns, st.st_size, grams)
+
+    def candidates(self, pattern: str | None) -> list[str]:
+        """
+        Files that may match ``pattern`` (all text files when it has no usable literal).
+
+        Files over ``MAX_INDEXED_BYTES`` cannot be ruled out and are always
+        included; they may be binary, which the caller has to check.
+        """
+        if self._entries is None:
+            self.refresh()
+        alternatives = required_literals(pattern) if pattern is not None else None
+        wanted = None
+        if alternatives is not None:
+            wanted = [sorted({g for lit in alt for g in trigrams(lit.encode("utf-8"))}) for alt in alternatives]
+        with self._lock:
+            entries = sorted(self._entries.items())
+        result = []
+        for rel, entry in entries:
+            if entry.grams is None:
+                if entry.size > MAX_INDEXED_BYTES:
+                    result.append(rel)
+                continue
+            if wanted is None or any(_contains_all(entry.grams, w) for w in wanted):
+                result.append(rel)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries or {})
@@ -0,0 +1,229 @@
+"""Lightweight per-turn tracing with OpenTelemetry-shaped spans.
+
+Spans are written as JSON lines to a local file; no collector is needed.
+A turn's trace id travels on ``InboundMessage``/``OutboundMessage``, so spans
+recorded in another process (channel send in the gateway, the turn in a
+worker) land in the same trace. Sampling is decided from the trace id
+itself, which keeps every process in agreement without coordination.
+"""
+
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+# Stages shown by the slow-turn summary, keyed by span name
+STAGES = {
+    "bus.queue": "queue",
+    "context.build": "context",
+    "llm.chat": "llm",
+    "tool.execute": "tools",
+    "session.save": "save",
+    "channel.send": "send",
+}
+
+
+def new_trace_id() -> str:
+    """Random 128-bit trace id (32 hex chars, as in OpenTelemetry)."""
+    return os.urandom(16).hex()
+
+
+def root_span_id(trace_id: str) -> str:
+    """Span id of a trace's root span, derivable from the trace id in any process."""
+    return trace_id[16:]
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace_id: str, span_id: str, parent_id: str | None, name: str, attributes: dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class _NoopSpan:
+    """Stand-in when tracing is off or the trace is not sampled."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+
+
+class Tracer:
+    """Creates spans and appends finished ones to a JSONL file."""
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.path: Path | None = None
+        self.max_bytes = 50 * 1024 * 1024
+        self._buffer: list[str] = []
+
+    def configure(self, config: Any, path: Path) -> None:
+        """Apply ``TracingConfig``; spans go to ``config.path`` or ``path``."""
+        self.enabled = config.enabled
+        self.sample_rate = config.sample_rate
+        self.path = Path(config.path).expanduser() if config.path else path
+        self.max_bytes = config.max_file_mb * 1024 * 1024
+
+    def sampled(self, trace_id: str | None) -> bool:
+        if not self.enabled or not trace_id:
+            return False
+        return int(trace_id[:8], 16) / 0x100000000 < self.sample_rate
+
+    @contextmanager
+    def trace(self, name: str, trace_id: str | None, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """Open the root span of ``trace_id`` (a no-op unless sampled)."""
+        if not self.sampled(trace_id):
+            yield _NOOP
+            return
+        with self._open(Span(trace_id, root_span_id(trace_id), None, name, attributes)) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, trace_id: str | None = None, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """Open a child of the current span, or of ``trace_id``'s root when there is none."""
+        parent = _current.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif self.sampled(trace_id):
+            parent_id = root_span_id(trace_id)
+        else:
+            yield _NOOP
+            return
+        with self._open(Span(trace_id, os.urandom(8).hex(), parent_id, name, attributes)) as span:
+            yield span
+
+    def record(self, name: str, start_ns: int, end_ns: int | None = None, **attributes: Any) -> None:
+        """Record an already-finished child of the current span (e.g. time spent queued)."""
+        parent = _current.get()
+        if parent is None:
+            return
+        span = Span(parent.trace_id, os.urandom(8).hex(), parent.span_id, name, attributes)
+        span.start_ns, span.end_ns = start_ns, end_ns or time.time_ns()
+        self._export(span, flush=False)
+
+    @contextmanager
+    def _open(self, span: Span) -> Iterator[Span]:
+        local_root = _current.get() is None
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self._export(span, flush=local_root)
+
+    def _export(self, span: Span, flush: bool) -> None:
+        self._buffer.append(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+        if flush or len(self._buffer) >= 256:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered spans to the file, rotating it to ``<path>.1`` when full."""
+        if not self._buffer or self.path is None:
+            return
+        lines, self._buffer = self._buffer, []
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                self.path.replace(self.path.with_name(self.path.name + ".1"))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write trace spans: {e}")
+
+
+tracer = Tracer()
+
+
+def load_spans(path: Path) -> list[dict[str, Any]]:
+    """Read spans from ``path`` and its rotated predecessor."""
+    spans = []
+    for file in (path.with_name(path.name + ".1"), path):
+        if not file.exists():
+            continue
+        for line in file.read_text(encoding="utf-8").splitlines():
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Partially written line
+    return spans
+
+
+def slowest_turns(spans: list[dict[str, Any]], limit: int = 10) -> list[dict[str, Any]]:
+    """Per-stage breakdown (ms) of the slowest ``agent.turn`` traces, queue and send included."""
+    by_trace: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        by_trace[span["trace_id"]].append(span)
+
+    turns = []
+    for trace_id, members in by_trace.items():
+        root = next((s for s in members if s["name"] == "agent.turn"), None)
+        if root is None:
+            continue
+        stages: dict[str, float] = defaultdict(float)
+        tools: dict[str, float] = defaultdict(float)
+        for span in members:
+            stage = STAGES.get(span["name"])
+            if stage:
+                stages[stage] += span["duration_ms"]
+            if span["name"] == "tool.execute":
+                tools[span["attributes"].get("tool", "?")] += span["duration_ms"]
+        turns.append({
+            "trace_id": trace_id,
+            "start_ns": root["start_time_unix_nano"],
+            "session": root["attributes"].get("session", ""),
+            "total_ms": round(root["duration_ms"] + stages["queue"] + stages["send"], 3),
+            "turn_ms": root["duration_ms"],
+            "stages": {name: round(stages[name], 3) for name in STAGES.values()},
+            "slowest_tool": max(tools, key=tools.get) if tools else None,
+            "errors": sum(1 for s in members if s["status"]["code"] == "ERROR"),
+        })
+    turns.sort(key=lambda t: t["total_ms"], reverse=True)
+    return turns[:limit]
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.api import ApiChannel
+from nanobot.config.schema import ApiConfig
+from nanobot.gateway import GatewayServer
+
+
+async def _echo_agent(bus: MessageBus, seen: list) -> None:
+    """Stand-in for AgentLoop: one progress update, then an echo reply."""
+    while True:
+        msg = await bus.consume_inbound()
+        seen.append(msg)
+        await bus.publish_outbound(OutboundMessage(
+            channel=msg.channel, chat_id=msg.chat_id, content="thinking\nhard",
+            metadata={**msg.metadata, "_progress": True},
+        ))
+        await asyncio.sleep(0.01)
+        await bus.publish_outbound(OutboundMessage(
+            channel=msg.channel, chat_id=msg.chat_id, content=f"echo: {msg.content}", metadata=msg.metadata,
+        ))
+
+
+async def _dispatch(bus: MessageBus, channel: ApiChannel) -> None:
+    while True:
+        await channel.send(await bus.consume_outbound())
+
+
+@pytest.fixture
+async def api():
+    bus = MessageBus()
+    channel = ApiChannel(ApiConfig(enabled=True, api_keys={"ci": "secret"}), bus)
+    server = GatewayServer("127.0.0.1", 0)
+    channel.mount(server)
+    await server.start()
+    seen: list = []
+    tasks = [asyncio.create_task(_echo_agent(bus, seen)), asyncio.create_task(_dispatch(bus, channel))]
+    client = httpx.AsyncClient(base_url=server.url, headers={"Authorization": "Bearer secret"})
+    try:
+        yield client, seen, channel
+    finally:
+        await client.aclose()
+        for task in tasks:
+            task.cancel()
+        await server.stop()
+
+
+async def test_chat_completion_concurrent_sessions(api) -> None:
+    client, seen, channel = api
+    body = {"model": "nanobot", "messages": [{"role": "system", "content": "x"}, {"role": "user", "content": "hi"}]}
+    first, second = await asyncio.gather(
+        client.post("/v1/chat/completions", json={**body, "user": "alice"}),
+        client.post("/v1/chat/completions", json=body, headers={"X-Session-Id": "s1"}),
+    )
+    assert first.status_code == second.status_code == 200
+    assert first.json()["choices"][0]["message"] == {"role": "assistant", "content": "echo: hi"}
+    assert {m.session_key for m in seen} == {"api:ci:alice", "api:ci:s1"}
+    assert {m.sender_id for m in seen} == {"ci"}
+    assert not channel._replies and not channel._by_chat
+
+
+async def test_streaming_chat_completion(api) -> None:
+    client, _, _ = api
+    body = {"messages": [{"role": "user", "content": [{"type": "text", "text": "yo"}]}], "stream": True}
+    async with client.stream("POST", "/v1/chat/completions", json=body) as response:
+        assert response.headers["content-type"] == "text/event-stream"
+        lines = [line async for line in response.aiter_lines() if line]
+
+    assert ": progress thinking hard" in lines
+    events = [line[6:] for line in lines if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    assert "".join(c["choices"][0]["delta"].get("content", "") for c in chunks) == "echo: yo"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+async def test_auth_and_models(api) -> None:
+    client, _, _ = api
+    assert (await client.get("/v1/models")).json()["data"][0]["id"] == "nanobot"
+    denied = await client.post("/v1/chat/completions", json={"messages": []}, headers={"Authorization": "Bearer x"})
+    assert denied.status_code == 401
+    assert (await client.post("/v1/chat/completions", json={"messages": []})).status_code == 400
+    assert (await client.post("/v1/chat/completions", json={"messages": ["hi"]})).status_code == 400
+
+
+async def test_keys_required_off_loopback_and_callers_come_from_keys() -> None:
+    from nanobot.channels.api import key_name
+
+    with pytest.raises(ValueError, match="apiKeys"):
+        ApiChannel(ApiConfig(enabled=True), MessageBus()).mount(GatewayServer("0.0.0.0", 0))
+    ApiChannel(ApiConfig(enabled=True), MessageBus()).mount(GatewayServer("127.0.0.1", 0))
+
+    channel = ApiChannel(ApiConfig(enabled=True, api_keys=["k1", "k2"], allow_from=[key_name("k1")]), MessageBus())
+    server = GatewayServer("127.0.0.1", 0)
+    channel.mount(server)
+    await server.start()
+    try:
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            body = {"messages": [{"role": "user", "content": "hi"}], "user": key_name("k1")}
+            denied = await client.post("/v1/chat/completions", json=body, headers={"Authorization": "Bearer k2"})
+            assert denied.status_code == 403  # The body's "user" does not grant access
+    finally:
+        await server.stop()
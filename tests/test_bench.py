@@ -0,0 +1,23 @@
+from nanobot.agent.loop import AgentLoop
+from nanobot.bench import FakeLLMServer, FakeProfile, run_benchmark
+from nanobot.providers.custom_provider import CustomProvider
+from nanobot.utils import http
+
+
+async def test_benchmark_against_fake_server(tmp_path) -> None:
+    profile = FakeProfile(latency_ms=5, jitter_ms=0, tool_calls=1, tool_args={"path": str(tmp_path)}, seed=1)
+    try:
+        async with FakeLLMServer(profile) as server:
+            def make_agent(bus):
+                provider = CustomProvider(api_key="x", api_base=server.url, default_model="fake-model")
+                return AgentLoop(bus=bus, provider=provider, workspace=tmp_path, model="fake-model")
+
+            report = await run_benchmark(make_agent, chats=3, turns=2, timeout=30)
+    finally:
+        await http.close_all()
+
+    assert report["turns"] == 6 and report["errors"] == 0
+    assert server.requests == 12  # one tool round + one answer per turn
+    assert report["progress_messages"] == 6
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+    assert report["queue_ms"]["max"] <= report["latency_ms"]["max"]
@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel, merge_burst
+
+
+class DummyChannel(BaseChannel):
+    name = "dummy"
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        pass
+
+
+def _channel(debounce_ms: int) -> DummyChannel:
+    return DummyChannel(SimpleNamespace(allow_from=[], debounce_ms=debounce_ms), MessageBus())
+
+
+async def test_no_debounce_publishes_immediately() -> None:
+    ch = _channel(0)
+    await ch._handle_message("u1", "c1", "hello")
+    assert ch.bus.inbound_size == 1
+
+
+async def test_burst_is_merged_into_one_turn() -> None:
+    ch = _channel(50)
+    await ch._handle_message("u1", "c1", "hi", media=["/tmp/a.png"], metadata={"message_id": 1})
+    await ch._handle_message("u1", "c1", "are you there?", metadata={"message_id": 2})
+    await ch._handle_message("u2", "c2", "other chat")
+    assert ch.bus.inbound_size == 0
+
+    await asyncio.sleep(0.2)
+    assert ch.bus.inbound_size == 2
+    first = await ch.bus.consume_inbound()
+    second = await ch.bus.consume_inbound()
+    merged = first if first.chat_id == "c1" else second
+    assert merged.content == "hi\nare you there?"
+    assert merged.media == ["/tmp/a.png"]
+    assert merged.metadata == {"message_id": 2}
+
+
+async def test_command_flushes_pending_burst_first() -> None:
+    ch = _channel(10_000)
+    await ch._handle_message("u1", "c1", "draft")
+    await ch._handle_message("u1", "c1", "/new")
+    assert (await ch.bus.consume_inbound()).content == "draft"
+    assert (await ch.bus.consume_inbound()).content == "/new"
+    assert not ch._bursts
+
+
+def test_merge_burst_labels_multiple_senders() -> None:
+    msgs = [
+        InboundMessage(channel="dummy", sender_id="alice", chat_id="g", content="lunch?"),
+        InboundMessage(channel="dummy", sender_id="bob", chat_id="g", content="yes"),
+    ]
+    merged = merge_burst(msgs)
+    assert merged.content == "alice: lunch?\nbob: yes"
+    assert merged.sender_id == "bob"
+    assert merged.timestamp == msgs[0].timestamp
+
+
+async def test_gateway_shutdown_answers_pending_bursts(tmp_path) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.channels.manager import ChannelManager
+    from nanobot.cli.commands import _stop_agent_and_channels
+    from nanobot.config.schema import Config
+    from nanobot.providers.base import LLMProvider, LLMResponse
+
+    class EchoProvider(LLMProvider):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            return LLMResponse(content=f"echo: {messages[-1]['content']}")
+
+        def get_default_model(self) -> str:
+            return "m"
+
+    sent: list[OutboundMessage] = []
+
+    class RecordingChannel(DummyChannel):
+        async def send(self, msg: OutboundMessage) -> None:
+            sent.append(msg)
+
+    bus = MessageBus()
+    ch = RecordingChannel(SimpleNamespace(allow_from=[], debounce_ms=10_000), bus)
+    manager = ChannelManager(Config(), bus)
+    manager.channels = {"dummy": ch}
+    agent = AgentLoop(bus=bus, provider=EchoProvider(), workspace=tmp_path)
+    tasks = [asyncio.create_task(agent.run()), asyncio.create_task(manager.start_all())]
+    await asyncio.sleep(0.05)
+
+    await ch._handle_message("u1", "c1", "still typing")
+    await _stop_agent_and_channels(agent, manager)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert [m.chat_id for m in sent] == ["c1"]
+    assert "still typing" in sent[0].content
@@ -0,0 +1,82 @@
+import json
+from types import SimpleNamespace
+
+from nanobot.providers import openai_codex_provider as codex
+from nanobot.providers.base import llm_call_tags
+
+
+class FakeSSE:
+    def __init__(self, events: list[dict]):
+        self.lines = []
+        for event in events:
+            self.lines += [f"data: {json.dumps(event)}", ""]
+
+    async def aiter_lines(self):
+        for line in self.lines:
+            yield line
+
+
+async def test_consume_sse_collects_text_tools_and_usage() -> None:
+    events = [
+        {"type": "response.output_text.delta", "delta": "Hel"},
+        {"type": "response.output_text.delta", "delta": "lo"},
+        {"type": "response.output_item.added", "item": {"type": "function_call", "call_id": "c1", "id": "fc1", "name": "read_file"}},
+        {"type": "response.function_call_arguments.delta", "call_id": "c1", "delta": '{"path": '},
+        {"type": "response.function_call_arguments.delta", "call_id": "c1", "delta": '"a.txt"}'},
+        {"type": "response.output_item.done", "item": {"type": "function_call", "call_id": "c1"}},
+        {"type": "response.completed", "response": {"status": "completed", "usage": {
+            "input_tokens": 100, "output_tokens": 7, "total_tokens": 107, "input_tokens_details": {"cached_tokens": 64},
+        }}},
+    ]
+    content, tool_calls, finish_reason, usage = await codex._consume_sse(FakeSSE(events))
+    assert content == "Hello"
+    assert tool_calls[0].id == "c1|fc1" and tool_calls[0].arguments == {"path": "a.txt"}
+    assert finish_reason == "stop"
+    assert usage["cached_tokens"] == 64
+
+
+async def test_token_is_cached_until_near_expiry(monkeypatch) -> None:
+    calls = []
+
+    def fake_get_token():
+        calls.append(1)
+        return SimpleNamespace(access="tok", account_id="acc", expires=(codex.time.time() + 3600) * 1000)
+
+    monkeypatch.setattr(codex, "get_codex_token", fake_get_token)
+    provider = codex.OpenAICodexProvider()
+    await provider._get_token()
+    await provider._get_token()
+    assert len(calls) == 1
+
+    provider._token_expires_at = 0
+    await provider._get_token()
+    assert len(calls) == 2
+
+
+async def test_warmup_is_authenticated(monkeypatch) -> None:
+    warmed = []
+
+    async def fake_warm(url, verify=True, headers=None):
+        warmed.append((url, headers))
+
+    monkeypatch.setattr(codex, "get_codex_token",
+                        lambda: SimpleNamespace(access="tok", account_id="acc", expires=None))
+    monkeypatch.setattr(codex.http, "warm", fake_warm)
+    await codex.OpenAICodexProvider().warmup()
+    assert warmed == [(codex.DEFAULT_CODEX_URL, codex._build_headers("acc", "tok"))]
+
+
+def test_prompt_cache_key_is_stable_across_turns() -> None:
+    tools = [{"type": "function", "function": {"name": "read_file"}}]
+    assert codex._prompt_cache_key("# nanobot\nTime: 10:01", tools) == codex._prompt_cache_key("# nanobot\nTime: 10:02", tools)
+    with llm_call_tags(session="telegram:1"):
+        a = codex._prompt_cache_key("x", tools)
+    with llm_call_tags(session="telegram:2"):
+        b = codex._prompt_cache_key("x", tools)
+    assert a != b
+
+
+def test_converted_tools_are_reused() -> None:
+    provider = codex.OpenAICodexProvider()
+    tools = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+    assert provider._get_converted_tools(tools) is provider._get_converted_tools(tools)
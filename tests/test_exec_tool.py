@@ -0,0 +1,81 @@
+import sys
+import time
+
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool, ShellPool, _Capture
+from nanobot.providers.base import llm_call_tags
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell commands")
+
+
+def test_capture_keeps_head_and_tail() -> None:
+    capture = _Capture(head=4, tail=4)
+    for chunk in (b"abc", b"defgh", b"ijkl"):
+        capture.feed(chunk)
+    assert capture.total == 12 and capture.omitted == 4
+    assert capture.text() == "abcd\n... (4 bytes omitted of 12 total) ...\nijkl"
+
+
+async def test_long_output_is_head_and_tail() -> None:
+    result = await ExecTool(max_output_chars=1000).execute("seq 1 100000")
+    assert result.startswith("1\n2\n3\n")
+    assert "100000\n" in result and "bytes omitted of 588895 total" in result
+    assert "Total output: 588895 bytes stdout" in result and result.endswith("Exit code: 0")
+
+
+async def test_output_budget_kills_command() -> None:
+    start = time.monotonic()
+    result = await ExecTool(max_output_bytes=50_000).execute("yes")
+    assert time.monotonic() - start < 5
+    assert result.startswith("Output exceeded 50000 bytes; command was killed")
+
+
+async def test_timeout_kills_process_group() -> None:
+    start = time.monotonic()
+    result = await ExecTool(timeout=1).execute("echo started; sleep 30 & sleep 30")
+    assert time.monotonic() - start < 5
+    assert result.startswith("Error: Command timed out after 1 seconds") and "started" in result
+
+
+async def test_ansi_codes_are_stripped() -> None:
+    result = await ExecTool().execute(r"printf '\033[1;31mred\033[0m\n' >&2; exit 2")
+    assert result == "STDERR:\nred\n\n\nExit code: 2"
+
+
+async def test_persistent_shell_keeps_state(tmp_path) -> None:
+    pool = ShellPool(str(tmp_path), max_shells=1)
+    tool = ExecTool(timeout=1, shells=pool)
+    (tmp_path / "sub").mkdir()
+    try:
+        with llm_call_tags(session="cli:a"):
+            assert await tool.execute("cd sub && export GREETING=hi") == "(no output)"
+            assert await tool.execute('echo "$GREETING from $(basename $PWD)"') == "hi from sub\n"
+            assert (await tool.execute("sleep 5")).endswith("the shell session was reset")
+            assert await tool.execute("basename $PWD") == f"{tmp_path.name}\n"
+        with llm_call_tags(session="cli:b"):
+            result = await tool.execute("echo $GREETING; exit 3")
+            assert result.startswith("Shell exited with code 3")
+        assert len(pool) == 1  # The idle shell of cli:a made room for cli:b
+    finally:
+        await pool.close_all()
+
+
+async def test_persistent_shell_stays_in_workspace(tmp_path) -> None:
+    workspace = tmp_path / "ws"
+    (workspace / "sub").mkdir(parents=True)
+    (tmp_path / "outside").mkdir()
+    (workspace / "sub" / "escape").symlink_to(tmp_path / "outside")
+    pool = ShellPool(str(workspace))
+    tool = ExecTool(timeout=5, working_dir=str(workspace), restrict_to_workspace=True, shells=pool)
+    try:
+        with llm_call_tags(session="cli:a"):
+            assert await tool.execute("cd sub") == "(no output)"
+            # Paths are checked against the workspace, not the shell's directory
+            assert "path traversal" in await tool.execute("cd ..")
+            assert "outside working dir" in await tool.execute(f"ls {tmp_path}/outside")
+            assert "outside workspace" in await tool.execute("ls", working_dir=str(tmp_path))
+            assert "was reset" in await tool.execute("cd escape")  # Leaving via a symlink resets the shell
+            assert await tool.execute("pwd") == f"{workspace}\n"
+    finally:
+        await pool.close_all()
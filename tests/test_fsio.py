@@ -0,0 +1,26 @@
+import os
+
+from nanobot.agent.tools.filesystem import EditFileTool, WriteFileTool
+
+
+async def test_writes_are_atomic_and_keep_permissions(tmp_path) -> None:
+    path = tmp_path / "sub" / "script.sh"
+    assert (await WriteFileTool().execute(str(path), "echo hi\n")).startswith("Successfully")
+    path.chmod(0o750)
+    assert await EditFileTool().execute(str(path), "hi", "there") == f"Successfully edited {path}"
+    assert path.read_text() == "echo there\n"
+    assert path.stat().st_mode & 0o777 == 0o750
+    assert os.listdir(path.parent) == ["script.sh"]  # No temp files left behind
+
+
+async def test_run_fs_keeps_the_caller_context(tmp_path) -> None:
+    import contextvars
+
+    from nanobot.utils.fsio import atomic_write, run_fs
+
+    var = contextvars.ContextVar("var", default="unset")
+    var.set("caller")
+    path = tmp_path / "out.bin"
+    await run_fs(atomic_write, path, b"data")
+    assert path.read_bytes() == b"data"
+    assert await run_fs(var.get) == "caller"
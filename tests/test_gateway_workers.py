@@ -0,0 +1,188 @@
+import asyncio
+import json
+from collections import Counter
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.workers import (
+    HashRing,
+    WorkerPool,
+    inbound_from_dict,
+    inbound_to_dict,
+    run_worker,
+)
+
+
+def test_hash_ring_is_stable_and_balanced() -> None:
+    ring = HashRing([0, 1, 2, 3])
+    keys = [f"telegram:{i}" for i in range(4000)]
+    owners = [ring.get(k) for k in keys]
+
+    assert owners == [HashRing([0, 1, 2, 3]).get(k) for k in keys]
+    counts = Counter(owners)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 500
+
+
+def test_hash_ring_moves_few_keys_when_growing() -> None:
+    keys = [f"slack:{i}" for i in range(4000)]
+    before = HashRing([0, 1, 2, 3])
+    after = HashRing([0, 1, 2, 3, 4])
+    moved = sum(before.get(k) != after.get(k) for k in keys)
+    assert moved < len(keys) * 0.35
+
+
+def test_inbound_roundtrip() -> None:
+    msg = InboundMessage(channel="telegram", sender_id="1", chat_id="42", content="hi",
+                         media=["/tmp/a.jpg"], metadata={"message_id": 7})
+    back = inbound_from_dict(inbound_to_dict(msg))
+    assert back == msg
+
+
+class FakeAgent:
+    """Echo agent standing in for AgentLoop inside a worker."""
+
+    def __init__(self, bus: MessageBus, index: int):
+        self.bus = bus
+        self.index = index
+        self._running = True
+
+    async def run(self) -> None:
+        while self._running:
+            msg = await self.bus.consume_inbound()
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel, chat_id=msg.chat_id, content=f"w{self.index}:{msg.content}",
+            ))
+            self.bus.inbound_done()
+
+    async def process_direct(self, content, session_key="cli:direct", channel="cli", chat_id="direct"):
+        return f"w{self.index}:{session_key}:{content}"
+
+    def stop(self) -> None:
+        self._running = False
+
+
+async def test_worker_pool_routes_by_session(tmp_path, monkeypatch) -> None:
+    gateway_bus = MessageBus()
+    pool = WorkerPool(gateway_bus, 2, tmp_path / "gw.sock")
+    worker_tasks: list[asyncio.Task] = []
+
+    class FakeProc:
+        returncode = None
+
+        def __init__(self, task):
+            self.task = task
+
+        async def wait(self):
+            await asyncio.gather(self.task, return_exceptions=True)
+            return 0
+
+        def terminate(self):
+            self.task.cancel()
+
+        kill = terminate
+
+    async def fake_spawn(index: int):
+        bus = MessageBus()
+        task = asyncio.create_task(run_worker(FakeAgent(bus, index), bus, pool.socket_path, index))
+        worker_tasks.append(task)
+        return FakeProc(task)
+
+    monkeypatch.setattr(pool, "_spawn", fake_spawn)
+    await pool.start()
+    router = asyncio.create_task(pool.run())
+    try:
+        for chat in ("a", "b", "c"):
+            await gateway_bus.publish_inbound(
+                InboundMessage(channel="telegram", sender_id="u", chat_id=chat, content="ping")
+            )
+        replies = {}
+        for _ in range(3):
+            out = await asyncio.wait_for(gateway_bus.consume_outbound(), timeout=5)
+            replies[out.chat_id] = out.content
+        for chat in ("a", "b", "c"):
+            assert replies[chat] == f"w{pool.worker_for('telegram:' + chat)}:ping"
+
+        result = await asyncio.wait_for(pool.process_direct("tick", session_key="cron:1"), timeout=5)
+        assert result == f"w{pool.worker_for('cron:1')}:cron:1:tick"
+
+        scraped = await pool.metrics()
+        assert [label for label, _ in scraped] == ['worker="0"', 'worker="1"']
+        assert all("# TYPE nanobot_turns_in_flight gauge" in text for _, text in scraped)
+
+        # Shutdown drain returns only once the workers' replies are back on the gateway bus
+        await gateway_bus.publish_inbound(
+            InboundMessage(channel="telegram", sender_id="u", chat_id="d", content="last")
+        )
+        await asyncio.wait_for(pool.drain(), timeout=5)
+        assert gateway_bus.outbound_size == 1
+        assert (await gateway_bus.consume_outbound()).content.endswith(":last")
+    finally:
+        pool._running = False
+        await router
+        await pool.stop()
+    assert not pool.socket_path.exists()
+
+
+async def test_pump_resends_an_unwritten_frame_first(tmp_path) -> None:
+    pool = WorkerPool(MessageBus(), 1, tmp_path / "gw.sock")
+
+    class Writer:
+        def __init__(self, broken: bool):
+            self.broken = broken
+            self.frames: list[bytes] = []
+
+        def write(self, data: bytes) -> None:
+            self.frames.append(data)
+
+        async def drain(self) -> None:
+            if self.broken:
+                raise ConnectionResetError
+
+    for n in (1, 2):
+        pool._outboxes[0].put_nowait({"type": "inbound", "n": n})
+    await pool._pump(0, Writer(broken=True))
+
+    # Cancelled mid-write: the frame is kept too
+    stalled = asyncio.Event()
+
+    class StalledWriter(Writer):
+        async def drain(self) -> None:
+            stalled.set()
+            await asyncio.sleep(3600)
+
+    pump = asyncio.create_task(pool._pump(0, StalledWriter(broken=False)))
+    await stalled.wait()
+    pump.cancel()
+    await asyncio.gather(pump, return_exceptions=True)
+
+    writer = Writer(broken=False)
+    pump = asyncio.create_task(pool._pump(0, writer))
+    await asyncio.sleep(0.01)
+    pump.cancel()
+    assert [json.loads(f)["n"] for f in writer.frames] == [1, 2]
+
+
+async def test_cron_scheduler_merges_jobs_from_workers(tmp_path) -> None:
+    from nanobot.cron.service import CronService
+    from nanobot.cron.types import CronSchedule
+
+    path = tmp_path / "jobs.json"
+    hourly = CronSchedule(kind="every", every_ms=3_600_000)
+    gateway, worker = CronService(path), CronService(path)
+    await gateway.start()
+    try:
+        assert gateway._timer_task is not None  # Polls the store even with no jobs
+        a = gateway.add_job("a", hourly, "a")
+        b = worker.add_job("b", hourly, "b")
+        # The gateway saves its stale copy (e.g. after running a job) without losing b
+        gateway._store.jobs[0].state.last_status = "ok"
+        gateway._save_store()
+        assert {j.name for j in worker.list_jobs()} == {"a", "b"}
+
+        worker.remove_job(a.id)
+        c = gateway.add_job("c", hourly, "c")
+        assert {j.id for j in gateway.list_jobs()} == {b.id, c.id}
+        assert {j.id for j in CronService(path).list_jobs()} == {b.id, c.id}
+    finally:
+        gateway.stop()
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+from nanobot.utils import http
+
+
+async def test_client_is_shared_per_options() -> None:
+    a = http.get_client()
+    b = http.get_client()
+    c = http.get_client(follow_redirects=True, max_redirects=5)
+    assert a is b
+    assert a is not c
+
+    await http.close_all()
+    assert a.is_closed and c.is_closed
+    assert http.get_client() is not a
+    await http.close_all()
+
+
+async def test_host_slot_limits_concurrency() -> None:
+    http.configure(SimpleNamespace(
+        http2=False, max_connections=10, max_keepalive_connections=5,
+        keepalive_expiry=5.0, max_per_host=2,
+    ))
+    active = peak = 0
+
+    async def request(url: str) -> None:
+        nonlocal active, peak
+        async with http.host_slot(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    try:
+        await asyncio.gather(*(request(f"https://example.com/{i}") for i in range(6)))
+        assert peak == 2
+    finally:
+        http.configure(SimpleNamespace(
+            http2=False, max_connections=100, max_keepalive_connections=20,
+            keepalive_expiry=30.0, max_per_host=8,
+        ))
+        await http.close_all()
+
+
+async def test_custom_provider_keeps_llm_timeout_on_pooled_client() -> None:
+    from nanobot.providers.custom_provider import CustomProvider
+
+    client = CustomProvider()._get_client()
+    assert client._client is http.get_client()
+    assert client.timeout.read == 600 and client.max_retries == 0
+    await http.close_all()
@@ -0,0 +1,70 @@
+"""Startup regression tests: CLI commands must not import heavy SDKs they don't use."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = {"litellm", "openai", "oauth_cli_kit", "telegram", "lark_oapi", "dingtalk_stream",
+         "slack_sdk", "botpy", "socketio", "discord", "mcp"}
+
+# Generous ceiling for `import nanobot.cli.commands` (microseconds); litellm alone exceeds it
+COMMANDS_IMPORT_BUDGET_US = 1_500_000
+
+
+def _run(args: list[str], home) -> dict[str, int]:
+    """Run a command under -X importtime and return {module: cumulative_us}."""
+    env = {**os.environ, "HOME": str(home)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, env=env, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.fixture
+def home(tmp_path):
+    config = tmp_path / ".nanobot" / "config.json"
+    config.parent.mkdir()
+    config.write_text(json.dumps({
+        "providers": {"anthropic": {"apiKey": "sk-test"}},
+        "agents": {"defaults": {"workspace": str(tmp_path / "ws")}},
+    }))
+    return tmp_path
+
+
+@pytest.mark.parametrize("command", [
+    ["--version"],
+    ["status"],
+    ["cron", "list"],
+    ["channels", "status"],
+])
+def test_cli_command_skips_heavy_imports(command, home) -> None:
+    modules = _run(["-m", "nanobot", *command], home)
+    top_level = {name.split(".")[0] for name in modules}
+    assert not top_level & HEAVY
+    assert modules["nanobot.cli.commands"] < COMMANDS_IMPORT_BUDGET_US
+
+
+def test_agent_with_custom_provider_skips_litellm(home) -> None:
+    script = (
+        "import sys\n"
+        "from nanobot.bus.queue import MessageBus\n"
+        "from nanobot.cli.commands import _make_agent_loop\n"
+        "from nanobot.config.schema import Config\n"
+        "config = Config.model_validate({'providers': {'custom': {'apiKey': 'x'}},"
+        " 'agents': {'defaults': {'model': 'local-model', 'workspace': sys.argv[1]}}})\n"
+        "_make_agent_loop(config, MessageBus(), None)\n"
+    )
+    modules = _run(["-c", script, str(home / "ws")], home)
+    assert "litellm" not in modules
+    assert "openai" in modules
@@ -0,0 +1,99 @@
+import asyncio
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest, llm_call_tags
+from nanobot.providers.cache import CachingProvider, cache_stats
+from nanobot.utils.diskcache import DiskCache
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self, delay: float = 0.0, error: bool = False):
+        super().__init__()
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            return LLMResponse(content="Error: boom", finish_reason="error")
+        return LLMResponse(
+            content="ok",
+            tool_calls=[ToolCallRequest(id="t1", name="read_file", arguments={"path": "a"})],
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        )
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+MESSAGES = [{"role": "user", "content": "check the inbox"}]
+
+
+def _provider(tmp_path, inner) -> CachingProvider:
+    return CachingProvider(inner, DiskCache(tmp_path / "llm.sqlite"), purposes=["cron"])
+
+
+async def test_cached_by_purpose(tmp_path) -> None:
+    inner = CountingProvider()
+    provider = _provider(tmp_path, inner)
+
+    await provider.chat(MESSAGES)
+    await provider.chat(MESSAGES)
+    assert inner.calls == 2  # interactive turns are not cached
+
+    with llm_call_tags(purpose="cron"):
+        first = await provider.chat(MESSAGES)
+        second = await provider.chat(MESSAGES)
+    assert inner.calls == 3
+    assert second == first
+    assert second.tool_calls[0].arguments == {"path": "a"}
+
+    stats = cache_stats(provider.cache)
+    assert stats["hits"] == 1 and stats["lookups"] == 2
+    assert stats["saved_tokens"] == 15
+
+
+async def test_zero_temperature_and_errors(tmp_path) -> None:
+    inner = CountingProvider(error=True)
+    provider = _provider(tmp_path, inner)
+    await provider.chat(MESSAGES, temperature=0)
+    await provider.chat(MESSAGES, temperature=0)
+    assert inner.calls == 2  # errors are never stored
+
+
+async def test_concurrent_requests_are_coalesced(tmp_path) -> None:
+    inner = CountingProvider(delay=0.05)
+    provider = _provider(tmp_path, inner)
+    with llm_call_tags(purpose="cron"):
+        results = await asyncio.gather(*(provider.chat(MESSAGES) for _ in range(5)))
+    assert inner.calls == 1
+    assert all(r.content == "ok" for r in results)
+
+
+def test_disk_cache_evicts_lru_and_expires(tmp_path) -> None:
+    cache = DiskCache(tmp_path / "c.sqlite", max_bytes=20)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"y" * 10)
+    assert cache.get("a") is not None  # touch "a" so "b" is least recent
+    cache.set("c", b"z" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.set("gone", b"1", ttl=-1)
+    assert cache.get("gone") is None
+
+
+async def test_cancelled_leader_does_not_cancel_waiters(tmp_path) -> None:
+    inner = CountingProvider(delay=0.1)
+    provider = _provider(tmp_path, inner)
+    with llm_call_tags(purpose="cron"):
+        leader = asyncio.create_task(provider.chat(MESSAGES))
+        await asyncio.sleep(0.02)
+        waiters = [asyncio.create_task(provider.chat(MESSAGES)) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+    assert leader.cancelled()
+    assert all(r.content == "ok" for r in results)
+    assert inner.calls == 2  # One waiter re-ran the call for the others
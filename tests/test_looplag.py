@@ -0,0 +1,22 @@
+import asyncio
+import time
+
+from loguru import logger
+
+from nanobot.utils.looplag import LoopLagMonitor
+
+
+async def test_loop_lag_monitor_logs_blocking_code() -> None:
+    messages = []
+    sink = logger.add(messages.append, level="WARNING", format="{message}")
+    monitor = LoopLagMonitor(threshold=0.1, interval=0.02)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.4)  # Blocks the loop
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+        logger.remove(sink)
+    assert len(messages) == 1
+    assert "Event loop blocked" in messages[0] and "time.sleep(0.4)" in messages[0]
@@ -0,0 +1,108 @@
+import httpx
+
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.gateway import GatewayServer
+from nanobot.utils.http_server import Request
+from nanobot.utils.metrics import BUS_DEPTH, TOOL_ERRORS, Registry, merge_expositions
+
+
+def test_prometheus_text_format() -> None:
+    registry = Registry()
+    calls = registry.counter("calls_total", "Calls.", ("kind",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    depth = registry.gauge("depth", "Depth.")
+    calls.inc(kind='a"b')
+    calls.inc(2, kind='a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    depth.set_function(lambda: 7)
+
+    text = registry.render()
+    assert '# TYPE calls_total counter\ncalls_total{kind="a\\"b"} 3\n' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "latency_seconds_sum 5.55\nlatency_seconds_count 3\n" in text
+    assert "depth 7\n" in text
+
+
+async def test_tool_errors_and_bus_depth_are_counted() -> None:
+    before = TOOL_ERRORS.value(tool="missing")
+    await ToolRegistry().execute("missing", {})
+    assert TOOL_ERRORS.value(tool="missing") == before + 1
+
+    bus = MessageBus()
+    await bus.publish_inbound(InboundMessage(channel="c", sender_id="s", chat_id="1", content="x"))
+    assert BUS_DEPTH.value(queue="inbound") == 1
+
+
+async def test_gateway_endpoints() -> None:
+    state = {"ok": True, "agent": {"running": True}}
+    server = GatewayServer("127.0.0.1", 0, lambda: state)
+    await server.start()
+    try:
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            metrics = await client.get("/metrics")
+            assert metrics.status_code == 200
+            assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+            assert "# TYPE nanobot_turns_in_flight gauge" in metrics.text
+
+            health = await client.get("/healthz")
+            assert health.status_code == 200 and health.json()["agent"] == {"running": True}
+            state["ok"] = False
+            assert (await client.get("/healthz")).status_code == 503
+
+            assert (await client.get("/nope")).status_code == 404
+            assert (await client.post("/metrics")).status_code == 405
+    finally:
+        await server.stop()
+
+
+async def test_metrics_are_local_only_unless_public() -> None:
+    async def workers():
+        return [('worker="0"', "# HELP w W.\n# TYPE w counter\nw 2\n")]
+
+    remote = Request("GET", "/metrics", {}, {}, peer="10.0.0.5")
+    assert (await GatewayServer("0.0.0.0", 0)._handle(remote)).status == 403
+    assert (await GatewayServer("0.0.0.0", 0)._handle(Request("GET", "/healthz", {}, {}, peer="::1"))).status == 200
+
+    public = GatewayServer("0.0.0.0", 0, remote_metrics=workers, public_metrics=True)
+    response = await public._handle(remote)
+    assert response.status == 200 and 'w{worker="0"} 2' in response.body.decode()
+
+
+def test_merge_expositions_labels_and_groups_sources() -> None:
+    gateway = "# HELP c C.\n# TYPE c counter\nc{kind=\"a\"} 1\n"
+    worker = "# HELP c C.\n# TYPE c counter\nc{kind=\"b\"} 2\n# HELP h H.\n# TYPE h gauge\nh 3\n"
+    merged = merge_expositions([("", gateway), ('worker="1"', worker)])
+    assert merged == (
+        "# HELP c C.\n# TYPE c counter\n"
+        'c{kind="a"} 1\nc{kind="b",worker="1"} 2\n'
+        '# HELP h H.\n# TYPE h gauge\nh{worker="1"} 3\n'
+    )
+
+
+async def test_http_server_rejects_bad_requests_and_idle_clients() -> None:
+    import asyncio
+
+    from nanobot.utils.http_server import MAX_HEADER_BYTES, HttpServer, Response
+
+    async def ok(request):
+        return Response.text("ok")
+
+    async with HttpServer(ok, idle_timeout=0.2) as server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET / HTTP/1.1\r\nX-Big: " + b"a" * MAX_HEADER_BYTES + b"\r\n\r\n")
+        assert (await reader.readline()).startswith(b"HTTP/1.1 431")
+        writer.close()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+        # An idle keep-alive connection is closed by the server
+        assert await asyncio.wait_for(reader.read(), 2) is not None
+        assert reader.at_eof()
+        writer.close()
@@ -0,0 +1,76 @@
+import asyncio
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse
+from nanobot.providers.failover import FailoverProvider
+
+
+class ScriptedProvider(LLMProvider):
+    def __init__(self, name: str, delay: float = 0.0, error: str | None = None):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.models: list[str] = []
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            return LLMResponse.from_error(LLMError(self.error, "failed", retryable=True))
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return self.name
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_fails_over_in_order_and_uses_route_models() -> None:
+    a = ScriptedProvider("a", error="server")
+    b = ScriptedProvider("b")
+    provider = FailoverProvider([(a, "model-a"), (b, "model-b")])
+    response = await provider.chat(MESSAGES, model="model-a")
+    assert response.content == "b"
+    assert a.models == ["model-a"] and b.models == ["model-b"]
+
+
+async def test_bad_request_does_not_fail_over() -> None:
+    a = ScriptedProvider("a", error="bad_request")
+    b = ScriptedProvider("b")
+    response = await FailoverProvider([(a, "a"), (b, "b")]).chat(MESSAGES)
+    assert response.error.kind == "bad_request"
+    assert b.models == []
+
+
+async def test_timeout_and_cooldown() -> None:
+    a = ScriptedProvider("a", delay=1.0)
+    b = ScriptedProvider("b")
+    provider = FailoverProvider([(a, "a"), (b, "b")], timeout_s=0.02, failure_threshold=1, cooldown_s=60)
+    assert (await provider.chat(MESSAGES)).content == "b"
+    assert (await provider.chat(MESSAGES)).content == "b"
+    assert len(a.models) == 1  # skipped while cooling down
+
+
+async def test_hedges_slow_primary_and_cancels_loser() -> None:
+    a = ScriptedProvider("a")
+    b = ScriptedProvider("b")
+    provider = FailoverProvider([(a, "a"), (b, "b")], hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        await provider.chat(MESSAGES)
+    assert b.models == []
+
+    a.delay = 0.5
+    fast_p95 = provider.members[0].p95(3)
+    response = await provider.chat(MESSAGES)
+    assert response.content == "b"
+    await asyncio.sleep(0.05)
+    assert a.cancelled == 1
+    # The cancelled attempt still counts, so a slow primary raises its own p95
+    assert len(provider.members[0].latencies) == 4
+    assert provider.members[0].p95(3) > fast_p95
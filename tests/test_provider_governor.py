@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse, classify_error
+from nanobot.providers.governor import GovernedProvider
+from nanobot.utils.ratelimit import TokenBucket
+
+
+class FlakyProvider(LLMProvider):
+    def __init__(self, failures: list[LLMError]):
+        super().__init__()
+        self.failures = list(failures)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if self.failures:
+            return LLMResponse.from_error(self.failures.pop(0))
+        return LLMResponse(content="ok", usage={"total_tokens": 10})
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_retries_retryable_errors_with_retry_after() -> None:
+    inner = FlakyProvider([LLMError("rate_limit", "429", retryable=True, retry_after=0.05)])
+    provider = GovernedProvider(inner, max_retries=2, backoff_base=0.01)
+    start = time.monotonic()
+    response = await provider.chat(MESSAGES)
+    assert response.content == "ok"
+    assert inner.calls == 2
+    assert time.monotonic() - start >= 0.05
+
+
+async def test_does_not_retry_permanent_errors() -> None:
+    inner = FlakyProvider([LLMError("auth", "bad key")])
+    provider = GovernedProvider(inner, max_retries=3, backoff_base=0.01)
+    response = await provider.chat(MESSAGES)
+    assert response.error.kind == "auth"
+    assert inner.calls == 1
+
+
+async def test_gives_up_after_max_retries() -> None:
+    inner = FlakyProvider([LLMError("server", "503", retryable=True)] * 5)
+    provider = GovernedProvider(inner, max_retries=2, backoff_base=0.001)
+    response = await provider.chat(MESSAGES)
+    assert response.error.kind == "server"
+    assert inner.calls == 3
+
+
+async def test_limits_concurrency() -> None:
+    inner = FlakyProvider([])
+    provider = GovernedProvider(inner, max_concurrency=2)
+    await asyncio.gather(*(provider.chat(MESSAGES) for _ in range(6)))
+    assert inner.peak == 2
+
+
+async def test_token_bucket_waits_for_refill() -> None:
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 per second
+    assert await bucket.acquire() == 0
+    waited = await bucket.acquire()
+    assert 0.05 < waited < 0.5
+
+
+def test_classify_error() -> None:
+    class RateLimitError(Exception):
+        status_code = 429
+        retry_after = "7"
+
+    class APIConnectionError(Exception):
+        pass
+
+    err = classify_error(RateLimitError("slow down"))
+    assert (err.kind, err.retryable, err.retry_after) == ("rate_limit", True, 7.0)
+    assert classify_error(APIConnectionError("refused")).kind == "connection"
+    assert classify_error(asyncio.TimeoutError()).kind == "timeout"
+    assert classify_error(ValueError("context_length_exceeded")).retryable is False
@@ -0,0 +1,98 @@
+from nanobot.providers.base import LLMError, LLMProvider, LLMResponse, llm_call_tags
+from nanobot.providers.router import PurposeRouter
+
+
+class RecordingProvider(LLMProvider):
+    def __init__(self, reply: str | None = "ok", error: bool = False):
+        super().__init__()
+        self.reply = reply
+        self.error = error
+        self.models: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        if self.error:
+            return LLMResponse.from_error(LLMError("server", "down", retryable=True))
+        return LLMResponse(content=self.reply)
+
+    def get_default_model(self) -> str:
+        return "main-model"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_routes_by_purpose() -> None:
+    main, cheap = RecordingProvider(), RecordingProvider()
+    router = PurposeRouter(main, {"consolidation": (cheap, "cheap-model")})
+
+    await router.chat(MESSAGES, model="main-model")
+    with llm_call_tags(purpose="consolidation"):
+        await router.chat(MESSAGES, model="main-model")
+
+    assert main.models == ["main-model"]
+    assert cheap.models == ["cheap-model"]
+
+
+async def test_escalates_on_failure_or_empty_reply() -> None:
+    main = RecordingProvider(reply="strong")
+    router = PurposeRouter(
+        main,
+        {"cron": (RecordingProvider(error=True), "cheap"), "heartbeat": (RecordingProvider(reply=""), "cheap")},
+        escalate_on_failure=True,
+    )
+    for purpose in ("cron", "heartbeat"):
+        with llm_call_tags(purpose=purpose):
+            assert (await router.chat(MESSAGES, model="main-model")).content == "strong"
+    assert main.models == ["main-model", "main-model"]
+
+
+async def test_no_escalation_when_disabled() -> None:
+    main = RecordingProvider()
+    router = PurposeRouter(main, {"cron": (RecordingProvider(error=True), "cheap")})
+    with llm_call_tags(purpose="cron"):
+        assert (await router.chat(MESSAGES)).error.kind == "server"
+    assert main.models == []
+
+
+async def test_routes_keep_their_own_api_base(monkeypatch) -> None:
+    import os
+
+    # Offline, litellm's background cost-map fetch can race its own import
+    monkeypatch.setenv("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    import litellm
+
+    from nanobot.cli.commands import _make_provider
+    from nanobot.config.schema import Config
+    from nanobot.providers import litellm_provider
+
+    calls: list[dict] = []
+
+    async def fake_completion(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_completion)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    config = Config.model_validate({
+        "providers": {
+            "anthropic": {"apiKey": "sk-ant"},
+            "openrouter": {"apiKey": "sk-or-1", "apiBase": "https://router.example/v1"},
+        },
+        "agents": {"defaults": {
+            "model": "anthropic/claude-opus-4-5",
+            "routing": {"routes": {"heartbeat": {"model": "openrouter/cheap", "provider": "openrouter"}}},
+        }},
+    })
+    provider = _make_provider(config)
+
+    with llm_call_tags(purpose="heartbeat"):
+        await provider.chat(MESSAGES)
+    await provider.chat(MESSAGES)
+
+    routed = next(c for c in calls if c["api_key"] == "sk-or-1")
+    main = next(c for c in calls if c["api_key"] == "sk-ant")
+    assert routed["api_base"] == "https://router.example/v1"
+    assert "api_base" not in main
+    assert litellm.api_base is None
+    assert "ANTHROPIC_API_KEY" not in os.environ
@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+from nanobot.agent.tools.python import KernelPool, PythonTool
+from nanobot.providers.base import llm_call_tags
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX rlimits")
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    kernels = KernelPool(str(tmp_path), memory_mb=1024, max_kernels=1)
+    yield kernels
+    await kernels.close_all()
+
+
+async def test_variables_persist_per_session(pool) -> None:
+    tool = PythonTool(pool, timeout=10, max_output_chars=200)
+    with llm_call_tags(session="cli:a"):
+        assert await tool.execute("x = 20\nprint('set')\nx + 1") == "set\n21"
+        assert await tool.execute("x * 2") == "40"
+        assert (await tool.execute("1/0")).endswith("ZeroDivisionError: division by zero")
+        assert await tool.execute("x") == "20"
+        assert await tool.execute("x", reset=True) != "20"
+    with llm_call_tags(session="cli:b"):
+        assert "NameError" in await tool.execute("x")
+    assert len(pool) == 1
+
+
+async def test_output_is_bounded(pool) -> None:
+    tool = PythonTool(pool, timeout=10, max_output_chars=100)
+    result = await tool.execute("for i in range(1000): print(i)")
+    assert result.startswith("0\n1\n") and result.endswith("998\n999")
+    assert "chars omitted" in result and len(result) < 200
+
+
+async def test_limits_reset_or_interrupt(pool) -> None:
+    tool = PythonTool(pool, timeout=1, cpu_seconds=5)
+    await tool.execute("kept = 1")
+    assert "timed out after 1 seconds" in await tool.execute("import time; time.sleep(5)")
+    assert "NameError" in await tool.execute("kept")
+    assert "MemoryError" in await tool.execute("b = bytearray(2 * 1024 ** 3)")
+    assert "exited" in await tool.execute("import os; os._exit(1)")
+
+
+async def test_input_does_not_block(pool) -> None:
+    tool = PythonTool(pool, timeout=5)
+    assert "EOFError" in await tool.execute("input('name? ')")
+    assert await tool.execute("1 + 1") == "2"  # The protocol still works
+
+
+def test_not_registered_with_restrict_to_workspace(tmp_path) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.schema import PythonToolConfig
+    from nanobot.providers.base import LLMProvider
+
+    class NoProvider(LLMProvider):
+        async def chat(self, *args, **kwargs):
+            raise NotImplementedError
+
+        def get_default_model(self) -> str:
+            return "m"
+
+    config = PythonToolConfig(enabled=True)
+    open_loop = AgentLoop(bus=MessageBus(), provider=NoProvider(), workspace=tmp_path, python_config=config)
+    restricted = AgentLoop(bus=MessageBus(), provider=NoProvider(), workspace=tmp_path, python_config=config,
+                           restrict_to_workspace=True)
+    assert open_loop.tools.get("python") is not None
+    assert restricted.tools.get("python") is None and restricted.kernels is None
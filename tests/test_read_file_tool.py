@@ -0,0 +1,73 @@
+import os
+
+from nanobot.agent.tools import filesystem
+from nanobot.agent.tools.filesystem import ReadFileTool
+
+
+def _write_lines(path, count: int) -> None:
+    path.write_text("".join(f"line {i}\n" for i in range(1, count + 1)))
+
+
+async def test_small_file_is_returned_whole(tmp_path) -> None:
+    (tmp_path / "a.txt").write_text("hello\nworld\n")
+    assert await ReadFileTool().execute(str(tmp_path / "a.txt")) == "hello\nworld\n"
+
+
+async def test_large_file_is_paged_with_header(tmp_path) -> None:
+    path = tmp_path / "big.log"
+    _write_lines(path, 50_000)
+    tool = ReadFileTool(max_bytes=1000)
+
+    first = await tool.execute(str(path))
+    header, body = first.split("\n", 1)
+    assert header.startswith(f"[{path}: lines 1-") and "of 50000" in header and "use offset=" in header
+    assert len(body) <= 1000 and body.endswith("\n")
+
+    page = await tool.execute(str(path), offset=49_999, limit=5)
+    assert page.split("\n", 1)[1] == "line 49999\nline 50000\n"
+    assert "continue" not in page.split("\n", 1)[0]
+
+    middle = await tool.execute(str(path), offset=10, limit=2)
+    assert middle.endswith("line 10\nline 11\n")
+    assert "past the end" in await tool.execute(str(path), offset=60_000)
+
+
+async def test_byte_range_and_long_line(tmp_path) -> None:
+    path = tmp_path / "one.txt"
+    path.write_text("abcdefghij" * 500)
+    tool = ReadFileTool(max_bytes=1000)
+    assert (await tool.execute(str(path), byte_offset=3, byte_limit=4)).endswith("\ndefg")
+    assert "use byte_offset=1000" in await tool.execute(str(path))
+
+
+async def test_binary_detection(tmp_path) -> None:
+    (tmp_path / "img.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0" + os.urandom(64))
+    result = await ReadFileTool().execute(str(tmp_path / "img.png"))
+    assert "binary file (image/png" in result
+
+
+async def test_line_index_is_cached_until_file_changes(tmp_path) -> None:
+    path = tmp_path / "log.txt"
+    _write_lines(path, 3000)
+    tool = ReadFileTool(max_bytes=100)
+    await tool.execute(str(path), offset=2000, limit=1)
+    index = filesystem._line_indexes[str(path)][2]
+    await tool.execute(str(path), offset=10, limit=1)
+    assert filesystem._line_indexes[str(path)][2] is index
+
+    _write_lines(path, 10)
+    assert (await tool.execute(str(path), offset=10, limit=1)).endswith("line 10\n")
+    assert filesystem._line_indexes[str(path)][2] is not index
+
+
+async def test_concurrent_pages_share_one_line_index(tmp_path, monkeypatch) -> None:
+    import asyncio
+
+    monkeypatch.setattr(filesystem, "_INDEX_CHUNK", 64)  # Many small extensions to interleave
+    path = tmp_path / "big.log"
+    _write_lines(path, 20_000)
+    tool = ReadFileTool(max_bytes=1000)
+    offsets = list(range(1, 20_000, 997))
+    pages = await asyncio.gather(*(tool.execute(str(path), offset=o, limit=3) for o in offsets))
+    for offset, page in zip(offsets, pages):
+        assert page.splitlines()[1:] == [f"line {offset + i}" for i in range(3)]
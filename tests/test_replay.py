@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bench import compare_reports, record_agent, replay_sessions
+from nanobot.bench.replay import read_session
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class ScriptedProvider(LLMProvider):
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        if messages[-1]["role"] == "user":
+            return LLMResponse(content=None, tool_calls=[ToolCallRequest("t1", "list_dir", {"path": self.path})])
+        return LLMResponse(content=f"listing: {messages[-1]['content'][:40]}")
+
+    def get_default_model(self) -> str:
+        return "scripted"
+
+
+async def _record(workspace: Path, cassettes: Path) -> list[str]:
+    (workspace / "hello.txt").write_text("hi")
+    agent = AgentLoop(bus=MessageBus(), provider=ScriptedProvider(str(workspace)), workspace=workspace)
+    record_agent(agent, cassettes)
+    return [await agent.process_direct(f"turn {i}", session_key="telegram:42") for i in range(3)]
+
+
+def _make_agent(provider, workspace):
+    return AgentLoop(bus=MessageBus(), provider=provider, workspace=workspace)
+
+
+async def test_replay_serves_recorded_responses(tmp_path) -> None:
+    live, cassettes, replay = tmp_path / "live", tmp_path / "cassettes", tmp_path / "replay"
+    live.mkdir(), replay.mkdir()
+    replies = await _record(live, cassettes)
+    assert (cassettes / "telegram_42.jsonl").exists()
+
+    session_file = live / "sessions" / "telegram_42.jsonl"
+    report = await replay_sessions(_make_agent, [session_file], replay, cassettes, source_workspace=live)
+
+    assert report["turns"] == 3 and report["misses"] == 0
+    stages = report["stages"]
+    assert stages["llm"]["count"] == 6 and stages["tools"]["count"] == 3
+    assert stages["turn"]["count"] == 3 and stages["session_save"]["count"] == 3
+    assert read_session(replay / "sessions" / "telegram_42.jsonl")[1] == replies
+
+
+async def test_replay_without_cassette_uses_session_replies(tmp_path) -> None:
+    live, replay = tmp_path / "live", tmp_path / "replay"
+    live.mkdir(), replay.mkdir()
+    replies = await _record(live, tmp_path / "cassettes")
+
+    session_file = live / "sessions" / "telegram_42.jsonl"
+    report = await replay_sessions(_make_agent, [session_file], replay)
+
+    assert report["misses"] == 0 and report["stages"]["llm"]["count"] == 3
+    assert "tools" not in report["stages"]
+    assert read_session(replay / "sessions" / "telegram_42.jsonl")[1] == replies
+
+
+def test_compare_reports() -> None:
+    baseline = {"stages": {"turn": {"mean_ms": 10.0}, "context": {"mean_ms": 0.0}}}
+    current = {"stages": {"turn": {"mean_ms": 12.5}, "context": {"mean_ms": 1.0}, "tools": {"mean_ms": 3.0}}}
+    deltas = compare_reports(current, baseline)
+    assert deltas["turn"] == {"baseline_ms": 10.0, "current_ms": 12.5, "delta_ms": 2.5, "delta_pct": 25.0}
+    assert deltas["context"]["delta_pct"] == 0.0
+    assert "tools" not in deltas
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from nanobot.utils.diskcache import DiskCache
+from nanobot.utils.searchcache import QuotaExceededError, SearchCache
+
+
+async def test_search_cache_coalesces_and_enforces_quota(tmp_path) -> None:
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "results"
+
+    cache = SearchCache(DiskCache(tmp_path / "search.sqlite"), ttl=60, monthly_quota=2)
+    # Identical (after normalization) concurrent searches share one API call
+    results = await asyncio.gather(*(cache.search("k", q, 5, fetch) for q in ("Cats", " cats ", "CATS")))
+    assert results == ["results"] * 3 and len(calls) == 1
+    assert await cache.search("k", "cats", 5, fetch) == "results" and len(calls) == 1  # From the TTL cache
+    assert await cache.search("k", "cats", 6, fetch) == "results" and len(calls) == 2  # Count is part of the key
+    with pytest.raises(QuotaExceededError):
+        await cache.search("k", "dogs", 5, fetch)
+    assert await cache.search("other-key", "dogs", 5, fetch) == "results"  # Quotas are per API key
+    assert cache.stats()["hits"] == 3
+
+
+async def test_cancelled_search_does_not_cancel_other_sessions() -> None:
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "results"
+
+    cache = SearchCache()
+    leader = asyncio.create_task(cache.search("k", "cats", 5, fetch))
+    await asyncio.sleep(0.02)
+    waiter = asyncio.create_task(cache.search("k", "cats", 5, fetch))
+    await asyncio.sleep(0.02)
+    leader.cancel()
+    assert await waiter == "results" and len(calls) == 2
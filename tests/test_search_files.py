@@ -0,0 +1,92 @@
+import os
+
+from nanobot.agent.tools.search import SearchFilesTool
+from nanobot.utils.textindex import TrigramIndex, required_literals
+
+
+def _tree(root) -> None:
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text("import os\n\ndef handle_request(req):\n    return req\n")
+    (root / "src" / "util.js").write_text("function handle_request() {}\n")
+    (root / "notes.md").write_text("# Notes\nnothing here\n")
+    (root / "build").mkdir()
+    (root / "build" / "out.py").write_text("def handle_request(): pass\n")
+    (root / "blob.bin").write_bytes(b"handle_request\0\0\0")
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    (root / "debug.log").write_text("handle_request failed\n")
+
+
+def test_required_literals() -> None:
+    assert required_literals("foo.*barbaz") == [["foo", "barbaz"]]
+    assert required_literals("alpha|beta") == [["alpha"], ["beta"]]
+    assert required_literals("(alpha|beta)") is None  # Alternation inside a group is not filtered
+    assert required_literals("ab|cdef") is None
+    assert required_literals(r"\w+") is None
+
+
+def test_index_filters_and_refreshes(tmp_path) -> None:
+    _tree(tmp_path)
+    db = tmp_path.parent / f"{tmp_path.name}.sqlite"
+    index = TrigramIndex(tmp_path, db)
+    index.refresh()
+    assert index.candidates("handle_request") == ["src/app.py", "src/util.js"]
+
+    (tmp_path / "notes.md").write_text("see HANDLE_REQUEST\n")
+    os.utime(tmp_path / "notes.md", ns=(1, 1))
+    assert index.refresh() == {"updated": 1, "removed": 0}
+    assert "notes.md" in index.candidates("handle_request")
+
+    # A fresh index loads from SQLite and re-reads nothing unchanged
+    reloaded = TrigramIndex(tmp_path, db)
+    assert reloaded.refresh() == {"updated": 0, "removed": 0}
+    (tmp_path / "src" / "util.js").unlink()
+    assert reloaded.refresh() == {"updated": 0, "removed": 1}
+
+
+async def test_search_output_and_filters(tmp_path) -> None:
+    _tree(tmp_path)
+    tool = SearchFilesTool(workspace=tmp_path, index_dir=tmp_path.parent / "idx")
+
+    result = await tool.execute("handle_request")
+    assert result.splitlines() == [
+        "src/app.py:3:def handle_request(req):",
+        "src/util.js:1:function handle_request() {}",
+    ]
+    assert (await tool.execute("handle_request", glob="*.py")).count("\n") == 0
+
+    with_context = await tool.execute("def handle", context=1)
+    assert with_context.splitlines() == [
+        "src/app.py-2-",
+        "src/app.py:3:def handle_request(req):",
+        "src/app.py-4-    return req",
+    ]
+    assert (await tool.execute("HANDLE_request", ignore_case=True, path=str(tmp_path / "src"))).count("\n") == 1
+    assert "stopped at 1 matches" in await tool.execute("handle_request", max_results=1)
+    assert (await tool.execute("a.b(", literal=True)).startswith("No matches")
+    assert (await tool.execute("(")).startswith("Error: Invalid regex")
+
+
+async def test_large_files_are_scanned_and_huge_ones_reported(tmp_path, monkeypatch) -> None:
+    from nanobot.agent.tools import search
+
+    monkeypatch.setattr(search, "MAX_INDEXED_BYTES", 100)
+    monkeypatch.setattr("nanobot.utils.textindex.MAX_INDEXED_BYTES", 100)
+    monkeypatch.setattr(search, "MAX_SCAN_BYTES", 1000)
+    (tmp_path / "big.log").write_text("x" * 200 + "\nneedle here\n")
+    (tmp_path / "huge.log").write_text("y" * 2000 + "\nneedle\n")
+    (tmp_path / "big.bin").write_bytes(b"\0" * 200 + b"needle")
+    tool = SearchFilesTool(workspace=tmp_path, index_dir=tmp_path.parent / "idx-large")
+
+    result = await tool.execute("needle")
+    assert result.splitlines()[0] == "big.log:2:needle here"
+    assert result.endswith("MB: huge.log)")
+    assert "big.bin" not in result
+
+
+def test_transient_indexes_are_bounded(tmp_path) -> None:
+    from nanobot.agent.tools import search
+
+    roots = [tmp_path / str(i) for i in range(5)]
+    for root in roots:
+        search._index_for(root, None)
+    assert [r for r in search._indexes if r in roots] == roots[-search.MAX_TRANSIENT_INDEXES:]
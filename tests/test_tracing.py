@@ -0,0 +1,86 @@
+import json
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.workers import inbound_from_dict, inbound_to_dict
+from nanobot.config.schema import TracingConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.tracing import Tracer, load_spans, root_span_id, slowest_turns, tracer
+
+
+class ToolThenAnswer(LLMProvider):
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        if messages[-1]["role"] == "user":
+            return LLMResponse(content=None, tool_calls=[ToolCallRequest("t1", "list_dir", {"path": self.path})],
+                               usage={"prompt_tokens": 10, "completion_tokens": 2})
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "m"
+
+
+def _configure(tmp_path, **overrides) -> Tracer:
+    tracer.configure(TracingConfig(enabled=True, **overrides), tmp_path / "spans.jsonl")
+    return tracer
+
+
+async def test_turn_is_traced_end_to_end(tmp_path) -> None:
+    _configure(tmp_path)
+    try:
+        bus = MessageBus()
+        agent = AgentLoop(bus=bus, provider=ToolThenAnswer(str(tmp_path)), workspace=tmp_path)
+        msg = InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi")
+        await bus.publish_inbound(msg)
+        response = await agent._process_message(await bus.consume_inbound())
+        with tracer.span("channel.send", trace_id=response.trace_id, channel="telegram"):
+            pass
+    finally:
+        tracer.enabled = False
+
+    assert response.trace_id == msg.trace_id
+    spans = load_spans(tmp_path / "spans.jsonl")
+    assert {s["trace_id"] for s in spans} == {msg.trace_id}
+    names = [s["name"] for s in spans]
+    for name in ("bus.queue", "context.build", "llm.chat", "tool.execute", "session.save", "channel.send"):
+        assert name in names
+    root = next(s for s in spans if s["name"] == "agent.turn")
+    assert root["span_id"] == root_span_id(msg.trace_id) and root["parent_span_id"] is None
+    assert all(s["parent_span_id"] == root["span_id"] for s in spans if s["name"] in ("llm.chat", "channel.send"))
+    llm = next(s for s in spans if s["name"] == "llm.chat")
+    assert llm["attributes"]["tokens.prompt_tokens"] == 10
+
+    [turn] = slowest_turns(spans)
+    assert turn["session"] == "telegram:1" and turn["slowest_tool"] == "list_dir"
+    assert turn["total_ms"] >= turn["turn_ms"] >= turn["stages"]["llm"]
+
+
+def test_sampling_is_decided_by_trace_id(tmp_path) -> None:
+    t = Tracer()
+    t.configure(TracingConfig(enabled=True, sample_rate=0.5), tmp_path / "spans.jsonl")
+    assert t.sampled("0" * 32) and not t.sampled("f" * 32)
+    with t.trace("agent.turn", "f" * 32) as span:
+        with t.span("llm.chat") as child:
+            child.set(model="m")
+    assert span.trace_id is None
+    assert not (tmp_path / "spans.jsonl").exists()
+
+
+def test_errors_and_trace_id_survive_worker_frames(tmp_path) -> None:
+    t = Tracer()
+    t.configure(TracingConfig(enabled=True), tmp_path / "spans.jsonl")
+    trace_id = "0" * 32
+    try:
+        with t.trace("agent.turn", trace_id):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    [span] = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert span["status"] == {"code": "ERROR", "message": "ValueError: boom"}
+
+    msg = InboundMessage(channel="c", sender_id="s", chat_id="1", content="x", trace_id=trace_id)
+    assert inbound_from_dict(json.loads(json.dumps(inbound_to_dict(msg)))).trace_id == trace_id
@@ -0,0 +1,90 @@
+from nanobot.config.schema import ModelPrice
+from nanobot.providers.base import LLMProvider, LLMResponse, llm_call_tags, parse_usage
+from nanobot.usage import BudgetProvider, MeteredProvider, UsageLedger
+
+
+class FixedProvider(LLMProvider):
+    def __init__(self, reply: str = "ok"):
+        super().__init__()
+        self.reply = reply
+        self.models: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        return LLMResponse(content=self.reply, usage={
+            "prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100, "cached_tokens": 800,
+        })
+
+    def get_default_model(self) -> str:
+        return "big-model"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def test_metered_calls_are_tagged_and_priced(tmp_path) -> None:
+    ledger = UsageLedger(tmp_path / "u.sqlite", prices={
+        "big-model": ModelPrice(input=10.0, output=20.0, cached_input=1.0),
+    })
+    provider = MeteredProvider(FixedProvider(), ledger)
+
+    with llm_call_tags(purpose="interactive", session="telegram:1", channel="telegram"):
+        await provider.chat(MESSAGES, model="big-model")
+    with llm_call_tags(purpose="consolidation", session="telegram:1"):
+        await provider.chat(MESSAGES, model="other-model")
+
+    totals = ledger.totals()
+    assert totals["calls"] == 2
+    assert totals["cached_tokens"] == 1600
+    assert abs(totals["cost"] - (200 * 10 + 800 * 1 + 100 * 20) / 1e6) < 1e-9
+
+    by_purpose = {row["key"]: row for row in ledger.breakdown("purpose")}
+    assert set(by_purpose) == {"interactive", "consolidation"}
+    assert ledger.breakdown("channel")[0]["calls"] == 1
+
+
+async def test_budget_downgrades_then_refuses(tmp_path) -> None:
+    ledger = UsageLedger(tmp_path / "u.sqlite")
+    main, cheap = FixedProvider("main"), FixedProvider("cheap")
+    metered = MeteredProvider(main, ledger)
+
+    downgrading = BudgetProvider(metered, ledger, session_tokens=1000, downgrade=(cheap, "cheap-model"))
+    with llm_call_tags(session="s1"):
+        assert (await downgrading.chat(MESSAGES)).content == "main"
+        assert (await downgrading.chat(MESSAGES)).content == "cheap"
+    with llm_call_tags(session="s2"):
+        assert (await downgrading.chat(MESSAGES)).content == "main"
+
+    refusing = BudgetProvider(metered, ledger, daily_tokens=1000)
+    response = await refusing.chat(MESSAGES)
+    assert response.error.kind == "budget"
+
+
+async def test_ledger_queries_run_off_the_event_loop(tmp_path) -> None:
+    import threading
+
+    threads: list[int] = []
+
+    class TrackingLedger(UsageLedger):
+        def record(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            super().record(*args, **kwargs)
+
+        def totals(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().totals(*args, **kwargs)
+
+    ledger = TrackingLedger(tmp_path / "u.sqlite")
+    provider = BudgetProvider(MeteredProvider(FixedProvider(), ledger), ledger, session_tokens=5000, daily_tokens=5000)
+    with llm_call_tags(session="s1"):
+        await provider.chat(MESSAGES)
+    assert len(threads) == 3 and threading.get_ident() not in threads
+
+
+def test_parse_usage_shapes() -> None:
+    assert parse_usage({"input_tokens": 10, "output_tokens": 2, "input_tokens_details": {"cached_tokens": 4}}) == {
+        "prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12, "cached_tokens": 4,
+    }
+    assert parse_usage({"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6,
+                        "cache_read_input_tokens": 3})["cached_tokens"] == 3
+    assert parse_usage(None) == {}
@@ -0,0 +1,87 @@
+import json
+
+import httpx
+import pytest
+
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.diskcache import DiskCache
+from nanobot.utils.httpcache import HttpCache, freshness
+
+PAGE = "<html><head><title>Doc</title></head><body><article><p>Hello cache</p></article></body></html>"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    state = {"requests": [], "headers": {"cache-control": "max-age=0", "etag": '"v1"'}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        etag = state["headers"].get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=state["headers"])
+        return httpx.Response(200, headers={**state["headers"], "content-type": "text/html"}, text=PAGE)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(web, "get_client", lambda **kwargs: client)
+    return state
+
+
+def test_freshness_rules() -> None:
+    assert freshness({"cache-control": "no-store"}, 0) is None
+    assert freshness({"cache-control": "public, max-age=300"}, 0) == 300
+    assert freshness({"cache-control": "no-cache, max-age=300"}, 0) == 0
+    headers = {"date": "Mon, 12 Oct 2026 10:00:00 GMT", "expires": "Mon, 12 Oct 2026 10:10:00 GMT"}
+    assert freshness(headers, 0) == 600
+    headers = {"date": "Mon, 12 Oct 2026 10:00:00 GMT", "last-modified": "Mon, 12 Oct 2026 09:00:00 GMT"}
+    assert freshness(headers, 0) == 360
+
+
+async def test_fetch_is_cached_and_revalidated(tmp_path, server) -> None:
+    cache = HttpCache(DiskCache(tmp_path / "web.sqlite"), min_ttl=0)
+    tool = WebFetchTool(cache=cache)
+
+    first = json.loads(await tool.execute("https://example.com/doc"))
+    assert "Hello cache" in first["text"] and first["extractor"] == "readability"
+
+    # Stale (max-age=0) but has an ETag: revalidated with a conditional request
+    second = json.loads(await tool.execute("https://example.com/doc"))
+    assert second["text"] == first["text"]
+    assert server["requests"][1].headers["if-none-match"] == '"v1"'
+
+    # The 304 carried max-age=0 again; a minimum TTL makes the entry fresh without any request
+    cache.min_ttl = 60
+    await tool.execute("https://example.com/doc")
+    await tool.execute("https://example.com/doc")
+    assert len(server["requests"]) == 3
+    assert cache.stats() == {**cache.stats(), "hits": 3, "lookups": 4}
+
+
+async def test_no_store_is_not_cached(tmp_path, server) -> None:
+    server["headers"] = {"cache-control": "no-store"}
+    cache = HttpCache(DiskCache(tmp_path / "web.sqlite"), min_ttl=60)
+    tool = WebFetchTool(cache=cache)
+    for _ in range(2):
+        assert "Hello cache" in json.loads(await tool.execute("https://example.com/doc"))["text"]
+    assert len(server["requests"]) == 2 and cache.stats()["entries"] == 0
+
+
+async def test_cache_io_runs_off_the_event_loop(tmp_path, server) -> None:
+    import threading
+
+    loop_thread = threading.get_ident()
+    threads: list[int] = []
+
+    class TrackingCache(HttpCache):
+        def _save(self, url, entry, now):
+            threads.append(threading.get_ident())
+            super()._save(url, entry, now)
+
+        def lookup(self, url):
+            threads.append(threading.get_ident())
+            return super().lookup(url)
+
+    tool = WebFetchTool(cache=TrackingCache(DiskCache(tmp_path / "web.sqlite"), min_ttl=60))
+    await tool.execute("https://example.com/doc")
+    await tool.execute("https://example.com/doc")
+    assert len(threads) == 4 and loop_thread not in threads
@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import httpx
+
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+
+
+def _serve(monkeypatch, headers: dict, content: bytes) -> list[httpx.Request]:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, headers=headers, content=content)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(web, "get_client", lambda **kwargs: client)
+    monkeypatch.setattr(web, "get_cache", lambda: None)
+    return requests
+
+
+async def test_download_stops_at_cap(monkeypatch) -> None:
+    monkeypatch.setattr(web, "MIN_DOWNLOAD_BYTES", 1000)
+    _serve(monkeypatch, {"content-type": "text/plain"}, b"x" * 1_000_000)
+    result = json.loads(await WebFetchTool().execute("https://example.com/big.txt", maxChars=100))
+    assert result["truncated"] and result["length"] == 100
+
+
+async def test_binary_content_is_sniffed(monkeypatch) -> None:
+    _serve(monkeypatch, {"content-type": "application/octet-stream"}, b"%PDF-1.7\n" + b"\0" * 5000)
+    result = json.loads(await WebFetchTool().execute("https://example.com/file"))
+    assert result["error"].startswith("Binary content (application/octet-stream")
+
+    _serve(monkeypatch, {"content-type": "application/octet-stream"}, b"<!DOCTYPE html><title>T</title><p>Body</p>")
+    result = json.loads(await WebFetchTool().execute("https://example.com/page"))
+    assert result["extractor"] == "readability" and "Body" in result["text"]
+
+
+async def test_extraction_timeout_kills_worker(monkeypatch) -> None:
+    _serve(monkeypatch, {"content-type": "text/html"}, b"<html><body><p>Slow page</p></body></html>")
+    monkeypatch.setattr(web, "EXTRACT_TIMEOUT_S", 0.001)
+    web._close_extraction_workers()  # Worker start-up alone exceeds the timeout
+    result = json.loads(await WebFetchTool().execute("https://example.com/slow"))
+    assert "did not finish" in result["error"]
+
+    monkeypatch.setattr(web, "EXTRACT_TIMEOUT_S", 30.0)
+    result = json.loads(await WebFetchTool().execute("https://example.com/slow"))
+    assert "Slow page" in result["text"]
+
+
+async def test_overrun_only_kills_its_own_worker() -> None:
+    page = "<html><body><p>Fine page</p></body></html>"
+    big = "<html><body>" + "<p>words and more words</p>" * 100_000 + "</body></html>"
+    web._close_extraction_workers()
+    loop = asyncio.get_running_loop()
+    slow, fine = await asyncio.gather(
+        loop.run_in_executor(None, web._extract_in_worker, big, "text", 0.01),
+        loop.run_in_executor(None, web._extract_in_worker, page, "text", 30.0),
+        return_exceptions=True,
+    )
+    assert isinstance(slow, TimeoutError) and "did not finish" in str(slow)
+    assert "Fine page" in fine
+
+
+async def test_batch_fetch_reports_per_item(monkeypatch) -> None:
+    active, peak = {}, {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.3 if request.url.path == "/slow" else 0.01)
+        active[host] -= 1
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"content-type": "text/plain"}, text=f"page {request.url.path}")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(web, "get_client", lambda **kwargs: client)
+    monkeypatch.setattr(web, "get_cache", lambda: None)
+    monkeypatch.setattr(web, "BATCH_BUDGET_S", 0.2)
+
+    urls = [f"https://a.example/{i}" for i in range(4)] + ["https://b.example/missing", "https://b.example/slow", "ftp://x"]
+    results = json.loads(await WebFetchTool().execute(urls=urls))["results"]
+    assert [r.get("text") for r in results[:4]] == [f"page /{i}" for i in range(4)]
+    assert "404" in results[4]["error"]
+    assert "batch budget" in results[5]["error"]
+    assert results[6]["error"].startswith("URL validation failed")
+    assert peak["a.example"] == web.BATCH_PER_HOST
+
+
+async def test_batch_search(monkeypatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        q = request.url.params["q"]
+        if q == "bad":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"web": {"results": [{"title": f"About {q}", "url": f"https://{q}.example"}]}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(web, "get_client", lambda **kwargs: client)
+    result = await web.WebSearchTool(api_key="k").execute(queries=["cats", "bad", "dogs"])
+    assert result.index("Results for: cats") < result.index("Error for: bad") < result.index("Results for: dogs")
+    assert "About cats" in result and "500" in result
+
+    # Blank-only batches fall back to the single-item argument check
+    assert await web.WebSearchTool(api_key="k").execute(queries=["  "]) == "Error: query or queries is required"
+    fetched = json.loads(await web.WebFetchTool().execute(urls=[" ", ""]))
+    assert fetched == {"error": "url or urls is required"}